@@ -0,0 +1,168 @@
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional; the grid index covers large scenes without it
+    cKDTree = None
+
+# -----------------------------------------------------
+# Pairwise Box Geometry (NumPy broadcasting)
+# -----------------------------------------------------
+
+ASSOCIATION_MODES = ('center', 'edge', 'iou')
+
+# Below this many person x threat pairs the dense kernel beats any index
+DENSE_PAIR_LIMIT = 250000
+
+
+def as_boxes(boxes):
+    """(N, 4) float array of x1, y1, x2, y2"""
+    return np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+
+
+def box_centers(boxes):
+    return (boxes[:, :2] + boxes[:, 2:]) * 0.5
+
+
+def center_distances(a, b):
+    """(len(a), len(b)) distances between box centers"""
+    delta = box_centers(a)[:, None, :] - box_centers(b)[None, :, :]
+    return np.hypot(delta[..., 0], delta[..., 1])
+
+
+def edge_distances(a, b):
+    """(len(a), len(b)) gap between box edges (0 when boxes touch or overlap)"""
+    dx = np.maximum(a[:, None, 0], b[None, :, 0]) - np.minimum(a[:, None, 2], b[None, :, 2])
+    dy = np.maximum(a[:, None, 1], b[None, :, 1]) - np.minimum(a[:, None, 3], b[None, :, 3])
+    return np.hypot(np.maximum(dx, 0), np.maximum(dy, 0))
+
+
+def box_iou(a, b):
+    """(len(a), len(b)) intersection over union"""
+    iw = np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0])
+    ih = np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1])
+    inter = np.maximum(iw, 0) * np.maximum(ih, 0)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def pair_matches(a, b, threshold, mode):
+    """Boolean match matrix between two box sets for one association mode"""
+    if mode == 'center':
+        return center_distances(a, b) < threshold
+    if mode == 'edge':
+        return edge_distances(a, b) < threshold
+    if mode == 'iou':
+        return box_iou(a, b) > threshold
+    raise ValueError(f"Unknown association mode: {mode}")
+
+# -----------------------------------------------------
+# Candidate Generation for Large Scenes
+# -----------------------------------------------------
+
+def _grid_candidates(persons, threats, reach):
+    """Person/threat index pairs whose boxes come within reach, via a uniform grid"""
+    # Cells about the size of a threat box keep both the insert and query spans small
+    sizes = threats[:, 2:] - threats[:, :2]
+    cell = max(reach, float(np.median(sizes)) if len(sizes) else 0.0, 1.0)
+    grid = {}
+    t_lo = np.floor(threats[:, :2] / cell).astype(np.int64)
+    t_hi = np.floor(threats[:, 2:] / cell).astype(np.int64)
+    for t, (x0, y0), (x1, y1) in zip(range(len(threats)), t_lo.tolist(), t_hi.tolist()):
+        for gx in range(x0, x1 + 1):
+            for gy in range(y0, y1 + 1):
+                grid.setdefault((gx, gy), []).append(t)
+
+    p_lo = np.floor((persons[:, :2] - reach) / cell).astype(np.int64)
+    p_hi = np.floor((persons[:, 2:] + reach) / cell).astype(np.int64)
+    rows, cols = [], []
+    for p, (x0, y0), (x1, y1) in zip(range(len(persons)), p_lo.tolist(), p_hi.tolist()):
+        found = set()
+        for gx in range(x0, x1 + 1):
+            for gy in range(y0, y1 + 1):
+                found.update(grid.get((gx, gy), ()))
+        rows.extend([p] * len(found))
+        cols.extend(found)
+    return np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+
+
+def _kdtree_candidates(persons, threats, radius):
+    """Person/threat pairs with centers within radius, via a KD-tree over threat centers"""
+    tree = cKDTree(box_centers(threats))
+    neighbours = tree.query_ball_point(box_centers(persons), radius)
+    rows = np.repeat(np.arange(len(persons)), [len(n) for n in neighbours])
+    cols = np.fromiter((t for n in neighbours for t in n), dtype=np.int64, count=len(rows))
+    return rows, cols
+
+
+def _candidate_matches(a, b, rows, cols, threshold, mode):
+    """Exact test of the chosen mode on candidate pairs only"""
+    if mode == 'center':
+        delta = box_centers(a[rows]) - box_centers(b[cols])
+        return np.hypot(delta[:, 0], delta[:, 1]) < threshold
+    a, b = a[rows], b[cols]
+    if mode == 'edge':
+        dx = np.maximum(a[:, 0], b[:, 0]) - np.minimum(a[:, 2], b[:, 2])
+        dy = np.maximum(a[:, 1], b[:, 1]) - np.minimum(a[:, 3], b[:, 3])
+        return np.hypot(np.maximum(dx, 0), np.maximum(dy, 0)) < threshold
+    iw = np.minimum(a[:, 2], b[:, 2]) - np.maximum(a[:, 0], b[:, 0])
+    ih = np.minimum(a[:, 3], b[:, 3]) - np.maximum(a[:, 1], b[:, 1])
+    inter = np.maximum(iw, 0) * np.maximum(ih, 0)
+    union = ((a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+             + (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]) - inter)
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0) > threshold
+
+# -----------------------------------------------------
+# Person -> Threat Assignment
+# -----------------------------------------------------
+
+def associate(person_boxes, threat_boxes, threshold, mode='center', index='auto'):
+    """Assign threats to persons in one pass.
+
+    mode: 'center' (center distance < threshold, the original rule),
+          'edge' (edge gap < threshold) or 'iou' (IoU > threshold).
+    index: 'dense', 'grid', 'kdtree' or 'auto'.
+    Returns one int array of threat indices per person.
+    """
+    persons = as_boxes(person_boxes)
+    threats = as_boxes(threat_boxes)
+    n_persons, n_threats = len(persons), len(threats)
+    if n_persons == 0:
+        return []
+    if n_threats == 0:
+        return [np.zeros(0, dtype=np.int64) for _ in range(n_persons)]
+    if mode not in ASSOCIATION_MODES:
+        raise ValueError(f"Unknown association mode: {mode}")
+
+    if index == 'auto':
+        if n_persons * n_threats <= DENSE_PAIR_LIMIT:
+            index = 'dense'
+        elif mode == 'center' and cKDTree is not None:
+            index = 'kdtree'
+        else:
+            index = 'grid'
+    if index == 'kdtree' and (mode != 'center' or cKDTree is None):
+        index = 'grid'
+
+    if index == 'dense':
+        rows, cols = np.nonzero(pair_matches(persons, threats, threshold, mode))
+    else:
+        if index == 'kdtree':
+            rows, cols = _kdtree_candidates(persons, threats, threshold)
+        elif index == 'grid':
+            # A center (or edge) within threshold means the threat box touches the
+            # person box grown by threshold; IoU needs direct overlap
+            reach = 0.0 if mode == 'iou' else threshold
+            rows, cols = _grid_candidates(persons, threats, reach)
+        else:
+            raise ValueError(f"Unknown association index: {index}")
+        if len(rows):
+            keep = _candidate_matches(persons, threats, rows, cols, threshold, mode)
+            rows, cols = rows[keep], cols[keep]
+        order = np.lexsort((cols, rows))
+        rows, cols = rows[order], cols[order]
+
+    # rows are sorted, so split the threat columns per person
+    return np.split(cols, np.searchsorted(rows, np.arange(1, n_persons)))
@@ -0,0 +1,276 @@
+import argparse
+import threading
+import time
+from concurrent.futures import Future
+
+import cv2
+
+from frame_pipeline import LatestQueue, StageStats
+
+# -----------------------------------------------------
+# Video Sources (camera index, video file or stream URL)
+# -----------------------------------------------------
+
+def parse_source(source):
+    """Camera indices arrive as strings from the CLI; everything else is a path or URL"""
+    if isinstance(source, str) and source.isdigit():
+        return int(source)
+    return source
+
+
+class VideoSource:
+    def __init__(self, source, stream_id=None, flip=False):
+        """Background reader that always holds the newest frame of one source"""
+        self.source = parse_source(source)
+        self.stream_id = stream_id if stream_id is not None else str(source)
+        self.flip = flip
+        self.frames = LatestQueue(1)
+        self.cap = None
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """Open the source and start reading frames"""
+        self.cap = cv2.VideoCapture(self.source)
+        if not self.cap.isOpened():
+            return False
+        if isinstance(self.source, int):
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.running = True
+        self.thread = threading.Thread(target=self._read_loop, name=f'source-{self.stream_id}', daemon=True)
+        self.thread.start()
+        return True
+
+    def _read_loop(self):
+        while self.running:
+            ret, frame = self.cap.read()
+            if not ret:
+                # End of file or dropped stream
+                self.running = False
+                break
+            if self.flip:
+                frame = cv2.flip(frame, 1)
+            self.frames.put(frame)
+
+    def read(self, timeout=1.0):
+        """Newest unread frame, or None"""
+        return self.frames.get(timeout)
+
+    def stop(self):
+        """Stop reading and release the capture"""
+        self.running = False
+        if self.thread:
+            self.thread.join(1.0)
+        if self.cap:
+            self.cap.release()
+
+# -----------------------------------------------------
+# Dynamic Micro-Batching Inference Engine
+# -----------------------------------------------------
+
+class BatchInferenceEngine:
+    def __init__(self, model, max_batch_size=8, max_wait=0.01, **inference_args):
+        """Group frames from many streams into batched YOLO calls"""
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait  # seconds to wait for a batch to fill
+        self.inference_args = inference_args
+
+        self.pending = []
+        self.cond = threading.Condition()
+        self.running = False
+        self.thread = None
+
+        # Metrics
+        self.stats = StageStats()
+        self.batches = 0
+        self.frames = 0
+
+    def start(self):
+        """Start the batching worker"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._worker_loop, name='batch-inference', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the worker and fail any frames still waiting"""
+        with self.cond:
+            self.running = False
+            pending, self.pending = self.pending, []
+            self.cond.notify_all()
+        for _, _, future in pending:
+            future.cancel()
+        if self.thread:
+            self.thread.join(2.0)
+
+    def submit(self, stream_id, frame):
+        """Queue one frame; the returned Future resolves to its YOLO Results"""
+        future = Future()
+        with self.cond:
+            if not self.running:
+                raise RuntimeError("Batch inference engine is not running")
+            self.pending.append((stream_id, frame, future))
+            self.cond.notify()
+        return future
+
+    def _next_batch(self):
+        with self.cond:
+            # Wait for the first frame of a batch
+            while self.running and not self.pending:
+                self.cond.wait(0.1)
+            if not self.running:
+                return []
+
+            # Fill up until the batch is full or the deadline passes
+            deadline = time.perf_counter() + self.max_wait
+            while len(self.pending) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or not self.running:
+                    break
+                self.cond.wait(remaining)
+
+            batch = self.pending[:self.max_batch_size]
+            self.pending = self.pending[self.max_batch_size:]
+            return batch
+
+    def _worker_loop(self):
+        while self.running:
+            batch = self._next_batch()
+            if not batch:
+                continue
+
+            frames = [frame for _, frame, _ in batch]
+            started = time.perf_counter()
+            try:
+                results = self.model(frames, **self.inference_args)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.stats.record(started, time.perf_counter())
+            self.batches += 1
+            self.frames += len(batch)
+
+            # Results come back in input order
+            for (_, _, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def get_stats(self):
+        """Batch latency plus average batch size"""
+        stats = self.stats.snapshot()
+        stats['batches'] = self.batches
+        stats['frames'] = self.frames
+        stats['avg_batch_size'] = self.frames / self.batches if self.batches else 0.0
+        with self.cond:
+            stats['pending'] = len(self.pending)
+        return stats
+
+# -----------------------------------------------------
+# Multi-Stream Detection
+# -----------------------------------------------------
+
+class MultiStreamDetector:
+    def __init__(self, detector, sources, max_batch_size=8, max_wait=0.01, flip=False):
+        """Run one detector over N sources through a shared batching engine"""
+        self.detector = detector
+        self.sources = [VideoSource(source, stream_id=str(i), flip=flip)
+                        for i, source in enumerate(sources)]
+        self.engine = BatchInferenceEngine(
+            detector.model,
+            max_batch_size=max_batch_size,
+            max_wait=max_wait,
+            **detector.inference_args
+        )
+
+        # Newest (frame, detections) per stream
+        self.latest = {}
+        self.lock = threading.Lock()
+        self.callbacks = []
+        self.running = False
+        self.threads = []
+
+    def add_callback(self, callback):
+        """Call callback(stream_id, frame, detections) for every processed frame"""
+        self.callbacks.append(callback)
+
+    def start(self):
+        """Open all sources and start one submit loop per stream"""
+        self.engine.start()
+        self.running = True
+        for source in self.sources:
+            if not source.start():
+                print(f"❌ Could not open source {source.source}")
+                continue
+            thread = threading.Thread(target=self._stream_loop, args=(source,),
+                                      name=f'stream-{source.stream_id}', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return len(self.threads) > 0
+
+    def _stream_loop(self, source):
+        while self.running and (source.running or source.frames.depth()):
+            frame = source.read(timeout=0.5)
+            if frame is None:
+                continue
+            try:
+                result = self.engine.submit(source.stream_id, frame).result()
+            except Exception:
+                break
+            detections = self.detector.process_results([result], frame)
+            with self.lock:
+                self.latest[source.stream_id] = (frame, detections)
+            for callback in self.callbacks:
+                callback(source.stream_id, frame, detections)
+
+    def get_latest(self, stream_id):
+        """Newest (frame, detections) for one stream"""
+        with self.lock:
+            return self.latest.get(stream_id)
+
+    def stop(self):
+        """Stop all streams and the engine"""
+        self.running = False
+        for source in self.sources:
+            source.stop()
+        self.engine.stop()
+        for thread in self.threads:
+            thread.join(1.0)
+        self.threads = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched multi-camera threat detection")
+    parser.add_argument('sources', nargs='+', help="Camera indices, video files or stream URLs")
+    parser.add_argument('--max-batch-size', type=int, default=8)
+    parser.add_argument('--max-wait-ms', type=float, default=10.0)
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds to run")
+    args = parser.parse_args()
+
+    from enhanced_streamlit_demo import EnhancedThreatDetector
+
+    detector = EnhancedThreatDetector()
+    multi = MultiStreamDetector(
+        detector, args.sources,
+        max_batch_size=args.max_batch_size,
+        max_wait=args.max_wait_ms / 1000.0
+    )
+    if not multi.start():
+        return
+
+    started = time.time()
+    try:
+        while time.time() - started < args.duration:
+            time.sleep(1.0)
+            stats = multi.engine.get_stats()
+            elapsed = time.time() - started
+            print(f"{stats['frames'] / elapsed:6.1f} frames/s | "
+                  f"batch {stats['avg_batch_size']:.1f} | "
+                  f"batch latency {stats['latency_ms']:.0f}ms")
+    finally:
+        multi.stop()
+
+
+if __name__ == "__main__":
+    main()
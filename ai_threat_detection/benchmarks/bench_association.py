@@ -0,0 +1,75 @@
+"""Micro-benchmark: person/threat association loop vs vectorized kernels
+
+Run from ai_threat_detection/:  python benchmarks/bench_association.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from association import associate
+
+
+def loop_associate(persons, threats, frame_shape):
+    """The original nested loop from EnhancedThreatDetector.detect_threats"""
+    assignments = []
+    for person_bbox in persons:
+        person_center_x = (person_bbox[0] + person_bbox[2]) / 2
+        person_center_y = (person_bbox[1] + person_bbox[3]) / 2
+        nearby = []
+        for i, threat_bbox in enumerate(threats):
+            threat_center_x = (threat_bbox[0] + threat_bbox[2]) / 2
+            threat_center_y = (threat_bbox[1] + threat_bbox[3]) / 2
+            distance = ((person_center_x - threat_center_x) ** 2 +
+                        (person_center_y - threat_center_y) ** 2) ** 0.5
+            proximity_threshold = min(frame_shape[1], frame_shape[0]) * 0.3
+            if distance < proximity_threshold:
+                nearby.append(i)
+        assignments.append(nearby)
+    return assignments
+
+
+def random_boxes(rng, n, width, height, max_size):
+    xy = rng.uniform(0, [width, height], (n, 2))
+    wh = rng.uniform(10, max_size, (n, 2))
+    return np.c_[xy, xy + wh].astype(np.int32)
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+
+def main():
+    rng = np.random.default_rng(0)
+    frame_shape = (1080, 1920, 3)
+    threshold = min(frame_shape[:2]) * 0.3
+
+    print(f"{'persons':>8} {'threats':>8} {'loop':>10} {'dense':>10} {'grid':>10} {'kdtree':>10}")
+    for n_persons, n_threats in [(2, 3), (10, 10), (50, 50), (200, 200), (1000, 1000)]:
+        persons = random_boxes(rng, n_persons, 1920, 1080, 300)
+        threats = random_boxes(rng, n_threats, 1920, 1080, 80)
+        person_list, threat_list = persons.tolist(), threats.tolist()
+
+        # Sanity check: every kernel agrees with the loop
+        expected = loop_associate(person_list, threat_list, frame_shape)
+        for index in ('dense', 'grid', 'kdtree'):
+            got = associate(persons, threats, threshold, index=index)
+            assert [g.tolist() for g in got] == expected, index
+
+        repeat = 20 if n_persons <= 200 else 3
+        timings = [best_of(lambda: loop_associate(person_list, threat_list, frame_shape), repeat)]
+        for index in ('dense', 'grid', 'kdtree'):
+            timings.append(best_of(lambda: associate(persons, threats, threshold, index=index), repeat))
+        print(f"{n_persons:>8} {n_threats:>8} " + " ".join(f"{t:>8.3f}ms" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
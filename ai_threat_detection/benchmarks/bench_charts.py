@@ -0,0 +1,126 @@
+"""Micro-benchmark: per-frame Plotly figures vs persistent charts (build + to_json)
+
+Run from ai_threat_detection/:  python benchmarks/bench_charts.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from charts import LidarChart, RadarChart
+from lidar import LidarEngine, LidarStructure, ObstacleDetector, display_sample
+from radar import (RadarBand, RadarSimulator, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_MEDIUM,
+                   TYPE_AIRCRAFT, TYPE_NAMES, TYPE_PERSONNEL, TYPE_VEHICLE)
+
+VIDEO_FPS = 30
+CHART_REFRESH = 1.0  # seconds
+
+RADAR_LAYOUT = dict(polar=dict(radialaxis=dict(visible=True, range=[0, 15000])),
+                    showlegend=False, height=400)
+LIDAR_LAYOUT = dict(scene=dict(xaxis_title='X (m)', yaxis_title='Y (m)', zaxis_title='Z (m)'),
+                    height=400)
+
+
+def radar_figure(sweep, max_targets):
+    """The original per-frame radar figure: one trace per labelled target"""
+    fig = go.Figure()
+    detected = sweep.in_range & sweep.targets
+    fig.add_trace(go.Scatterpolar(r=sweep.ranges[detected], theta=sweep.bearings[detected],
+                                  mode='markers', marker=dict(size=6, color='lime')))
+    for target in sweep.contacts()[:max_targets]:
+        type_name = TYPE_NAMES[target['type']]
+        fig.add_trace(go.Scatterpolar(
+            r=[target['range']], theta=[target['bearing']], mode='markers+text',
+            marker=dict(size=10, color='red' if target['priority'] == PRIORITY_HIGH else 'orange'),
+            text=[type_name], name=type_name))
+    fig.update_layout(**RADAR_LAYOUT)
+    return fig
+
+
+def lidar_figure(points, obstacles, labels, rng):
+    """The original per-frame LIDAR figure"""
+    sample = display_sample(points, max_points=2000, rng=rng)
+    fig = go.Figure(data=[go.Scatter3d(
+        x=sample[:, 0], y=sample[:, 1], z=sample[:, 2], mode='markers',
+        marker=dict(size=2, color=sample[:, 2], colorscale='Plasma', opacity=0.8))])
+    if len(obstacles):
+        fig.add_trace(go.Scatter3d(
+            x=obstacles['centroid'][:, 0], y=obstacles['centroid'][:, 1], z=obstacles['max'][:, 2],
+            mode='markers+text', marker=dict(size=6, color='red', symbol='diamond'), text=labels))
+    fig.update_layout(showlegend=False, **LIDAR_LAYOUT)
+    return fig
+
+
+def per_refresh(build, repeat=20):
+    """Best (milliseconds, payload bytes) for building/updating then serializing"""
+    best, size = float('inf'), 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(build().to_json())
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0, size
+
+
+def report(name, before, after):
+    (old_ms, old_bytes), (new_ms, new_bytes) = before, after
+    # Old figures were rebuilt every video frame; charts refresh on their own interval
+    old_per_s = old_ms * VIDEO_FPS
+    new_per_s = new_ms / CHART_REFRESH
+    print(f"{name:>14} {old_ms:>8.2f}ms {new_ms:>8.2f}ms {old_bytes:>9} {new_bytes:>9} "
+          f"{old_per_s:>9.1f}ms {new_per_s:>9.1f}ms")
+
+
+def main():
+    print(f"{'chart':>14} {'old':>10} {'new':>10} {'old bytes':>9} {'new bytes':>9} "
+          f"{'old /s':>11} {'new /s':>11}")
+
+    for n_contacts in [29, 300]:
+        radar = RadarSimulator([
+            RadarBand(0.6, TYPE_PERSONNEL, PRIORITY_LOW, 100, 2000),
+            RadarBand(0.9, TYPE_VEHICLE, PRIORITY_MEDIUM, 500, 8000),
+            RadarBand(0.98, TYPE_AIRCRAFT, PRIORITY_HIGH, 5000, 15000, rcs=10)
+        ], n_contacts=n_contacts, radar_range=15000, rng=np.random.default_rng(0))
+        sweep = radar.sweep(now=0.0)
+        sweep = radar.sweep(now=1.0)
+        max_targets = len(sweep.contacts())
+        chart = RadarChart(RADAR_LAYOUT, contact_size=6, target_size=10, max_targets=max_targets)
+
+        def refresh():
+            with chart.figure.batch_update():
+                chart.update(sweep)
+            return chart.figure
+
+        # Sanity check: the batched trace carries every labelled target
+        refresh()
+        assert len(chart.figure.data) == 2
+        assert len(chart.figure.data[1].r) == max_targets
+        report(f"radar {n_contacts}", per_refresh(lambda: radar_figure(sweep, max_targets)),
+               per_refresh(refresh))
+
+    engine = LidarEngine(100_000, extent=50.0, structures=[
+        LidarStructure(3, spread=40, width=(5, 15), depth=(5, 15), height=(5, 20), share=300),
+        LidarStructure(2, spread=30, width=(4, 4), depth=(8, 8), height=(2, 2), share=40)
+    ], ground_fraction=0.47, rng=np.random.default_rng(0))
+    points = engine.scan()
+    obstacles = ObstacleDetector(rng=np.random.default_rng(1)).detect(points)
+    labels = [f"Obstacle {i}" for i in range(len(obstacles))]
+    chart = LidarChart(LIDAR_LAYOUT, obstacle_size=6, opacity=0.8, max_points=2000,
+                       rng=np.random.default_rng(2))
+
+    def refresh():
+        with chart.figure.batch_update():
+            chart.update(points, obstacles, labels)
+        return chart.figure
+
+    report("lidar 100k", per_refresh(lambda: lidar_figure(points, obstacles, labels,
+                                                          np.random.default_rng(2))),
+           per_refresh(refresh))
+    print(f"(per-second columns: old at {VIDEO_FPS} fps video, new every {CHART_REFRESH:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
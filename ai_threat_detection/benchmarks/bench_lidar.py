@@ -0,0 +1,55 @@
+"""Micro-benchmark: LIDAR scan generation, ground removal and obstacle clustering
+
+Run from ai_threat_detection/:  python benchmarks/bench_lidar.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lidar import LidarEngine, LidarStructure, ObstacleDetector, display_sample
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+
+def main():
+    # Same layout as the military drone simulator
+    structures = [
+        LidarStructure(3, spread=40, width=(5, 15), depth=(5, 15), height=(5, 20), share=300),
+        LidarStructure(2, spread=30, width=(4, 4), depth=(8, 8), height=(2, 2), share=40)
+    ]
+
+    print(f"{'points':>9} {'scan':>10} {'obstacles':>10} {'display':>10} {'found':>6} {'ground':>7}")
+    for n_points in [10_000, 50_000, 100_000, 300_000, 1_000_000]:
+        engine = LidarEngine(n_points, extent=50.0, structures=structures,
+                             ground_fraction=0.47, rng=np.random.default_rng(0))
+        detector = ObstacleDetector(rng=np.random.default_rng(1))
+        points = engine.scan()
+
+        # Sanity check: the fitted plane is the flat ground and nothing on it is lost
+        obstacles = detector.detect(points)
+        assert abs(detector.plane[2]) > 0.99 and abs(detector.plane[3]) < 0.05, detector.plane
+        assert 1 <= len(obstacles) <= len(engine.box_min), len(obstacles)
+
+        repeat = 10 if n_points <= 100_000 else 3
+        timings = [
+            best_of(engine.scan, repeat),
+            best_of(lambda: detector.detect(points), repeat),
+            best_of(lambda: display_sample(points, rng=np.random.default_rng(2)), repeat)
+        ]
+        print(f"{n_points:>9} " + " ".join(f"{t:>8.2f}ms" for t in timings) +
+              f" {len(obstacles):>6} {detector.ground_mask.mean():>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import abc
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+from lidar import display_sample
+from radar import CONTACT_DTYPE, PRIORITY_HIGH, TYPE_NAMES
+
+# -----------------------------------------------------
+# Persistent Plotly Figures
+# -----------------------------------------------------
+
+class LiveChart(abc.ABC):
+    def __init__(self, refresh_interval=0.5, measure=False):
+        """A figure built once; refreshes replace trace data on their own interval"""
+        self.refresh_interval = refresh_interval  # seconds, independent of the video rate
+        self.measure = measure                    # record payload size/time per refresh
+        self.figure = self.build()
+        self.last_refresh = 0.0
+        self.refreshes = 0
+        self.payload_bytes = 0
+        self.serialize_ms = 0.0
+
+    @abc.abstractmethod
+    def build(self):
+        """The figure with empty traces"""
+
+    @abc.abstractmethod
+    def update(self, *args, **kwargs):
+        """Replace trace data in self.figure"""
+
+    def due(self, now=None):
+        now = time.time() if now is None else now
+        return now - self.last_refresh >= self.refresh_interval
+
+    def serialization_cost(self):
+        """(bytes, milliseconds) to serialize the figure the way plotly_chart does"""
+        started = time.perf_counter()
+        payload = self.figure.to_json()
+        return len(payload), (time.perf_counter() - started) * 1000.0
+
+    def render(self, placeholder, *args, now=None, **kwargs):
+        """Update and redraw when due; returns True if the chart was sent"""
+        if not self.due(now):
+            return False
+        self.last_refresh = time.time() if now is None else now
+        with self.figure.batch_update():
+            self.update(*args, **kwargs)
+        if self.measure:
+            self.payload_bytes, self.serialize_ms = self.serialization_cost()
+        placeholder.plotly_chart(self.figure, use_container_width=True)
+        self.refreshes += 1
+        return True
+
+
+class RadarChart(LiveChart):
+    def __init__(self, layout, contact_size=4, target_size=8, max_contacts=None, max_targets=3,
+                 contact_color='lime', text_color=None, radar_range=None, **kwargs):
+        """Two polar traces: every contact, and the labelled priority targets (batched)
+
+        The displayed contacts are kept here and patched with each sweep's
+        RadarTrackDelta, so a refresh with no changed track sends nothing.
+        """
+        self.layout = layout
+        self.contact_size = contact_size
+        self.target_size = target_size
+        self.max_contacts = max_contacts
+        self.max_targets = max_targets
+        self.contact_color = contact_color
+        self.text_color = text_color
+        self.radar_range = radar_range  # contacts beyond are tracked but not drawn
+        self.contacts = np.zeros(0, dtype=CONTACT_DTYPE)
+        self.changed = False  # contacts differ from what was last drawn
+        super().__init__(**kwargs)
+
+    def apply(self, delta):
+        """Fold one sweep's RadarTrackDelta into the displayed contacts"""
+        if not len(delta):
+            return
+        replaced = np.isin(self.contacts['id'], np.concatenate([delta.updated['id'], delta.removed]))
+        self.contacts = np.concatenate([self.contacts[~replaced], delta.updated])
+        self.changed = True
+
+    def render(self, placeholder, delta=None, now=None):
+        """Apply delta (every sweep); redraw on the interval, and only if a track changed"""
+        if delta is not None:
+            self.apply(delta)
+        if not self.changed or not super().render(placeholder, now=now):
+            return False
+        self.changed = False
+        return True
+
+    def build(self):
+        figure = go.Figure([
+            go.Scatterpolar(r=[], theta=[], mode='markers', name='Contacts',
+                            marker=dict(size=self.contact_size, color=self.contact_color)),
+            go.Scatterpolar(r=[], theta=[], mode='markers+text', name='Targets', text=[],
+                            marker=dict(size=self.target_size, color=[]),
+                            textfont=dict(color=self.text_color) if self.text_color else None)
+        ])
+        figure.update_layout(**self.layout)
+        return figure
+
+    def update(self, sweep=None):
+        """Draw the tracked contacts; a full RadarSweep replaces them first"""
+        if sweep is not None:
+            self.contacts = sweep.contacts()
+        contacts, targets = self.figure.data
+        shown = self.contacts
+        if self.radar_range is not None:
+            shown = shown[shown['range'] < self.radar_range]
+        contacts.r = shown['range'][:self.max_contacts]
+        contacts.theta = shown['bearing'][:self.max_contacts]
+
+        # highest priority first, nearest first within a priority
+        labelled = self.contacts[np.lexsort((self.contacts['range'], -self.contacts['priority'].astype(np.int16)))]
+        labelled = labelled[:self.max_targets]
+        targets.r = labelled['range']
+        targets.theta = labelled['bearing']
+        targets.text = TYPE_NAMES[labelled['type']].tolist()
+        targets.marker.color = np.where(labelled['priority'] == PRIORITY_HIGH, 'red', 'orange').tolist()
+
+
+class LidarChart(LiveChart):
+    def __init__(self, layout, point_size=2, obstacle_size=5, opacity=0.6, max_points=1000,
+                 voxel_size=0.5, text_color=None, rng=None, **kwargs):
+        """Downsampled point cloud plus one trace holding every obstacle marker"""
+        self.layout = layout
+        self.point_size = point_size
+        self.obstacle_size = obstacle_size
+        self.opacity = opacity
+        self.max_points = max_points
+        self.voxel_size = voxel_size
+        self.text_color = text_color
+        self.rng = rng
+        super().__init__(**kwargs)
+
+    def build(self):
+        figure = go.Figure([
+            go.Scatter3d(x=[], y=[], z=[], mode='markers', name='Points',
+                         marker=dict(size=self.point_size, color=[], colorscale='Plasma',
+                                     opacity=self.opacity)),
+            go.Scatter3d(x=[], y=[], z=[], mode='markers+text', name='Obstacles', text=[],
+                         marker=dict(size=self.obstacle_size, color='red', symbol='diamond'),
+                         textfont=dict(color=self.text_color) if self.text_color else None)
+        ])
+        figure.update_layout(showlegend=False, **self.layout)
+        return figure
+
+    def update(self, points, obstacles=None, labels=()):
+        cloud, markers = self.figure.data
+        sample = display_sample(points, self.max_points, self.voxel_size, rng=self.rng)
+        cloud.x, cloud.y, cloud.z = sample[:, 0], sample[:, 1], sample[:, 2]
+        cloud.marker.color = sample[:, 2]
+
+        if obstacles is None or len(obstacles) == 0:
+            markers.x = markers.y = markers.z = []
+            markers.text = []
+        else:
+            markers.x = obstacles['centroid'][:, 0]
+            markers.y = obstacles['centroid'][:, 1]
+            markers.z = obstacles['max'][:, 2]
+            markers.text = list(labels)
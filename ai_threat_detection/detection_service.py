@@ -0,0 +1,311 @@
+import argparse
+import json
+import signal
+import socket
+import socketserver
+import threading
+import time
+
+import numpy as np
+
+from batch_inference import parse_source
+from frame_pipeline import LatestQueue
+from video_output import JPEGEncoder, MJPEGServer, SensorMosaic
+
+# -----------------------------------------------------
+# Detection Messages over a Local Socket (NDJSON)
+# -----------------------------------------------------
+
+DEFAULT_PORT = 8765
+DEFAULT_MJPEG_PORT = 8554
+
+
+def _json_default(value):
+    """numpy scalars/arrays in detection dicts and pipeline stats"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_message(message):
+    """One newline-terminated JSON line"""
+    return json.dumps(message, default=_json_default, separators=(',', ':')).encode() + b'\n'
+
+
+class _SubscriberHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        publisher = self.server.publisher
+        outbox = LatestQueue(maxsize=publisher.max_pending)
+        publisher.attach(outbox)
+        try:
+            self.request.sendall(encode_message(publisher.hello))
+            while not publisher.stopping:
+                line = outbox.get(timeout=1.0)
+                if line is not None:
+                    self.request.sendall(line)
+        except OSError:
+            pass  # subscriber went away
+        finally:
+            publisher.detach(outbox)
+
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128  # many dashboards may connect at once
+
+
+class DetectionPublisher:
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, max_pending=8, hello=None):
+        """Fan detection messages out to any number of socket subscribers
+
+        Each message is serialized once; every subscriber has its own bounded
+        drop-oldest queue, so a slow viewer never stalls detection or other viewers.
+        """
+        self.max_pending = max_pending
+        self.hello = dict(hello or {}, type='hello')
+        self.stopping = False
+        self.outboxes = set()
+        self.lock = threading.Lock()
+        self.published = 0
+        self.server = _ThreadingTCPServer((host, port), _SubscriberHandler)
+        self.server.publisher = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def attach(self, outbox):
+        with self.lock:
+            self.outboxes.add(outbox)
+
+    def detach(self, outbox):
+        with self.lock:
+            self.outboxes.discard(outbox)
+
+    def subscriber_count(self):
+        with self.lock:
+            return len(self.outboxes)
+
+    def publish(self, message):
+        line = encode_message(message)
+        with self.lock:
+            outboxes = list(self.outboxes)
+        for outbox in outboxes:
+            outbox.put(line)
+        self.published += 1
+        return len(outboxes)
+
+    def stop(self):
+        self.stopping = True
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class DetectionSubscriber:
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, reconnect_delay=1.0):
+        """Background reader keeping the newest message from a DetectionPublisher
+
+        Reconnects automatically, so dashboards survive service restarts.
+        """
+        self.host = host
+        self.port = port
+        self.reconnect_delay = reconnect_delay
+        self.cond = threading.Condition()
+        self.hello = None
+        self.hellos = 0       # connections made; streams may have moved after a service restart
+        self.message = None
+        self.received = 0     # counted here, so a restarted service (seq back at 1) is not ignored
+        self.connected = False
+        self.running = False
+        self.sock = None
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name='detection-subscriber', daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while self.running:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=5.0) as sock:
+                    sock.settimeout(None)
+                    self.sock = sock
+                    self.connected = True
+                    for line in sock.makefile('rb'):
+                        self._receive(json.loads(line))
+            except (OSError, ValueError):
+                pass
+            self.connected = False
+            self.sock = None
+            if self.running:
+                time.sleep(self.reconnect_delay)
+
+    def _receive(self, message):
+        with self.cond:
+            if message.get('type') == 'hello':
+                self.hello = message
+                self.hellos += 1
+                return
+            self.message = message
+            self.received += 1
+            self.cond.notify_all()
+
+    def latest(self, after=0, timeout=1.0):
+        """(count, message) for the newest message once more than after have arrived
+
+        count is this subscriber's own message counter (pass it back as after);
+        (after, None) on timeout.
+        """
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.received > after, timeout):
+                return after, None
+            return self.received, self.message
+
+    def stream_url(self, stream):
+        """MJPEG URL for the browser: the service's announced mjpeg_url, else the host we connected to"""
+        if not self.hello or not self.hello.get('mjpeg_port'):
+            return None
+        base = self.hello.get('mjpeg_url') or f"http://{self.host}:{self.hello['mjpeg_port']}"
+        return f"{base.rstrip('/')}/{stream}"
+
+    def stop(self):
+        self.running = False
+        sock = self.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+# -----------------------------------------------------
+# Headless Detection Service
+# -----------------------------------------------------
+
+class DetectionService:
+    def __init__(self, detector, publisher, mjpeg=None, video_encoder=None,
+                 sensor_encoder=None, sensors=True, sensor_interval=0.2):
+        """Run EnhancedThreatDetector once and publish results for every viewer"""
+        self.detector = detector
+        self.publisher = publisher
+        self.mjpeg = mjpeg
+        self.video_encoder = video_encoder or JPEGEncoder(quality=80)
+        self.sensor_encoder = sensor_encoder or JPEGEncoder(quality=70)
+        self.sensor_mosaic = SensorMosaic((320, 240), columns=2, labels=["THERMAL", "INFRARED"])
+        self.sensors = sensors
+        self.sensor_interval = sensor_interval  # seconds between thermal/IR views
+        self.last_sensor_time = 0.0
+        self.thermal = None
+        self.seq = 0
+        self.running = False
+
+    def step(self, frame, persons, threat_objects):
+        """Publish one annotated frame and its detections"""
+        self.seq += 1
+        now = time.time()
+        if self.mjpeg is not None:
+            self.mjpeg.publish('video', self.video_encoder.encode(frame))
+
+        if self.sensors and now - self.last_sensor_time >= self.sensor_interval:
+            self.last_sensor_time = now
+            sensor_sim = self.detector.sensor_sim
+            thermal_img, self.thermal = sensor_sim.generate_thermal_data(
+                frame, [p['bbox'] for p in persons])
+            ir_img = sensor_sim.generate_ir_data(frame)
+            if self.mjpeg is not None:
+                view = self.sensor_mosaic.compose([thermal_img, ir_img])
+                self.mjpeg.publish('sensors', self.sensor_encoder.encode(view))
+
+        message = {
+            'type': 'detections',
+            'seq': self.seq,
+            'timestamp': now,
+            'frame_shape': frame.shape,
+            'persons': [p.to_dict() for p in persons],
+            'threats': [t.to_dict() for t in threat_objects],
+            'scheduler': self.detector.get_scheduler_metrics(),
+            'pipeline': self.detector.get_pipeline_stats()
+        }
+        if self.thermal is not None:
+            message['thermal'] = {'mean': self.thermal.mean, 'max': self.thermal.max,
+                                  'hotspots': len(self.thermal.hotspots)}
+        self.publisher.publish(message)
+
+    def run(self, source=0, duration=None):
+        if not self.detector.start_camera(source):
+            print(f"❌ Could not open source {source}")
+            return False
+        self.running = True
+        started = time.time()
+        try:
+            while self.running and (duration is None or time.time() - started < duration):
+                frame, persons, threat_objects = self.detector.get_frame()
+                if frame is None:
+                    continue
+                self.step(frame, persons, threat_objects)
+        finally:
+            self.detector.stop_camera()
+        return True
+
+    def stop(self):
+        self.running = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless threat detection service")
+    parser.add_argument('--source', default='0', help="Camera index, video file or stream URL")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface for the detection socket and MJPEG streams")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Detection socket (NDJSON)")
+    parser.add_argument('--mjpeg-port', type=int, default=DEFAULT_MJPEG_PORT,
+                        help="MJPEG streams /video and /sensors (0 disables)")
+    parser.add_argument('--public-host', default=None,
+                        help="Host name viewers' browsers use to reach the MJPEG streams "
+                             "(default: this machine's name when --host is 0.0.0.0)")
+    parser.add_argument('--quality', type=int, default=80, help="JPEG quality of published frames")
+    parser.add_argument('--no-sensors', action='store_true', help="Skip thermal/IR simulation")
+    parser.add_argument('--backend', default=None, help="Inference backend (torch, onnx, openvino, ...)")
+    parser.add_argument('--duration', type=float, default=None, help="Seconds to run (default: forever)")
+    args = parser.parse_args()
+
+    from enhanced_streamlit_demo import EnhancedThreatDetector
+
+    detector = EnhancedThreatDetector(backend=args.backend)
+    mjpeg = MJPEGServer(args.host, args.mjpeg_port).start() if args.mjpeg_port else None
+    # The browser, not the dashboard process, opens the streams; announce a host it can reach
+    public_host = args.public_host or (socket.getfqdn() if args.host in ('0.0.0.0', '::') else None)
+    publisher = DetectionPublisher(args.host, args.port, hello={
+        'mjpeg_port': mjpeg.httpd.server_address[1] if mjpeg else None,
+        'mjpeg_url': f"http://{public_host}:{mjpeg.httpd.server_address[1]}" if mjpeg and public_host else None,
+        'streams': ['video', 'sensors'] if mjpeg else []
+    }).start()
+    service = DetectionService(
+        detector, publisher, mjpeg,
+        video_encoder=JPEGEncoder(quality=args.quality),
+        sensor_encoder=JPEGEncoder(quality=args.quality),
+        sensors=not args.no_sensors
+    )
+
+    signal.signal(signal.SIGTERM, lambda *_: service.stop())
+    print(f"📡 Detections on {args.host}:{args.port}"
+          + (f", video at {mjpeg.url('video')}" if mjpeg else ""))
+    try:
+        service.run(parse_source(args.source), args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.stop()
+        if mjpeg is not None:
+            mjpeg.stop()
+
+
+if __name__ == "__main__":
+    main()
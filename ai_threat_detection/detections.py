@@ -0,0 +1,163 @@
+import numpy as np
+
+# -----------------------------------------------------
+# Compact Detection Storage
+# -----------------------------------------------------
+
+# Threat levels per class, stored as small integer codes
+LEVEL_NONE = 0
+LEVEL_PERSON = 1
+LEVEL_POTENTIAL = 2
+LEVEL_IMMEDIATE = 3
+
+THREAT_LEVEL_NAMES = {
+    LEVEL_POTENTIAL: 'POTENTIAL_THREAT',
+    LEVEL_IMMEDIATE: 'IMMEDIATE_THREAT'
+}
+
+DETECTION_DTYPE = np.dtype([
+    ('class_id', np.int16),
+    ('confidence', np.float32),
+    ('bbox', np.int32, (4,)),
+    ('level', np.uint8)
+])
+
+
+class Detection:
+    """Lightweight detection record; supports dict-style access for existing UI code"""
+    __slots__ = (
+        'name', 'class_id', 'confidence', 'bbox', 'status', 'threat_level',
+        'risk_score', 'original_class', 'type', 'nearby_threats', 'gps_offset',
+        'track_id'
+    )
+
+    def __init__(self, name, confidence, bbox, class_id=-1, **fields):
+        self.name = name
+        self.class_id = class_id
+        self.confidence = confidence
+        self.bbox = bbox
+        for slot in self.__slots__[4:]:
+            setattr(self, slot, fields.pop(slot, None))
+        if fields:
+            raise TypeError(f"Unknown detection fields: {', '.join(fields)}")
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def copy(self, **changes):
+        """Shallow copy with some fields replaced"""
+        clone = Detection.__new__(Detection)
+        for slot in self.__slots__:
+            setattr(clone, slot, changes.pop(slot, getattr(self, slot)))
+        if changes:
+            raise TypeError(f"Unknown detection fields: {', '.join(changes)}")
+        return clone
+
+    def to_dict(self):
+        """Plain dict of the populated fields (for JSON output)"""
+        data = {}
+        for slot in self.__slots__:
+            value = getattr(self, slot)
+            if value is None:
+                continue
+            if slot == 'nearby_threats':
+                value = [threat.to_dict() for threat in value]
+            data[slot] = value
+        return data
+
+    def __repr__(self):
+        return f"Detection({self.name!r}, {self.confidence:.2f}, {self.bbox})"
+
+# -----------------------------------------------------
+# Precomputed Class-ID Lookup
+# -----------------------------------------------------
+
+class ClassLookup:
+    def __init__(self, names, threat_keywords=(), immediate_classes=(), immediate_ids=()):
+        """Resolve person/threat classification once per model class instead of per box"""
+        if isinstance(names, dict):
+            size = max(names) + 1 if names else 0
+            name_of = names.get
+        else:
+            size = len(names)
+            name_of = lambda i: names[i]
+
+        self.names = [name_of(i) or '' for i in range(size)]
+        self.levels = np.zeros(size, dtype=np.uint8)
+        immediate_classes = set(immediate_classes)
+        immediate_ids = set(immediate_ids)
+
+        for class_id, class_name in enumerate(self.names):
+            lowered = class_name.lower()
+            if lowered == 'person':
+                self.levels[class_id] = LEVEL_PERSON
+            elif class_id in immediate_ids:
+                self.levels[class_id] = LEVEL_IMMEDIATE
+            elif any(keyword in lowered for keyword in threat_keywords):
+                if lowered in immediate_classes:
+                    self.levels[class_id] = LEVEL_IMMEDIATE
+                else:
+                    self.levels[class_id] = LEVEL_POTENTIAL
+
+    def level_of(self, class_ids):
+        """Threat level codes for an array of class IDs (unknown IDs map to LEVEL_NONE)"""
+        class_ids = np.asarray(class_ids, dtype=np.int64)
+        known = (class_ids >= 0) & (class_ids < len(self.levels))
+        levels = np.zeros(len(class_ids), dtype=np.uint8)
+        levels[known] = self.levels[class_ids[known]]
+        return levels
+
+# -----------------------------------------------------
+# Results -> Arrays Conversion
+# -----------------------------------------------------
+
+def results_to_array(results, lookup, offset=None):
+    """Pull cls/conf/xyxy out of YOLO results once and return a DETECTION_DTYPE array
+
+    offset=(x, y) shifts boxes from a cropped region back into full-frame pixels.
+    """
+    chunks = []
+    for result in results:
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            continue
+        # boxes.data is (N, 6) [x1, y1, x2, y2, conf, cls] or (N, 7) with a track ID
+        data = boxes.data
+        if hasattr(data, 'cpu'):
+            data = data.cpu().numpy()
+        chunks.append(np.asarray(data))
+
+    if not chunks:
+        return np.zeros(0, dtype=DETECTION_DTYPE)
+    data = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
+    detections = np.empty(len(data), dtype=DETECTION_DTYPE)
+    class_ids = data[:, -1].astype(np.int64)
+    detections['class_id'] = class_ids
+    detections['confidence'] = data[:, -2]
+    detections['bbox'] = data[:, :4]  # truncates like int(x)
+    detections['level'] = lookup.level_of(class_ids)
+    if offset is not None:
+        detections['bbox'] += np.array([offset[0], offset[1], offset[0], offset[1]], dtype=np.int32)
+    return detections
+
+
+def person_mask(detections):
+    return detections['level'] == LEVEL_PERSON
+
+
+def threat_mask(detections):
+    return detections['level'] >= LEVEL_POTENTIAL
@@ -1,227 +1,179 @@
 import cv2
+import os
 import numpy as np
 import streamlit as st
-from ultralytics import YOLO
 import time
-import plotly.graph_objects as go
 import plotly.express as px
-import folium
+from urllib.parse import urlparse
 from streamlit_folium import st_folium
+from inference_backends import create_backend
+from frame_pipeline import FramePipeline
+from association import associate
+from tracker import ByteTracker
+from lidar import LidarEngine, LidarStructure, ObstacleDetector
+from radar import (RadarBand, RadarSimulator, PRIORITY_HIGH, PRIORITY_MEDIUM,
+                   TYPE_NAMES, TYPE_PERSONNEL, TYPE_VEHICLE)
+from infrared import IRProcessor
+from thermal import ThermalEngine
+from tactical_map import MapFeedServer, TacticalMapLayer
+from charts import LidarChart, RadarChart
+from video_output import JPEGEncoder, SensorMosaic
+from detection_service import DetectionSubscriber, DEFAULT_PORT
+from geo import CameraModel, GeoIndex, offset_to_latlon
+from gps import GPSSimulator, GPSTrack
+from scheduler import AdaptiveScheduler, ROI, SKIP
+from detections import (ClassLookup, Detection, LEVEL_IMMEDIATE,
+                        person_mask, results_to_array, threat_mask)
 
 # -----------------------------------------------------
 # Multi-Sensor Simulator for Military Applications
 # -----------------------------------------------------
 
 class MultiSensorSimulator:
-    def __init__(self):
+    def __init__(self, seed=None):
         """Initialize multi-sensor simulation capabilities"""
+        # Shared random generator (pass a seed for reproducible runs)
+        self.rng = np.random.default_rng(seed)
+        
         self.radar_range = 5000  # meters
         self.thermal_baseline = 25  # Celsius
         
+        # Thermal: persistent temperature field, body heat at detected persons
+        self.thermal = ThermalEngine(baseline=self.thermal_baseline, noise=5, rng=self.rng)
+        
+        # IR: CLAHE and buffers created once (process_scale < 1 for large frames)
+        self.ir = IRProcessor(rng=self.rng)
+        
+        # Radar: persistent contacts, 3 in 5 personnel, the rest vehicles
+        self.radar = RadarSimulator([
+            RadarBand(0.95, TYPE_PERSONNEL, PRIORITY_MEDIUM, 100, 1000),
+            RadarBand(0.98, TYPE_VEHICLE, PRIORITY_HIGH, 1000, 5000)
+        ], n_contacts=9, radar_range=self.radar_range, rng=self.rng)
+        
+        # LIDAR: ground plus 3 elevated objects (buildings, vehicles)
+        self.lidar = LidarEngine(100_000, extent=25.0, structures=[
+            LidarStructure(3, spread=20, width=(2, 6), depth=(2, 6), height=(2, 8))
+        ], ground_fraction=0.7, rng=self.rng)
+        self.obstacle_detector = ObstacleDetector(alert_range=10.0, rng=self.rng)
+        
         # GPS simulation - Military base coordinates (New Delhi area)
         self.base_lat = 28.6139  # New Delhi latitude
         self.base_lon = 77.2090  # New Delhi longitude
         self.base_alt = 216.0    # Altitude in meters
         self.gps_accuracy = 3.5  # GPS accuracy in meters
         
-    def generate_thermal_data(self, rgb_frame):
-        """Generate thermal imaging data from RGB frame"""
-        # Convert to grayscale for thermal base
-        gray = cv2.cvtColor(rgb_frame, cv2.COLOR_BGR2GRAY)
-        
-        # Apply thermal colormap
-        thermal = cv2.applyColorMap(gray, cv2.COLORMAP_JET)
-        
-        # Generate temperature overlay
-        height, width = gray.shape
-        temp_overlay = np.random.normal(self.thermal_baseline, 5, (height, width))
-        
-        # Simulate human body heat (higher temperature areas)
-        for _ in range(np.random.randint(1, 3)):
-            x = np.random.randint(50, width-50)
-            y = np.random.randint(50, height-50)
-            size = np.random.randint(20, 35)
-            cv2.circle(temp_overlay, (x, y), size, 37, -1)  # Body temperature
-        
-        return thermal, temp_overlay
+        # GPS/INS: smooth patrol path at 10 Hz, history in a fixed-size ring buffer
+        # shared by the dashboard metrics and the map trail
+        self.gps = GPSSimulator(self.base_lat, self.base_lon, self.base_alt, rate=10.0,
+                                accuracy=self.gps_accuracy, track=GPSTrack(capacity=36000),
+                                rng=self.rng)
+        
+        # Camera geometry for projecting detections to the ground, and a geohash
+        # index of located entities keyed by track ID
+        self.camera = CameraModel(hfov=60, tilt=20, mount_height=3.0, ground_altitude=self.base_alt)
+        self.geo_index = GeoIndex(precision=8)
+        self.geo_max_age = 600.0  # seconds an unseen entity stays indexed
+        self.last_geo_prune = 0.0
+        
+        # Tactical map: base map built once, entity markers sent as deltas
+        self.tactical_map = TacticalMapLayer(self.base_lat, self.base_lon, refresh_interval=2.0)
+        
+    def generate_thermal_data(self, rgb_frame, person_boxes=()):
+        """Thermal view of the frame and stats of the persistent temperature field"""
+        self.thermal.update(rgb_frame.shape, person_boxes)
+        return self.thermal.render(rgb_frame), self.thermal.stats()
     
     def generate_radar_data(self):
-        """Generate radar sweep data with targets"""
-        angles = np.linspace(0, 360, 180)
-        ranges = []
-        targets = []
-        
-        for angle in angles:
-            rand = np.random.random()
-            
-            if rand > 0.95:  # 5% chance of detection
-                if rand > 0.98:  # High priority target
-                    distance = np.random.uniform(1000, 5000)
-                    targets.append({
-                        'type': 'VEHICLE', 
-                        'range': distance, 
-                        'bearing': angle,
-                        'priority': 'HIGH'
-                    })
-                else:  # Personnel
-                    distance = np.random.uniform(100, 1000)
-                    targets.append({
-                        'type': 'PERSONNEL', 
-                        'range': distance, 
-                        'bearing': angle,
-                        'priority': 'MEDIUM'
-                    })
-                ranges.append(distance)
-            else:
-                ranges.append(self.radar_range)  # No detection
-        
-        return angles, ranges, targets
+        """Advance the radar scene one sweep; returns the changed tracks (RadarTrackDelta)"""
+        return self.radar.step()
     
     def generate_lidar_data(self):
-        """Generate 3D LIDAR point cloud data"""
-        # Ground plane points
-        n_points = 200
-        x = np.random.uniform(-25, 25, n_points)
-        y = np.random.uniform(-25, 25, n_points)
-        z = np.random.uniform(-1, 1, n_points)  # Ground level
-        
-        # Add some elevated objects (buildings, vehicles)
-        for _ in range(3):
-            obj_x = np.random.uniform(-20, 20, 30)
-            obj_y = np.random.uniform(-20, 20, 30)
-            obj_z = np.random.uniform(2, 8, 30)  # Elevated objects
-            
-            x = np.concatenate([x, obj_x])
-            y = np.concatenate([y, obj_y])
-            z = np.concatenate([z, obj_z])
-        
-        return x, y, z
+        """Generate a 3D LIDAR scan; (N, 3) float32 buffer reused by the next scan"""
+        return self.lidar.scan()
+    
+    def detect_lidar_obstacles(self, points):
+        """Ground removal and clustering; returns (OBSTACLE_DTYPE array, Detection records)"""
+        obstacles = self.obstacle_detector.detect(points)
+        return obstacles, self.obstacle_detector.to_detections(obstacles)
     
     def generate_ir_data(self, rgb_frame):
-        """Generate infrared imaging data"""
-        # Convert to grayscale
-        gray = cv2.cvtColor(rgb_frame, cv2.COLOR_BGR2GRAY)
-        
-        # Enhance contrast for IR effect
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-        enhanced = clahe.apply(gray)
-        
-        # Apply IR colormap
-        ir_image = cv2.applyColorMap(enhanced, cv2.COLORMAP_HOT)
-        
-        return ir_image
+        """Generate infrared imaging data (buffer reused by the next call)"""
+        return self.ir.process(rgb_frame)
     
     def generate_gps_data(self):
-        """Generate GPS coordinates with military precision"""
-        # Simulate slight movement around base coordinates
-        lat_offset = np.random.uniform(-0.001, 0.001)  # ~100m variation
-        lon_offset = np.random.uniform(-0.001, 0.001)  # ~100m variation
-        alt_offset = np.random.uniform(-5, 5)          # 5m altitude variation
-        
-        current_lat = self.base_lat + lat_offset
-        current_lon = self.base_lon + lon_offset
-        current_alt = self.base_alt + alt_offset
-        
-        # GPS quality metrics
-        hdop = np.random.uniform(0.8, 2.1)  # Horizontal Dilution of Precision
-        satellites = np.random.randint(8, 12)  # Number of satellites
-        
-        return {
-            'latitude': current_lat,
-            'longitude': current_lon,
-            'altitude': current_alt,
-            'accuracy': self.gps_accuracy,
-            'hdop': hdop,
-            'satellites': satellites,
-            'timestamp': time.time()
-        }
+        """Advance the GPS/INS path to now; returns the latest fix from the shared track"""
+        return self.gps.advance()
     
-    def create_tactical_map(self, gps_data, persons=None, threats=None):
-        """Create tactical map with GPS location and detected entities"""
-        # Create base map
-        m = folium.Map(
-            location=[gps_data['latitude'], gps_data['longitude']],
-            zoom_start=18,
-            tiles='OpenStreetMap'
-        )
-        
-        # Add satellite imagery layer
-        folium.TileLayer(
-            tiles='https://mt1.google.com/vt/lyrs=s&x={x}&y={y}&z={z}',
-            attr='Google Satellite',
-            name='Satellite View',
-            overlay=False,
-            control=True
-        ).add_to(m)
-        
-        # Current position marker
-        folium.Marker(
-            [gps_data['latitude'], gps_data['longitude']],
-            popup=f"""
-            <b>Military Base Position</b><br>
-            Lat: {gps_data['latitude']:.6f}<br>
-            Lon: {gps_data['longitude']:.6f}<br>
-            Alt: {gps_data['altitude']:.1f}m<br>
-            Accuracy: {gps_data['accuracy']}m<br>
-            Satellites: {gps_data['satellites']}
-            """,
-            icon=folium.Icon(color='blue', icon='crosshairs', prefix='fa')
-        ).add_to(m)
-        
-        # Add accuracy circle
-        folium.Circle(
-            location=[gps_data['latitude'], gps_data['longitude']],
-            radius=gps_data['accuracy'],
-            color='blue',
-            fillColor='lightblue',
-            fillOpacity=0.2,
-            popup=f'GPS Accuracy: {gps_data["accuracy"]}m'
-        ).add_to(m)
-        
-        # Add detected persons
-        if persons:
-            for i, person in enumerate(persons):
-                # Generate nearby coordinates for detected persons
-                person_lat = gps_data['latitude'] + np.random.uniform(-0.0001, 0.0001)
-                person_lon = gps_data['longitude'] + np.random.uniform(-0.0001, 0.0001)
-                
-                color = 'red' if person['status'] == 'DANGER' else 'green'
-                icon_name = 'exclamation-triangle' if person['status'] == 'DANGER' else 'user'
-                
-                folium.Marker(
-                    [person_lat, person_lon],
-                    popup=f"""
-                    <b>{person['name']}</b><br>
-                    Status: {person['status']}<br>
-                    Confidence: {person['confidence']:.2f}<br>
-                    Threats: {len(person.get('nearby_threats', []))}
-                    """,
-                    icon=folium.Icon(color=color, icon=icon_name, prefix='fa')
-                ).add_to(m)
-        
-        # Add layer control
-        folium.LayerControl().add_to(m)
-        
-        return m
+    def locate_entities(self, gps_data, frame_shape, persons=(), threats=()):
+        """Project detection footprints to lat/lon (stored as gps_offset) and index them"""
+        now = gps_data['timestamp']
+        for kind, entities in (('person', persons), ('threat', threats)):
+            if not entities:
+                continue
+            lats, lons = self.camera.project([e['bbox'] for e in entities], frame_shape, gps_data)
+            for entity, lat, lon in zip(entities, lats.tolist(), lons.tolist()):
+                entity['gps_offset'] = {
+                    'lat_offset': lat - gps_data['latitude'],
+                    'lon_offset': lon - gps_data['longitude']
+                }
+                if entity['track_id'] is not None:
+                    self.geo_index.upsert(f"{kind}-{entity['track_id']}", lat, lon,
+                                          data=entity, timestamp=now)
+        
+        if now - self.last_geo_prune > 10.0:
+            self.geo_index.prune(now - self.geo_max_age)
+            self.last_geo_prune = now
+    
+    def locate_obstacles(self, gps_data, obstacles, detections):
+        """gps_offset for LIDAR obstacles from their centroids (sensor frame: x east, y north)"""
+        if not len(obstacles):
+            return
+        centroids = obstacles['centroid'].astype(np.float64)
+        lats, lons = offset_to_latlon(gps_data['latitude'], gps_data['longitude'],
+                                      centroids[:, 1], centroids[:, 0])
+        for detection, lat, lon in zip(detections, lats.tolist(), lons.tolist()):
+            detection['gps_offset'] = {
+                'lat_offset': lat - gps_data['latitude'],
+                'lon_offset': lon - gps_data['longitude']
+            }
+    
+    def entities_near_base(self, radius=50.0, kind='threat'):
+        """Indexed entities of one kind within radius meters of the base position"""
+        return [entry for entry in self.geo_index.query_radius(self.base_lat, self.base_lon, radius)
+                if entry.entity_id.startswith(kind + '-')]
+    
+    def update_tactical_map(self, gps_data, persons=None, threats=None):
+        """Refresh map entities when due; returns a MapDelta, or None between refreshes"""
+        if not self.tactical_map.due():
+            return None
+        trail = self.gps.track.trail(epsilon=2.0, last=6000)  # last 10 minutes
+        return self.tactical_map.update(gps_data, persons or (), threats or (), trail=trail)
 
 # -----------------------------------------------------
 # Enhanced Threat Detection System
 # -----------------------------------------------------
 
 class EnhancedThreatDetector:
-    def __init__(self):
+    def __init__(self, backend=None):
         """Initialize the enhanced threat detection system"""
-        # Load YOLO model
-        self.model = YOLO('yolov8n.pt')
+        # Load YOLO model on the configured runtime (torch, onnx, openvino, openvino-int8)
+        self.inference_args = {'conf': 0.3, 'verbose': False, 'imgsz': 416}
+        self.backend = create_backend('yolov8n.pt', imgsz=self.inference_args['imgsz'],
+                                      backend=backend)
+        self.model = self.backend.model
         
         # Initialize multi-sensor simulator
         self.sensor_sim = MultiSensorSimulator()
         
-        # Performance optimization
-        self.frame_skip_counter = 0
-        self.detection_interval = 2
+        # Performance optimization: the scheduler picks full-frame, motion-ROI or
+        # no inference per frame; trackers predict box positions in between
+        self.scheduler = AdaptiveScheduler(target_fps=15, max_interval=5)
         self.last_detection_result = ([], [])
         
+        # Persistent track IDs for persons and threat objects
+        self.person_tracker = ByteTracker()
+        self.threat_tracker = ByteTracker()
+        
         # Threat keywords
         self.threat_keywords = [
             'scissors', 'knife', 'blade', 'pen', 'pencil', 
@@ -231,98 +183,107 @@ class EnhancedThreatDetector:
             'baseball bat', 'bat', 'hammer', 'screwdriver',
             'umbrella', 'cane', 'ruler'
         ]
+        self.class_lookup = ClassLookup(
+            self.model.names, self.threat_keywords,
+            immediate_classes=['toothbrush', 'baseball bat', 'bat']
+        )
+        
+        # Person/threat association: 'center', 'edge' or 'iou'
+        self.association_mode = 'center'
+        self.association_iou = 0.05
         
         # Camera settings
         self.cap = None
         self.is_running = False
         
+        # Threaded capture/inference/render pipeline
+        self.use_pipeline = True
+        self.pipeline = None
+        
     def detect_threats(self, frame):
         """Detect persons and threats with performance optimization"""
-        # Frame skipping for better performance
-        self.frame_skip_counter += 1
-        if self.frame_skip_counter < self.detection_interval:
-            return self.last_detection_result
+        # Every frame moves the tracks along their motion model
+        self.person_tracker.predict()
+        self.threat_tracker.predict()
+        
+        # Skip static frames and frames the latency budget cannot afford
+        decision = self.scheduler.decide(frame)
+        if decision == SKIP:
+            return (self.person_tracker.predicted_detections(),
+                    self.threat_tracker.predicted_detections())
+        
+        # Run optimized detection (on the motion crop only for ROI decisions)
+        started = time.perf_counter()
+        if decision == ROI:
+            x1, y1, x2, y2 = roi = self.scheduler.roi
+            results = self.model(frame[y1:y2, x1:x2], **self.inference_args)
+            persons, threat_objects = self.process_results(results, frame, offset=(x1, y1))
+        else:
+            roi = None
+            results = self.model(frame, **self.inference_args)
+            persons, threat_objects = self.process_results(results, frame)
+        self.scheduler.record_inference(decision, time.perf_counter() - started)
+        self.update_tracks(persons, threat_objects, region=roi)
+        
+        # Tracks this run did not match (outside the crop, or coasting through a
+        # missed detection) keep their predicted boxes
+        persons += self.person_tracker.predicted_detections(
+            exclude={p['track_id'] for p in persons})
+        threat_objects += self.threat_tracker.predicted_detections(
+            exclude={t['track_id'] for t in threat_objects})
+        
+        # Cache results
+        self.last_detection_result = (persons, threat_objects)
         
-        self.frame_skip_counter = 0
+        return persons, threat_objects
+    
+    def process_results(self, results, frame, offset=None):
+        """Turn YOLO results for one frame into assessed persons and threat objects"""
+        # Pull boxes out once as arrays and classify by class ID
+        detections = results_to_array(results, self.class_lookup, offset=offset)
+        persons_arr = detections[person_mask(detections)]
+        threats_arr = detections[threat_mask(detections)]
+        
+        persons = [
+            Detection('PERSON', confidence, bbox, class_id=class_id,
+                      status='SAFE', nearby_threats=[])
+            for class_id, confidence, bbox in zip(
+                persons_arr['class_id'].tolist(),
+                persons_arr['confidence'].tolist(),
+                persons_arr['bbox'].tolist()
+            )
+        ]
         
-        # Run optimized detection
-        results = self.model(frame, conf=0.3, verbose=False, imgsz=416)
+        # Map pen misclassifications to immediate threats
+        immediate = threats_arr['level'] == LEVEL_IMMEDIATE
+        risk_scores = threats_arr['confidence'] * np.where(immediate, 0.9, 0.7)
         
-        persons = []
         threat_objects = []
+        for class_id, confidence, bbox, is_immediate, risk_score in zip(
+                threats_arr['class_id'].tolist(),
+                threats_arr['confidence'].tolist(),
+                threats_arr['bbox'].tolist(),
+                immediate.tolist(),
+                risk_scores.tolist()):
+            class_name = self.class_lookup.names[class_id]
+            threat_objects.append(Detection(
+                'SHARP OBJECT (Pen-like)' if is_immediate else class_name.upper(),
+                confidence, bbox, class_id=class_id,
+                threat_level='IMMEDIATE_THREAT' if is_immediate else 'POTENTIAL_THREAT',
+                risk_score=risk_score,
+                original_class=class_name
+            ))
+        
+        # Associate threats with persons in one vectorized pass
+        if self.association_mode == 'iou':
+            threshold = self.association_iou
+        else:
+            threshold = min(frame.shape[1], frame.shape[0]) * 0.3
+        assignments = associate(persons_arr['bbox'], threats_arr['bbox'],
+                                threshold, mode=self.association_mode)
         
-        # Process detections
-        for result in results:
-            if result.boxes is not None:
-                for box in result.boxes:
-                    class_id = int(box.cls[0])
-                    confidence = float(box.conf[0])
-                    bbox = box.xyxy[0].tolist()
-                    class_name = self.model.names[class_id]
-                    
-                    # Detect persons
-                    if class_name.lower() == 'person':
-                        persons.append({
-                            'name': 'PERSON',
-                            'confidence': confidence,
-                            'bbox': [int(x) for x in bbox],
-                            'status': 'SAFE',
-                            'nearby_threats': []
-                        })
-                    
-                    # Detect threat objects
-                    else:
-                        is_threat = any(keyword in class_name.lower() 
-                                      for keyword in self.threat_keywords)
-                        
-                        if is_threat:
-                            # Map pen misclassifications
-                            if class_name.lower() in ['toothbrush', 'baseball bat', 'bat']:
-                                display_name = 'SHARP OBJECT (Pen-like)'
-                                threat_level = 'IMMEDIATE_THREAT'
-                                risk_score = confidence * 0.9
-                            else:
-                                display_name = class_name.upper()
-                                threat_level = 'POTENTIAL_THREAT'
-                                risk_score = confidence * 0.7
-                            
-                            threat_objects.append({
-                                'name': display_name,
-                                'confidence': confidence,
-                                'bbox': [int(x) for x in bbox],
-                                'threat_level': threat_level,
-                                'risk_score': risk_score,
-                                'original_class': class_name
-                            })
-        
-        # Associate threats with persons
-        for person in persons:
-            person_bbox = person['bbox']
-            person_center_x = (person_bbox[0] + person_bbox[2]) / 2
-            person_center_y = (person_bbox[1] + person_bbox[3]) / 2
-            
-            # Add GPS location metadata for person
-            person['gps_offset'] = {
-                'lat_offset': np.random.uniform(-0.0001, 0.0001),
-                'lon_offset': np.random.uniform(-0.0001, 0.0001)
-            }
-            
-            nearby_threats = []
-            
-            for threat in threat_objects:
-                threat_bbox = threat['bbox']
-                threat_center_x = (threat_bbox[0] + threat_bbox[2]) / 2
-                threat_center_y = (threat_bbox[1] + threat_bbox[3]) / 2
-                
-                # Calculate distance
-                distance = ((person_center_x - threat_center_x) ** 2 + 
-                           (person_center_y - threat_center_y) ** 2) ** 0.5
-                
-                # Proximity threshold
-                proximity_threshold = min(frame.shape[1], frame.shape[0]) * 0.3
-                
-                if distance < proximity_threshold:
-                    nearby_threats.append(threat)
+        for person, threat_ids in zip(persons, assignments):
+            nearby_threats = [threat_objects[i] for i in threat_ids.tolist()]
             
             # Update person status
             if nearby_threats:
@@ -333,12 +294,29 @@ class EnhancedThreatDetector:
                 person['status'] = 'SAFE'
                 person['name'] = "SAFE PERSON"
         
-        # Cache results
-        self.last_detection_result = (persons, threat_objects)
-        
         return persons, threat_objects
     
-    def draw_detections(self, frame, persons, threat_objects):
+    def update_tracks(self, persons, threat_objects, region=None):
+        """Attach track IDs and keep DANGER status per person track with hysteresis"""
+        self.threat_tracker.update(threat_objects, region=region)
+        
+        for track in self.person_tracker.update(persons, region=region):
+            person = track.detection
+            if person['status'] == 'DANGER':
+                track.nearby_threats = person['nearby_threats']
+            
+            if track.update_danger(person['status'] == 'DANGER'):
+                # Hold DANGER through brief misses of the threat object
+                nearby_threats = person['nearby_threats'] or track.nearby_threats
+                person['status'] = 'DANGER'
+                person['nearby_threats'] = nearby_threats
+                person['name'] = f"ARMED PERSON ({len(nearby_threats)} threats)"
+            else:
+                person['status'] = 'SAFE'
+                person['name'] = "SAFE PERSON"
+    
+    @staticmethod
+    def draw_detections(frame, persons, threat_objects):
         """Draw detection boxes with person safety assessment"""
         height, width = frame.shape[:2]
         
@@ -388,14 +366,17 @@ class EnhancedThreatDetector:
             # Labels
             cv2.putText(frame, person['status'], (int(bbox[0]), int(bbox[1]) - 40), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-            cv2.putText(frame, person['name'], (int(bbox[0]), int(bbox[1]) - 20), 
+            label = person['name']
+            if person.get('track_id') is not None:
+                label = f"#{person['track_id']} {label}"
+            cv2.putText(frame, label, (int(bbox[0]), int(bbox[1]) - 20), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
         
         return frame
     
-    def start_camera(self):
+    def start_camera(self, source=0):
         """Start optimized camera capture"""
-        self.cap = cv2.VideoCapture(0)
+        self.cap = cv2.VideoCapture(source)
         if not self.cap.isOpened():
             return False
         
@@ -406,19 +387,37 @@ class EnhancedThreatDetector:
         self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         
         self.is_running = True
+        
+        # Run capture, detection and drawing on their own threads
+        if self.use_pipeline:
+            self.pipeline = FramePipeline(self)
+            self.pipeline.start()
         return True
     
-    def get_frame(self):
-        """Get processed frame with threat detection"""
+    def read_frame(self):
+        """Read and mirror the next camera frame"""
         if not self.cap or not self.is_running:
-            return None, [], []
+            return None
         
         ret, frame = self.cap.read()
         if not ret:
-            return None, [], []
+            return None
         
         # Flip frame horizontally
-        frame = cv2.flip(frame, 1)
+        return cv2.flip(frame, 1)
+    
+    def get_frame(self, timeout=1.0):
+        """Get processed frame with threat detection"""
+        if not self.cap or not self.is_running:
+            return None, [], []
+        
+        # Pipeline mode: wait for the newest annotated frame
+        if self.pipeline:
+            return self.pipeline.get_latest(timeout)
+        
+        frame = self.read_frame()
+        if frame is None:
+            return None, [], []
         
         # Detect threats
         persons, threat_objects = self.detect_threats(frame)
@@ -428,9 +427,22 @@ class EnhancedThreatDetector:
         
         return processed_frame, persons, threat_objects
     
+    def get_scheduler_metrics(self):
+        """Detection scheduler decisions, motion score and inference latency"""
+        return self.scheduler.get_metrics()
+    
+    def get_pipeline_stats(self):
+        """Per-stage latency and queue depth of the running pipeline"""
+        if not self.pipeline:
+            return None
+        return self.pipeline.get_stats()
+    
     def stop_camera(self):
         """Stop camera capture"""
         self.is_running = False
+        if self.pipeline:
+            self.pipeline.stop()
+            self.pipeline = None
         if self.cap:
             self.cap.release()
 
@@ -438,6 +450,105 @@ class EnhancedThreatDetector:
 # Streamlit Enhanced Multi-Sensor App
 # -----------------------------------------------------
 
+def show_person_status(placeholder, persons, threats=()):
+    """Armed / threats in area / safe / monitoring banner"""
+    safe_count = len([p for p in persons if p['status'] == 'SAFE'])
+    danger_count = len([p for p in persons if p['status'] == 'DANGER'])
+    threat_count = len([t for t in threats if t['threat_level']])
+    
+    if danger_count > 0:
+        placeholder.markdown(
+            f'<div class="threat-alert">ARMED PERSONS DETECTED ({danger_count})</div>',
+            unsafe_allow_html=True
+        )
+    elif threat_count > 0:
+        placeholder.markdown(
+            f'<div class="threat-alert">THREATS IN AREA ({threat_count})</div>',
+            unsafe_allow_html=True
+        )
+    elif safe_count > 0:
+        placeholder.markdown(
+            f'<div class="secure-status">ALL PERSONS SAFE ({safe_count})</div>',
+            unsafe_allow_html=True
+        )
+    else:
+        placeholder.markdown(
+            '<div class="secure-status">MONITORING AREA</div>',
+            unsafe_allow_html=True
+        )
+
+
+def show_scheduler_metrics(placeholder, sched):
+    placeholder.caption(
+        f"Scheduler: {sched['last_decision']} ({sched['last_reason']}) | "
+        f"Motion {sched['motion_score'] * 100:.1f}% | "
+        f"YOLO {sched['inference_fps']:.1f}/s "
+        f"(full {sched['detect_latency_ms']:.0f}ms, ROI {sched['roi_latency_ms']:.0f}ms) | "
+        f"Full {sched['decisions']['detect']} / ROI {sched['decisions']['roi']} / "
+        f"Skip {sched['decisions']['skip']}"
+    )
+
+
+def service_dashboard(address, update_interval=0.2):
+    """Thin viewer of detection_service.py: no model or camera in this process
+
+    Frames stream from the service's MJPEG endpoint straight to the browser;
+    only the small detection messages pass through Streamlit.
+    """
+    host, _, port = address.rpartition(':')
+    if 'subscriber' not in st.session_state:
+        st.session_state.subscriber = DetectionSubscriber(
+            host or '127.0.0.1', int(port or DEFAULT_PORT)).start()
+    subscriber = st.session_state.subscriber
+    
+    main_col, sensor_col = st.columns([2, 1])
+    
+    with main_col:
+        st.subheader("Live Person Safety Monitoring")
+        video_placeholder = st.empty()
+        stream_note = st.empty()
+        status_placeholder = st.empty()
+        scheduler_placeholder = st.empty()
+    
+    with sensor_col:
+        st.subheader("Thermal/IR")
+        sensor_view_placeholder = st.empty()
+        temp_metric = st.empty()
+        service_info = st.empty()
+    
+    received = 0
+    streams_shown = 0  # connection whose streams are on screen
+    while True:
+        received, message = subscriber.latest(after=received, timeout=2.0)
+        if message is None:
+            status_placeholder.warning(f"Waiting for detection service at {address}...")
+            continue
+        seq = message['seq']
+        
+        # The browser pulls the MJPEG streams itself; set the <img> tags once per connection
+        if streams_shown != subscriber.hellos and subscriber.stream_url('video'):
+            video_placeholder.markdown(
+                f'<img src="{subscriber.stream_url("video")}" width="480">', unsafe_allow_html=True)
+            sensor_view_placeholder.markdown(
+                f'<img src="{subscriber.stream_url("sensors")}" width="100%">', unsafe_allow_html=True)
+            streams_shown = subscriber.hellos
+            if urlparse(subscriber.stream_url('video')).hostname in ('127.0.0.1', 'localhost', '::1'):
+                stream_note.caption("Streams use a loopback address and show only in a browser on the "
+                                    "service host; run the service with --host 0.0.0.0 --public-host NAME")
+            else:
+                stream_note.empty()
+        
+        show_person_status(status_placeholder, message['persons'])
+        show_scheduler_metrics(scheduler_placeholder, message['scheduler'])
+        if 'thermal' in message:
+            temp_metric.metric("Avg Temperature", f"{message['thermal']['mean']:.1f}°C")
+        service_info.caption(
+            f"Service {address} | frame {seq} | "
+            f"{len(message['persons'])} persons, {len(message['threats'])} threats")
+        
+        time.sleep(update_interval)
+
+
 def main():
     st.set_page_config(
         page_title="Military Multi-Sensor System",
@@ -485,6 +596,12 @@ def main():
         </div>
     """, unsafe_allow_html=True)
     
+    # Thin viewer: subscribe to a running detection_service.py instead of running the model here
+    service = os.environ.get('SMARTGUARD_SERVICE')
+    if service:
+        service_dashboard(service)
+        return
+    
     # Initialize detector
     if 'detector' not in st.session_state:
         with st.spinner("Initializing Enhanced AI System..."):
@@ -523,131 +640,155 @@ def main():
             st.subheader("Live Person Safety Monitoring")
             video_placeholder = st.empty()
             status_placeholder = st.empty()
+            pipeline_placeholder = st.empty()
+            scheduler_placeholder = st.empty()
         
         with sensor_col:
             st.subheader("Multi-Sensor Data")
             
             # Sensor tabs
-            tab1, tab2, tab3, tab4, tab5 = st.tabs(["Thermal", "IR", "Radar", "LIDAR", "GPS/Map"])
+            tab1, tab2, tab3, tab4 = st.tabs(["Thermal/IR", "Radar", "LIDAR", "GPS/Map"])
             
             with tab1:
-                thermal_placeholder = st.empty()
+                sensor_view_placeholder = st.empty()
                 temp_metric = st.empty()
             
             with tab2:
-                ir_placeholder = st.empty()
-            
-            with tab3:
                 radar_placeholder = st.empty()
                 radar_info = st.empty()
             
-            with tab4:
+            with tab3:
                 lidar_placeholder = st.empty()
+                lidar_info = st.empty()
             
-            with tab5:
+            with tab4:
                 gps_metrics = st.empty()
                 map_placeholder = st.empty()
         
+        # Charts are built once per session; each refresh only swaps trace data
+        if 'radar_chart' not in st.session_state:
+            st.session_state.radar_chart = RadarChart(
+                layout=dict(
+                    polar=dict(
+                        radialaxis=dict(visible=True, range=[0, 5000]),
+                        angularaxis=dict(direction="clockwise")
+                    ),
+                    showlegend=False,
+                    height=250,
+                    margin=dict(t=30, b=10, l=10, r=10)
+                ),
+                radar_range=detector.sensor_sim.radar_range,
+                refresh_interval=0.5
+            )
+            st.session_state.lidar_chart = LidarChart(
+                layout=dict(
+                    scene=dict(
+                        xaxis_title='X (m)',
+                        yaxis_title='Y (m)',
+                        zaxis_title='Z (m)'
+                    ),
+                    height=250,
+                    margin=dict(t=30, b=10, l=10, r=10)
+                ),
+                max_points=1000,
+                refresh_interval=1.0,
+                rng=detector.sensor_sim.rng
+            )
+        radar_chart = st.session_state.radar_chart
+        lidar_chart = st.session_state.lidar_chart
+        
+        # Frames are JPEG-encoded once at display size; thermal and IR share one tiled image
+        if 'video_encoder' not in st.session_state:
+            st.session_state.video_encoder = JPEGEncoder(quality=80, width=480)
+            st.session_state.sensor_encoder = JPEGEncoder(quality=70)
+            st.session_state.sensor_mosaic = SensorMosaic((280, 210), columns=1,
+                                                          labels=["THERMAL", "INFRARED"])
+        video_encoder = st.session_state.video_encoder
+        sensor_encoder = st.session_state.sensor_encoder
+        sensor_mosaic = st.session_state.sensor_mosaic
+        
+        # Tactical map: the base map is mounted once under a stable key; the browser then
+        # polls the feed for entity deltas, so a refresh never re-sends or remounts it.
+        # The feed listens on 127.0.0.1 unless SMARTGUARD_MAP_HOST is set; viewers on other
+        # machines also need SMARTGUARD_MAP_URL, e.g. http://console.example:{port}/entities
+        layer = detector.sensor_sim.tactical_map
+        try:
+            if 'map_feed' not in st.session_state:
+                st.session_state.map_feed = MapFeedServer(
+                    layer,
+                    host=os.environ.get('SMARTGUARD_MAP_HOST', '127.0.0.1'),
+                    port=int(os.environ.get('SMARTGUARD_MAP_PORT', 0)),  # 0: any free port, one per session
+                    public_url=os.environ.get('SMARTGUARD_MAP_URL')
+                ).start()
+                layer.attach_feed(st.session_state.map_feed.url)
+            with map_placeholder.container():
+                st_folium(layer.map, key="tactical_map",
+                          width=280, height=250, returned_data=["last_object_clicked"])
+                if st.session_state.map_feed.local_only:
+                    st.caption("Map markers are served on 127.0.0.1 (this machine only); set "
+                               "SMARTGUARD_MAP_HOST and SMARTGUARD_MAP_URL for remote viewers")
+        except OSError as e:
+            map_placeholder.error(f"Tactical map feed could not start: {e}")
+        except Exception as e:
+            map_placeholder.error("Map requires folium package. Install with: pip install folium streamlit-folium")
+        
         # Real-time processing loop
         if auto_refresh:
+            lidar_obstacles, lidar_threats = [], []  # last scan's results, reused between scans
             while st.session_state.get('camera_running', False):
                 frame, persons, threat_objects = detector.get_frame()
                 
                 if frame is not None:
                     # Main video display
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    video_placeholder.image(frame_rgb, channels="RGB", width=480)
+                    video_placeholder.image(video_encoder.encode(frame))
                     
                     # Generate multi-sensor data
-                    thermal_img, temp_data = detector.sensor_sim.generate_thermal_data(frame)
+                    thermal_img, temp_stats = detector.sensor_sim.generate_thermal_data(
+                        frame, [p['bbox'] for p in persons])
                     ir_img = detector.sensor_sim.generate_ir_data(frame)
-                    radar_angles, radar_ranges, radar_targets = detector.sensor_sim.generate_radar_data()
-                    lidar_x, lidar_y, lidar_z = detector.sensor_sim.generate_lidar_data()
+                    radar_delta = detector.sensor_sim.generate_radar_data()
                     gps_data = detector.sensor_sim.generate_gps_data()
+                    detector.sensor_sim.locate_entities(gps_data, frame.shape, persons, threat_objects)
                     
                     # Update sensor displays
-                    # Thermal imaging
-                    thermal_rgb = cv2.cvtColor(thermal_img, cv2.COLOR_BGR2RGB)
-                    thermal_placeholder.image(thermal_rgb, width=280, caption="Thermal Imaging")
-                    temp_metric.metric("Avg Temperature", f"{temp_data.mean():.1f}°C")
+                    # Thermal and IR imaging, tiled into one frame
+                    sensor_view = sensor_mosaic.compose([thermal_img, ir_img])
+                    sensor_view_placeholder.image(
+                        sensor_encoder.encode(sensor_view),
+                        caption=f"Thermal max {temp_stats.max:.1f}°C, "
+                                f"{len(temp_stats.hotspots)} hotspots | Infrared Spectrum")
+                    temp_metric.metric("Avg Temperature", f"{temp_stats.mean:.1f}°C")
                     
-                    # IR imaging
-                    ir_rgb = cv2.cvtColor(ir_img, cv2.COLOR_BGR2RGB)
-                    ir_placeholder.image(ir_rgb, width=280, caption="Infrared Spectrum")
-                    
-                    # Radar display
-                    fig_radar = go.Figure()
-                    
-                    # Add radar contacts
-                    detected_ranges = [r for r in radar_ranges if r < detector.sensor_sim.radar_range]
-                    detected_angles = [radar_angles[i] for i, r in enumerate(radar_ranges) 
-                                     if r < detector.sensor_sim.radar_range]
-                    
-                    if detected_ranges:
-                        fig_radar.add_trace(go.Scatterpolar(
-                            r=detected_ranges,
-                            theta=detected_angles,
-                            mode='markers',
-                            marker=dict(size=4, color='lime'),
-                            name='Contacts'
-                        ))
-                    
-                    # Add priority targets
-                    for target in radar_targets[:3]:
-                        color = 'red' if target['priority'] == 'HIGH' else 'orange'
-                        fig_radar.add_trace(go.Scatterpolar(
-                            r=[target['range']],
-                            theta=[target['bearing']],
-                            mode='markers+text',
-                            marker=dict(size=8, color=color),
-                            text=[target['type']],
-                            name=target['type']
-                        ))
-                    
-                    fig_radar.update_layout(
-                        polar=dict(
-                            radialaxis=dict(visible=True, range=[0, 5000]),
-                            angularaxis=dict(direction="clockwise")
-                        ),
-                        showlegend=False,
-                        height=250,
-                        margin=dict(t=30, b=10, l=10, r=10)
-                    )
-                    
-                    radar_placeholder.plotly_chart(fig_radar, use_container_width=True)
+                    # Radar display: persistent figure patched with changed tracks only,
+                    # redrawn on its own interval when something changed
+                    radar_chart.render(radar_placeholder, radar_delta)
+                    radar_targets = radar_chart.contacts
                     
                     # Radar info
-                    if radar_targets:
-                        radar_text = f"**Contacts:** {len(radar_targets)}\n"
+                    if len(radar_targets):
+                        radar_text = (f"**Contacts:** {len(radar_targets)} "
+                                      f"({len(radar_delta.updated)} updated, {len(radar_delta.removed)} lost)\n")
                         for target in radar_targets[:2]:
-                            radar_text += f"• {target['type']} at {target['range']:.0f}m\n"
+                            radar_text += f"• {TYPE_NAMES[target['type']]} at {target['range']:.0f}m\n"
                         radar_info.markdown(radar_text)
                     
-                    # LIDAR 3D visualization
-                    fig_lidar = go.Figure(data=[go.Scatter3d(
-                        x=lidar_x[:150],
-                        y=lidar_y[:150],
-                        z=lidar_z[:150],
-                        mode='markers',
-                        marker=dict(
-                            size=2,
-                            color=lidar_z[:150],
-                            colorscale='Plasma',
-                            opacity=0.6
+                    # LIDAR: scan, obstacle detection and the 3D view (voxel-downsampled, keeps
+                    # structures) run on the chart interval, not on every video frame
+                    if lidar_chart.due():
+                        lidar_points = detector.sensor_sim.generate_lidar_data()
+                        lidar_obstacles, lidar_threats = detector.sensor_sim.detect_lidar_obstacles(lidar_points)
+                        lidar_chart.render(lidar_placeholder, lidar_points, lidar_obstacles,
+                                           [t['name'] for t in lidar_threats])
+                        lidar_info.markdown(
+                            f"**Obstacles:** {len(lidar_threats)} "
+                            f"({len([t for t in lidar_threats if t['threat_level']])} within "
+                            f"{detector.sensor_sim.obstacle_detector.alert_range:.0f}m)"
                         )
-                    )])
                     
-                    fig_lidar.update_layout(
-                        scene=dict(
-                            xaxis_title='X (m)',
-                            yaxis_title='Y (m)',
-                            zaxis_title='Z (m)'
-                        ),
-                        height=250,
-                        margin=dict(t=30, b=10, l=10, r=10)
-                    )
-                    
-                    lidar_placeholder.plotly_chart(fig_lidar, use_container_width=True)
+                    # Obstacles inside alert range join the camera threats for the status and the map
+                    near_obstacles = [t for t in lidar_threats if t['threat_level']]
+                    detector.sensor_sim.locate_obstacles(gps_data, lidar_obstacles, lidar_threats)
+                    threat_objects = list(threat_objects) + near_obstacles
                     
                     # GPS and Map display
                     gps_metrics.markdown(f"""
@@ -655,40 +796,37 @@ def main():
                     - **Latitude:** {gps_data['latitude']:.6f}°
                     - **Longitude:** {gps_data['longitude']:.6f}°  
                     - **Altitude:** {gps_data['altitude']:.1f}m
+                    - **Heading:** {gps_data['heading']:.0f}° at {gps_data['speed']:.1f}m/s
                     - **Accuracy:** {gps_data['accuracy']}m
                     - **Satellites:** {gps_data['satellites']}
                     - **HDOP:** {gps_data['hdop']:.2f}
+                    - **Threats within 50m of base:** {len(detector.sensor_sim.entities_near_base(50.0))}
                     """)
                     
-                    # Create and display tactical map
-                    try:
-                        tactical_map = detector.sensor_sim.create_tactical_map(gps_data, persons, threat_objects)
-                        map_data = st_folium(tactical_map, width=280, height=250, returned_data=["last_object_clicked"])
-                    except Exception as e:
-                        map_placeholder.error("Map requires folium package. Install with: pip install folium streamlit-folium")
+                    # Tactical map entities: diffed on their own interval, pulled by the mounted map
+                    detector.sensor_sim.update_tactical_map(gps_data, persons, threat_objects)
                     
                     # Status display
-                    safe_count = len([p for p in persons if p['status'] == 'SAFE'])
-                    danger_count = len([p for p in persons if p['status'] == 'DANGER'])
+                    show_person_status(status_placeholder, persons, threat_objects)
                     
-                    if danger_count > 0:
-                        status_placeholder.markdown(
-                            f'<div class="threat-alert">ARMED PERSONS DETECTED ({danger_count})</div>',
-                            unsafe_allow_html=True
-                        )
-                    elif safe_count > 0:
-                        status_placeholder.markdown(
-                            f'<div class="secure-status">ALL PERSONS SAFE ({safe_count})</div>',
-                            unsafe_allow_html=True
-                        )
-                    else:
-                        status_placeholder.markdown(
-                            '<div class="secure-status">MONITORING AREA</div>',
-                            unsafe_allow_html=True
+                    # Pipeline stage metrics
+                    pipeline_stats = detector.get_pipeline_stats()
+                    if pipeline_stats:
+                        queues = pipeline_stats['queues']
+                        pipeline_placeholder.caption(
+                            f"Capture {pipeline_stats['capture']['latency_ms']:.0f}ms "
+                            f"({pipeline_stats['capture']['fps']:.0f} FPS) | "
+                            f"Inference {pipeline_stats['inference']['latency_ms']:.0f}ms "
+                            f"({pipeline_stats['inference']['fps']:.0f} FPS) | "
+                            f"Annotate {pipeline_stats['annotate']['latency_ms']:.0f}ms | "
+                            f"Queues {queues['capture']['depth']}/{queues['annotate']['depth']} "
+                            f"(dropped {queues['capture']['dropped'] + queues['annotate']['dropped']})"
                         )
+                    
+                    # Detection scheduler decisions
+                    show_scheduler_metrics(scheduler_placeholder, detector.get_scheduler_metrics())
                 
-                # Optimized refresh rate for 24+ FPS
-                time.sleep(0.04)
+                # No fixed sleep: get_frame() blocks until the pipeline has a new frame
         
         else:
             # Manual mode
@@ -0,0 +1,345 @@
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+# -----------------------------------------------------
+# Shared-Memory Frame Ring
+# -----------------------------------------------------
+
+# Header layout (int64): latest slot, latest sequence number, then per-slot
+# reference counts and per-slot sequence numbers; timestamps follow as float64
+_LATEST_SLOT = 0
+_LATEST_SEQ = 1
+_HEADER_FIELDS = 2
+
+
+class FrameRef:
+    """A reader's reference to one published slot; release() when done with the frame"""
+
+    def __init__(self, ring, slot, seq, timestamp, frame):
+        self.ring = ring
+        self.slot = slot
+        self.seq = seq
+        self.timestamp = timestamp
+        self.frame = frame  # read-only view into shared memory, no copy
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.frame = None
+            self.ring.release(self.slot)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class SharedFrameRing:
+    def __init__(self, shape, dtype=np.uint8, slots=8, name=None):
+        """Preallocated frame slots in shared memory with reference-counted ownership
+
+        Create it in the parent and pass it to multiprocessing.Process arguments;
+        children attach to the same memory without pickling any frame data.
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        self.frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.owner_pid = os.getpid()
+
+        header_bytes = (_HEADER_FIELDS + 2 * slots) * 8 + slots * 8
+        self.header_shm = shared_memory.SharedMemory(
+            create=True, size=header_bytes, name=f"{name}_hdr" if name else None)
+        self.frames_shm = shared_memory.SharedMemory(
+            create=True, size=self.frame_bytes * slots, name=name)
+        self.cond = mp.Condition(mp.Lock())
+        self._attach()
+
+        self.meta[:] = 0
+        self.meta[_LATEST_SLOT] = -1
+        self.timestamps[:] = 0.0
+
+    def _attach(self):
+        n_meta = _HEADER_FIELDS + 2 * self.slots
+        self.meta = np.ndarray((n_meta,), dtype=np.int64, buffer=self.header_shm.buf)
+        self.refcounts = self.meta[_HEADER_FIELDS:_HEADER_FIELDS + self.slots]
+        self.seqs = self.meta[_HEADER_FIELDS + self.slots:]
+        self.timestamps = np.ndarray((self.slots,), dtype=np.float64,
+                                     buffer=self.header_shm.buf, offset=n_meta * 8)
+        self.views = [
+            np.ndarray(self.shape, dtype=self.dtype, buffer=self.frames_shm.buf,
+                       offset=slot * self.frame_bytes)
+            for slot in range(self.slots)
+        ]
+
+    def __getstate__(self):
+        return {
+            'shape': self.shape, 'dtype': self.dtype.str, 'slots': self.slots,
+            'header_name': self.header_shm.name, 'frames_name': self.frames_shm.name,
+            'cond': self.cond, 'owner_pid': self.owner_pid
+        }
+
+    def __setstate__(self, state):
+        self.shape = state['shape']
+        self.dtype = np.dtype(state['dtype'])
+        self.slots = state['slots']
+        self.frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.owner_pid = state['owner_pid']
+        # Child processes share the parent's resource tracker, so attaching here
+        # does not hand the segment's lifetime to the child
+        self.header_shm = shared_memory.SharedMemory(name=state['header_name'])
+        self.frames_shm = shared_memory.SharedMemory(name=state['frames_name'])
+        self.cond = state['cond']
+        self._attach()
+
+    # ---------------- writer side ----------------
+
+    def acquire_write(self):
+        """Claim a free slot for writing; returns (slot, writable view) or (None, None)"""
+        with self.cond:
+            latest = self.meta[_LATEST_SLOT]
+            free = [slot for slot in range(self.slots)
+                    if self.refcounts[slot] == 0 and slot != latest]
+            if not free:
+                return None, None
+            # Reuse the slot holding the oldest frame
+            slot = min(free, key=lambda s: self.seqs[s])
+            self.refcounts[slot] = 1
+        return slot, self.views[slot]
+
+    def publish(self, slot, timestamp=None):
+        """Make a written slot the latest frame and drop the writer's reference"""
+        with self.cond:
+            seq = self.meta[_LATEST_SEQ] + 1
+            self.meta[_LATEST_SEQ] = seq
+            self.meta[_LATEST_SLOT] = slot
+            self.seqs[slot] = seq
+            self.timestamps[slot] = time.time() if timestamp is None else timestamp
+            self.refcounts[slot] -= 1
+            self.cond.notify_all()
+        return seq
+
+    def abort_write(self, slot):
+        """Give a claimed slot back without publishing it"""
+        self.release(slot)
+
+    def write(self, frame, timestamp=None):
+        """Copy a frame into the ring (for producers that cannot decode in place)"""
+        slot, view = self.acquire_write()
+        if slot is None:
+            return None
+        np.copyto(view, frame)
+        return self.publish(slot, timestamp)
+
+    # ---------------- reader side ----------------
+
+    def acquire_latest(self, after=0, timeout=1.0):
+        """Reference the newest frame with sequence number > after, or None on timeout"""
+        with self.cond:
+            ready = self.cond.wait_for(
+                lambda: self.meta[_LATEST_SEQ] > after and self.meta[_LATEST_SLOT] >= 0,
+                timeout
+            )
+            if not ready:
+                return None
+            slot = int(self.meta[_LATEST_SLOT])
+            self.refcounts[slot] += 1
+            seq = int(self.seqs[slot])
+            timestamp = float(self.timestamps[slot])
+
+        frame = self.views[slot].view()
+        frame.flags.writeable = False
+        return FrameRef(self, slot, seq, timestamp, frame)
+
+    def release(self, slot):
+        with self.cond:
+            self.refcounts[slot] -= 1
+
+    def stats(self):
+        """Latest sequence number and slots currently referenced"""
+        with self.cond:
+            return {
+                'latest_seq': int(self.meta[_LATEST_SEQ]),
+                'slots_in_use': int(np.count_nonzero(self.refcounts)),
+                'slots': self.slots
+            }
+
+    def close(self):
+        """Detach from shared memory (and free it when called by the creator)"""
+        self.views = []
+        self.meta = self.refcounts = self.seqs = self.timestamps = None
+        self.header_shm.close()
+        self.frames_shm.close()
+        if os.getpid() == self.owner_pid:
+            self.header_shm.unlink()
+            self.frames_shm.unlink()
+
+# -----------------------------------------------------
+# Capture Process
+# -----------------------------------------------------
+
+def capture_into_ring(ring, source=0, flip=True, stop_event=None):
+    """Decode camera frames straight into ring slots (run in its own process)"""
+    cap = cv2.VideoCapture(source)
+    height, width = ring.shape[:2]
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    scratch = np.empty(ring.shape, dtype=ring.dtype)
+
+    try:
+        while cap.isOpened() and not (stop_event and stop_event.is_set()):
+            slot, view = ring.acquire_write()
+            if slot is None:
+                # Every slot is still referenced by a consumer: drop this frame
+                cap.grab()
+                continue
+
+            target = scratch if flip else view
+            ret, frame = cap.read(target)
+            if not ret:
+                ring.abort_write(slot)
+                break
+            if frame.shape != ring.shape:
+                frame = cv2.resize(frame, (width, height))
+            if flip:
+                cv2.flip(frame, 1, dst=view)
+            elif frame is not view:
+                np.copyto(view, frame)
+            ring.publish(slot)
+    finally:
+        cap.release()
+        ring.close()
+
+
+class CaptureProcess:
+    def __init__(self, source=0, shape=(360, 480, 3), slots=8, flip=True):
+        """Camera capture in a separate process feeding a SharedFrameRing"""
+        self.ring = SharedFrameRing(shape, slots=slots)
+        self.stop_event = mp.Event()
+        self.process = mp.Process(
+            target=capture_into_ring,
+            args=(self.ring, source, flip, self.stop_event),
+            daemon=True
+        )
+
+    def start(self):
+        self.process.start()
+        return self.ring
+
+    def stop(self):
+        self.stop_event.set()
+        self.process.join(2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.ring.close()
+
+# -----------------------------------------------------
+# Multi-Process Capture / Detection / Sensors / Render
+# -----------------------------------------------------
+
+def detection_worker(raw_ring, results_queue, stop_event):
+    """Run threat detection on the newest shared frame (own process)"""
+    from enhanced_streamlit_demo import EnhancedThreatDetector
+
+    detector = EnhancedThreatDetector()
+    seq = 0
+    while not stop_event.is_set():
+        ref = raw_ring.acquire_latest(after=seq, timeout=0.5)
+        if ref is None:
+            continue
+        with ref:
+            persons, threat_objects = detector.detect_threats(ref.frame)
+            seq = ref.seq
+
+        # Detections are small; frames never leave shared memory
+        message = (seq, [p.to_dict() for p in persons], [t.to_dict() for t in threat_objects])
+        try:
+            results_queue.put_nowait(message)
+        except Exception:
+            pass  # renderer is behind; it only needs the newest result
+    raw_ring.close()
+
+
+def sensor_worker(raw_ring, thermal_ring, ir_ring, stop_event):
+    """Simulate thermal and IR views from the newest shared frame (own process)"""
+    from enhanced_streamlit_demo import MultiSensorSimulator
+
+    sensor_sim = MultiSensorSimulator()
+    seq = 0
+    while not stop_event.is_set():
+        ref = raw_ring.acquire_latest(after=seq, timeout=0.5)
+        if ref is None:
+            continue
+        with ref:
+            thermal_img, _ = sensor_sim.generate_thermal_data(ref.frame)
+            ir_img = sensor_sim.generate_ir_data(ref.frame)
+            seq = ref.seq
+        thermal_ring.write(thermal_img)
+        ir_ring.write(ir_img)
+    for ring in (raw_ring, thermal_ring, ir_ring):
+        ring.close()
+
+
+def run_multiprocess_demo(source=0, shape=(360, 480, 3)):
+    """Capture, detection and sensor simulation in separate processes; render here"""
+    from enhanced_streamlit_demo import EnhancedThreatDetector
+
+    capture = CaptureProcess(source, shape=shape)
+    raw_ring = capture.start()
+    thermal_ring = SharedFrameRing(shape, slots=4)
+    ir_ring = SharedFrameRing(shape, slots=4)
+    results_queue = mp.Queue(maxsize=4)
+    stop_event = capture.stop_event
+
+    workers = [
+        mp.Process(target=detection_worker, args=(raw_ring, results_queue, stop_event), daemon=True),
+        mp.Process(target=sensor_worker, args=(raw_ring, thermal_ring, ir_ring, stop_event), daemon=True)
+    ]
+    for worker in workers:
+        worker.start()
+
+    # The renderer's own annotation buffer is the only full-frame copy
+    display = np.empty(shape, dtype=np.uint8)
+    persons, threat_objects = [], []
+    seq = 0
+    try:
+        while True:
+            ref = raw_ring.acquire_latest(after=seq, timeout=1.0)
+            if ref is None:
+                continue
+            with ref:
+                np.copyto(display, ref.frame)
+                seq = ref.seq
+            while not results_queue.empty():
+                _, persons, threat_objects = results_queue.get_nowait()
+            EnhancedThreatDetector.draw_detections(display, persons, threat_objects)
+            cv2.imshow("SmartGuard - Visual", display)
+
+            for title, ring in (("Thermal", thermal_ring), ("Infrared", ir_ring)):
+                sensor_ref = ring.acquire_latest(timeout=0)
+                if sensor_ref is not None:
+                    with sensor_ref:
+                        cv2.imshow(f"SmartGuard - {title}", sensor_ref.frame)
+
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+    finally:
+        stop_event.set()
+        for worker in workers:
+            worker.join(2.0)
+        capture.stop()
+        thermal_ring.close()
+        ir_ring.close()
+        cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    run_multiprocess_demo()
@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import deque
+
+# -----------------------------------------------------
+# Bounded Drop-Oldest Queue
+# -----------------------------------------------------
+
+class LatestQueue:
+    def __init__(self, maxsize=1):
+        """Bounded queue that drops the oldest item instead of blocking the producer"""
+        self.items = deque(maxlen=maxsize)
+        self.cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        """Add an item, discarding the oldest one if the queue is full"""
+        with self.cond:
+            if len(self.items) == self.items.maxlen:
+                self.dropped += 1
+            self.items.append(item)
+            self.cond.notify()
+
+    def get(self, timeout=None):
+        """Pop the oldest item, or return None after timeout"""
+        with self.cond:
+            if not self.items:
+                self.cond.wait(timeout)
+            if not self.items:
+                return None
+            return self.items.popleft()
+
+    def clear(self):
+        """Drop everything and wake up waiting consumers"""
+        with self.cond:
+            self.items.clear()
+            self.cond.notify_all()
+
+    def depth(self):
+        """Current number of queued items"""
+        return len(self.items)
+
+# -----------------------------------------------------
+# Per-Stage Timing
+# -----------------------------------------------------
+
+class StageStats:
+    def __init__(self, smoothing=0.1):
+        """Exponentially smoothed latency and throughput for one stage"""
+        self.smoothing = smoothing
+        self.latency = 0.0
+        self.interval = 0.0
+        self.count = 0
+        self.last_done = None
+        self.lock = threading.Lock()
+
+    def record(self, started, finished):
+        """Record one processed item"""
+        with self.lock:
+            latency = finished - started
+            if self.count == 0:
+                self.latency = latency
+            else:
+                self.latency += self.smoothing * (latency - self.latency)
+            if self.last_done is not None:
+                interval = finished - self.last_done
+                if self.interval == 0.0:
+                    self.interval = interval
+                else:
+                    self.interval += self.smoothing * (interval - self.interval)
+            self.last_done = finished
+            self.count += 1
+
+    def snapshot(self):
+        """Return latency (ms), throughput (fps) and item count"""
+        with self.lock:
+            return {
+                'latency_ms': self.latency * 1000.0,
+                'fps': 1.0 / self.interval if self.interval > 0 else 0.0,
+                'count': self.count
+            }
+
+# -----------------------------------------------------
+# Threaded Capture -> Inference -> Annotation Pipeline
+# -----------------------------------------------------
+
+class FramePipeline:
+    def __init__(self, detector, queue_size=1):
+        """Run capture, detection and drawing for a detector on separate threads"""
+        self.detector = detector
+
+        # Stage queues (drop oldest so stages never wait on stale frames)
+        self.capture_queue = LatestQueue(queue_size)
+        self.annotate_queue = LatestQueue(queue_size)
+
+        # Stage timing
+        self.stats = {
+            'capture': StageStats(),
+            'inference': StageStats(),
+            'annotate': StageStats()
+        }
+
+        # Newest annotated frame for the UI
+        self.latest = None
+        self.latest_id = -1
+        self.served_id = -1
+        self.latest_cond = threading.Condition()
+
+        self.running = False
+        self.threads = []
+
+    def start(self):
+        """Start all pipeline stages"""
+        if self.running:
+            return
+        self.running = True
+        self.threads = [
+            threading.Thread(target=self._capture_loop, name='capture', daemon=True),
+            threading.Thread(target=self._inference_loop, name='inference', daemon=True),
+            threading.Thread(target=self._annotate_loop, name='annotate', daemon=True)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self, timeout=2.0):
+        """Stop all stages and wait for the threads to exit"""
+        self.running = False
+        self.capture_queue.clear()
+        self.annotate_queue.clear()
+        with self.latest_cond:
+            self.latest_cond.notify_all()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+    def _capture_loop(self):
+        frame_id = 0
+        while self.running:
+            started = time.perf_counter()
+            frame = self.detector.read_frame()
+            if frame is None:
+                time.sleep(0.01)
+                continue
+            self.stats['capture'].record(started, time.perf_counter())
+            self.capture_queue.put((frame_id, frame))
+            frame_id += 1
+
+    def _inference_loop(self):
+        while self.running:
+            item = self.capture_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            frame_id, frame = item
+            started = time.perf_counter()
+            persons, threat_objects = self.detector.detect_threats(frame)
+            self.stats['inference'].record(started, time.perf_counter())
+            self.annotate_queue.put((frame_id, frame, persons, threat_objects))
+
+    def _annotate_loop(self):
+        while self.running:
+            item = self.annotate_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            frame_id, frame, persons, threat_objects = item
+            started = time.perf_counter()
+            frame = self.detector.draw_detections(frame, persons, threat_objects)
+            self.stats['annotate'].record(started, time.perf_counter())
+            with self.latest_cond:
+                self.latest = (frame, persons, threat_objects)
+                self.latest_id = frame_id
+                self.latest_cond.notify_all()
+
+    def get_latest(self, timeout=1.0):
+        """Block until an annotated frame newer than the last one served is ready"""
+        with self.latest_cond:
+            self.latest_cond.wait_for(
+                lambda: self.latest_id > self.served_id or not self.running,
+                timeout
+            )
+            if self.latest is None or self.latest_id <= self.served_id:
+                return None, [], []
+            self.served_id = self.latest_id
+            return self.latest
+
+    def get_stats(self):
+        """Per-stage latency/throughput plus queue depths and drop counts"""
+        stats = {name: stage.snapshot() for name, stage in self.stats.items()}
+        stats['queues'] = {
+            'capture': {
+                'depth': self.capture_queue.depth(),
+                'dropped': self.capture_queue.dropped
+            },
+            'annotate': {
+                'depth': self.annotate_queue.depth(),
+                'dropped': self.annotate_queue.dropped
+            }
+        }
+        return stats
@@ -0,0 +1,218 @@
+import bisect
+import math
+import time
+
+import numpy as np
+
+# -----------------------------------------------------
+# Camera Geometry: bbox footprint -> lat/lon
+# -----------------------------------------------------
+
+METERS_PER_DEGREE = 111320.0
+
+
+def offset_to_latlon(lat, lon, north, east):
+    """Shift a position by north/east meters (arrays allowed)"""
+    lat_out = lat + np.asarray(north) / METERS_PER_DEGREE
+    lon_out = lon + np.asarray(east) / (METERS_PER_DEGREE * math.cos(math.radians(lat)))
+    return lat_out, lon_out
+
+
+class CameraModel:
+    def __init__(self, hfov=60.0, tilt=20.0, mount_height=3.0, ground_altitude=0.0, max_range=500.0):
+        """Pinhole camera looking along the platform heading, tilted down by tilt degrees
+
+        Height above ground is the GPS altitude minus ground_altitude plus the
+        mount height. Footprints at or above the horizon are clamped to max_range.
+        """
+        self.hfov = hfov
+        self.tilt = tilt
+        self.mount_height = mount_height
+        self.ground_altitude = ground_altitude
+        self.max_range = max_range
+
+    def ground_offsets(self, boxes, frame_shape, height_agl, heading=0.0):
+        """North/east meters from the platform to the bottom-center of each xyxy box"""
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        frame_h, frame_w = frame_shape[:2]
+        focal = (frame_w * 0.5) / math.tan(math.radians(self.hfov) * 0.5)
+
+        u = (boxes[:, 0] + boxes[:, 2]) * 0.5 - frame_w * 0.5
+        v = boxes[:, 3] - frame_h * 0.5
+        depression = math.radians(self.tilt) + np.arctan2(v, focal)
+        azimuth = math.radians(heading) + np.arctan2(u, focal)
+
+        with np.errstate(divide='ignore'):
+            distance = np.where(depression > 0, height_agl / np.tan(depression), np.inf)
+        distance = np.minimum(distance, self.max_range)
+        return distance * np.cos(azimuth), distance * np.sin(azimuth)
+
+    def project(self, boxes, frame_shape, gps_data):
+        """(lat, lon) arrays for the ground footprint of each box"""
+        height_agl = max(1.0, gps_data['altitude'] - self.ground_altitude + self.mount_height)
+        north, east = self.ground_offsets(boxes, frame_shape, height_agl,
+                                          gps_data.get('heading', 0.0))
+        return offset_to_latlon(gps_data['latitude'], gps_data['longitude'], north, east)
+
+# -----------------------------------------------------
+# Geohash Spatial Index
+# -----------------------------------------------------
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def geohash_encode(lat, lon, precision=8):
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits, value, even = 0, 0, True
+    while len(chars) < precision:
+        span = lon_range if even else lat_range
+        coord = lon if even else lat
+        mid = (span[0] + span[1]) * 0.5
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            span[0] = mid
+        else:
+            span[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision):
+    """(lat_degrees, lon_degrees) covered by one cell"""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def points_in_polygon(lats, lons, polygon):
+    """Even-odd rule for arrays of points against [(lat, lon), ...] vertices"""
+    poly = np.asarray(polygon, dtype=np.float64)
+    inside = np.zeros(len(lats), dtype=bool)
+    for (lat1, lon1), (lat2, lon2) in zip(poly, np.roll(poly, -1, axis=0)):
+        crosses = (lat1 > lats) != (lat2 > lats)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            edge_lon = lon1 + (lats - lat1) * (lon2 - lon1) / (lat2 - lat1)
+        inside ^= crosses & (lons < edge_lon)
+    return inside
+
+
+class GeoEntry:
+    __slots__ = ('entity_id', 'lat', 'lon', 'cell', 'data', 'timestamp')
+
+    def __init__(self, entity_id, lat, lon, cell, data, timestamp):
+        self.entity_id = entity_id
+        self.lat = lat
+        self.lon = lon
+        self.cell = cell
+        self.data = data
+        self.timestamp = timestamp
+
+
+class GeoIndex:
+    def __init__(self, precision=8, max_query_cells=64):
+        """Entities bucketed by geohash; queries prefix-scan only the cells they cover"""
+        self.precision = precision
+        self.max_query_cells = max_query_cells
+        self.cells = {}         # geohash -> set of entity IDs
+        self.sorted_cells = []  # occupied geohashes, sorted for prefix scans
+        self.entries = {}       # entity ID -> GeoEntry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def upsert(self, entity_id, lat, lon, data=None, timestamp=None):
+        """Insert or move an entity (keyed e.g. by track ID)"""
+        cell = geohash_encode(lat, lon, self.precision)
+        entry = self.entries.get(entity_id)
+        if entry is not None and entry.cell != cell:
+            self._unlink(entry)
+            entry = None
+        if entry is None:
+            members = self.cells.get(cell)
+            if members is None:
+                members = self.cells[cell] = set()
+                bisect.insort(self.sorted_cells, cell)
+            members.add(entity_id)
+        self.entries[entity_id] = GeoEntry(entity_id, lat, lon, cell, data,
+                                           time.time() if timestamp is None else timestamp)
+
+    def remove(self, entity_id):
+        entry = self.entries.pop(entity_id, None)
+        if entry is not None:
+            self._unlink(entry)
+
+    def _unlink(self, entry):
+        members = self.cells[entry.cell]
+        members.discard(entry.entity_id)
+        if not members:
+            del self.cells[entry.cell]
+            del self.sorted_cells[bisect.bisect_left(self.sorted_cells, entry.cell)]
+
+    def prune(self, older_than):
+        """Drop entities last updated before the given timestamp"""
+        stale = [e.entity_id for e in self.entries.values() if e.timestamp < older_than]
+        for entity_id in stale:
+            self.remove(entity_id)
+        return len(stale)
+
+    def _candidates(self, min_lat, min_lon, max_lat, max_lon):
+        """Entries in geohash cells overlapping a lat/lon box"""
+        # Coarsest cells that keep the covering small; finer cells share their prefix
+        precision = self.precision
+        while precision > 1:
+            cell_lat, cell_lon = geohash_cell_size(precision)
+            count = ((max_lat - min_lat) / cell_lat + 2) * ((max_lon - min_lon) / cell_lon + 2)
+            if count <= self.max_query_cells:
+                break
+            precision -= 1
+        cell_lat, cell_lon = geohash_cell_size(precision)
+
+        prefixes = set()
+        lat = math.floor(min_lat / cell_lat) * cell_lat + cell_lat * 0.5
+        while lat - cell_lat * 0.5 <= max_lat:
+            lon = math.floor(min_lon / cell_lon) * cell_lon + cell_lon * 0.5
+            while lon - cell_lon * 0.5 <= max_lon:
+                prefixes.add(geohash_encode(lat, lon, precision))
+                lon += cell_lon
+            lat += cell_lat
+
+        found = []
+        for prefix in prefixes:
+            i = bisect.bisect_left(self.sorted_cells, prefix)
+            while i < len(self.sorted_cells) and self.sorted_cells[i].startswith(prefix):
+                found.extend(self.entries[e] for e in self.cells[self.sorted_cells[i]])
+                i += 1
+        return found
+
+    def query_radius(self, lat, lon, radius):
+        """Entries within radius meters of (lat, lon)"""
+        dlat = radius / METERS_PER_DEGREE
+        dlon = radius / (METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+        candidates = self._candidates(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+        if not candidates:
+            return []
+        lats = np.array([e.lat for e in candidates])
+        lons = np.array([e.lon for e in candidates])
+        north = (lats - lat) * METERS_PER_DEGREE
+        east = (lons - lon) * METERS_PER_DEGREE * math.cos(math.radians(lat))
+        keep = np.hypot(north, east) <= radius
+        return [e for e, k in zip(candidates, keep.tolist()) if k]
+
+    def query_polygon(self, polygon):
+        """Entries inside a [(lat, lon), ...] polygon"""
+        poly = np.asarray(polygon, dtype=np.float64)
+        (min_lat, min_lon), (max_lat, max_lon) = poly.min(axis=0), poly.max(axis=0)
+        candidates = self._candidates(min_lat, min_lon, max_lat, max_lon)
+        if not candidates:
+            return []
+        lats = np.array([e.lat for e in candidates])
+        lons = np.array([e.lon for e in candidates])
+        keep = points_in_polygon(lats, lons, poly)
+        return [e for e, k in zip(candidates, keep.tolist()) if k]
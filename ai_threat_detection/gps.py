@@ -0,0 +1,160 @@
+import math
+import threading
+import time
+
+import numpy as np
+
+METERS_PER_DEGREE = 111320.0
+
+# -----------------------------------------------------
+# Track History (fixed-size ring buffer)
+# -----------------------------------------------------
+
+def douglas_peucker(xy, epsilon):
+    """Indices of the points kept when simplifying an (N, 2) polyline to epsilon"""
+    n = len(xy)
+    if n < 3:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        seg = xy[end] - xy[start]
+        rel = xy[start + 1:end] - xy[start]
+        length = math.hypot(seg[0], seg[1])
+        if length == 0:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / length
+        i = int(np.argmax(dist))
+        if dist[i] > epsilon:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return np.flatnonzero(keep)
+
+
+class GPSTrack:
+    FIELDS = ('timestamp', 'latitude', 'longitude', 'altitude', 'heading', 'speed')
+
+    def __init__(self, capacity=36000):
+        """Last `capacity` fixes in preallocated arrays; memory stays constant"""
+        self.capacity = capacity
+        self.data = np.zeros((capacity, len(self.FIELDS)), dtype=np.float64)
+        self.head = 0   # next write position
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def append(self, timestamp, latitude, longitude, altitude, heading, speed):
+        with self.lock:
+            self.data[self.head] = (timestamp, latitude, longitude, altitude, heading, speed)
+            self.head = (self.head + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def latest(self):
+        """Most recent fix as a dict of FIELDS, or None"""
+        with self.lock:
+            if self.count == 0:
+                return None
+            row = self.data[(self.head - 1) % self.capacity]
+            return dict(zip(self.FIELDS, row.tolist()))
+
+    def history(self, last=None):
+        """Chronological (N, len(FIELDS)) copy of the newest `last` fixes"""
+        with self.lock:
+            n = self.count if last is None else min(last, self.count)
+            start = (self.head - n) % self.capacity
+            if start + n <= self.capacity:
+                return self.data[start:start + n].copy()
+            return np.concatenate([self.data[start:], self.data[:self.head]])
+
+    def trail(self, epsilon=2.0, last=None):
+        """Simplified (N, 2) lat/lon breadcrumb trail, epsilon in meters"""
+        fixes = self.history(last)
+        if len(fixes) == 0:
+            return np.zeros((0, 2))
+        lat, lon = fixes[:, 1], fixes[:, 2]
+        scale = math.cos(math.radians(lat[0]))
+        xy = np.c_[(lon - lon[0]) * METERS_PER_DEGREE * scale, (lat - lat[0]) * METERS_PER_DEGREE]
+        return fixes[douglas_peucker(xy, epsilon)][:, 1:3]
+
+# -----------------------------------------------------
+# GPS/INS Platform Simulator
+# -----------------------------------------------------
+
+class GPSSimulator:
+    def __init__(self, lat, lon, alt, rate=10.0, speed=3.0, patrol_radius=100.0,
+                 turn_noise=5.0, accuracy=3.5, track=None, rng=None):
+        """Smooth platform path sampled at `rate` Hz into a shared GPSTrack
+
+        Heading wanders with a random turn rate and is steered back toward the
+        start when the platform leaves patrol_radius.
+        """
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.origin = (lat, lon)
+        self.dt = 1.0 / rate
+        self.speed = speed                  # m/s
+        self.patrol_radius = patrol_radius  # meters
+        self.turn_noise = turn_noise        # deg/s (1 sigma) of turn-rate changes
+        self.accuracy = accuracy
+        self.track = track if track is not None else GPSTrack()
+
+        self.north = 0.0
+        self.east = 0.0
+        self.alt = alt
+        self.heading = float(self.rng.uniform(0, 360))
+        self.turn_rate = 0.0
+        self.hdop = 1.2
+        self.satellites = 10
+        self.sim_time = None
+
+    def _step(self):
+        # Turn rate: mean-reverting random walk, plus homing outside the patrol radius
+        self.turn_rate += -0.5 * self.turn_rate * self.dt + \
+            self.rng.normal(0, self.turn_noise * math.sqrt(self.dt))
+        distance = math.hypot(self.north, self.east)
+        if distance > self.patrol_radius:
+            home = math.degrees(math.atan2(-self.east, -self.north))
+            error = (home - self.heading + 180.0) % 360.0 - 180.0
+            self.turn_rate += 0.5 * error * self.dt
+        self.heading = (self.heading + self.turn_rate * self.dt) % 360.0
+
+        theta = math.radians(self.heading)
+        self.north += self.speed * self.dt * math.cos(theta)
+        self.east += self.speed * self.dt * math.sin(theta)
+
+        # Slow drift of the quality figures
+        self.hdop = float(np.clip(self.hdop + self.rng.normal(0, 0.02), 0.8, 2.1))
+        if self.rng.random() < 0.01:
+            self.satellites = int(np.clip(self.satellites + self.rng.choice((-1, 1)), 8, 11))
+
+        lat = self.origin[0] + self.north / METERS_PER_DEGREE
+        lon = self.origin[1] + self.east / (METERS_PER_DEGREE * math.cos(math.radians(self.origin[0])))
+        self.sim_time += self.dt
+        self.track.append(self.sim_time, lat, lon, self.alt, self.heading, self.speed)
+
+    def advance(self, now=None):
+        """Step the path in fixed increments up to now; returns the latest fix"""
+        now = time.time() if now is None else now
+        if self.sim_time is None:
+            self.sim_time = now - self.dt
+        # Cap catch-up after long pauses to one buffer's worth
+        self.sim_time = max(self.sim_time, now - self.track.capacity * self.dt)
+        while self.sim_time + self.dt <= now:
+            self._step()
+        return self.fix()
+
+    def fix(self):
+        """Latest fix in the dashboard's gps_data format (None before the first step)"""
+        latest = self.track.latest()
+        if latest is None:
+            return None
+        latest.update(accuracy=self.accuracy, hdop=self.hdop, satellites=self.satellites)
+        return latest
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import shutil
+
+import numpy as np
+from ultralytics import YOLO
+
+# -----------------------------------------------------
+# Inference Backends (PyTorch / ONNX Runtime / OpenVINO)
+# -----------------------------------------------------
+
+# Exported models are cached here, keyed by a hash of the weights file
+DEFAULT_CACHE_DIR = os.environ.get(
+    'SMARTGUARD_MODEL_CACHE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_cache')
+)
+
+
+def weights_hash(path, chunk_size=1 << 20):
+    """Short SHA-256 of a weights file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+class InferenceBackend:
+    name = 'torch'
+
+    def __init__(self, weights, imgsz=416, cache_dir=None):
+        """Load a YOLO model for one runtime; exported runtimes still return YOLO Results"""
+        self.weights = weights
+        self.imgsz = imgsz
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.model = None
+
+    def load(self):
+        """Return a YOLO model callable as model(frames, **inference_args)"""
+        self.model = YOLO(self.weights)
+        return self.model
+
+
+class TorchBackend(InferenceBackend):
+    name = 'torch'
+
+
+class ExportedBackend(InferenceBackend):
+    export_format = None
+    export_args = {}
+
+    def artifact_path(self, weights_path):
+        """Cache location of the exported model for these weights and image size"""
+        stem = os.path.splitext(os.path.basename(weights_path))[0]
+        key = f"{stem}-{weights_hash(weights_path)}-{self.name}-{self.imgsz}"
+        return os.path.join(self.cache_dir, key + self.artifact_suffix())
+
+    def artifact_suffix(self):
+        return ''
+
+    def export(self, torch_model, artifact):
+        """Export once with ultralytics and move the result into the cache"""
+        print(f"📦 Exporting {self.weights} for {self.name} (one-time)...")
+        exported = torch_model.export(format=self.export_format, imgsz=self.imgsz,
+                                      verbose=False, **self.export_args)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if os.path.isdir(artifact):
+            shutil.rmtree(artifact)
+        elif os.path.exists(artifact):
+            os.remove(artifact)
+        shutil.move(str(exported), artifact)
+
+    def load(self):
+        # Loading the .pt first also downloads stock weights such as yolov8n.pt
+        torch_model = YOLO(self.weights)
+        weights_path = getattr(torch_model, 'ckpt_path', None) or self.weights
+
+        artifact = self.artifact_path(weights_path)
+        if not os.path.exists(artifact):
+            self.export(torch_model, artifact)
+        self.model = YOLO(artifact, task='detect')
+        # Ultralytics sets up the runtime on the first predict; do it here so a
+        # broken runtime fails inside create_backend and falls back to PyTorch
+        self.model.predict(np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8),
+                           imgsz=self.imgsz, verbose=False)
+        return self.model
+
+
+class OnnxRuntimeBackend(ExportedBackend):
+    name = 'onnx'
+    export_format = 'onnx'
+    export_args = {'dynamic': True, 'simplify': True}  # dynamic batch for the batching engine
+
+    def artifact_suffix(self):
+        return '.onnx'
+
+
+class OpenVINOBackend(ExportedBackend):
+    name = 'openvino'
+    export_format = 'openvino'
+    export_args = {'half': False, 'dynamic': True}  # dynamic batch for the batching engine
+
+    def artifact_suffix(self):
+        return '_openvino_model'  # ultralytics picks the OpenVINO runtime from this suffix
+
+
+class OpenVINOInt8Backend(OpenVINOBackend):
+    name = 'openvino-int8'
+    # post-training quantization on the export calibration set
+    export_args = {**OpenVINOBackend.export_args, 'int8': True}
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (TorchBackend, OnnxRuntimeBackend, OpenVINOBackend, OpenVINOInt8Backend)
+}
+
+
+def create_backend(weights, imgsz=416, backend=None, cache_dir=None):
+    """Build the configured backend (argument, else SMARTGUARD_BACKEND, else torch)
+
+    Falls back to plain PyTorch if the export or runtime is unavailable.
+    """
+    name = backend or os.environ.get('SMARTGUARD_BACKEND', 'torch')
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}' (choose from {', '.join(BACKENDS)})")
+
+    selected = BACKENDS[name](weights, imgsz=imgsz, cache_dir=cache_dir)
+    try:
+        selected.load()
+    except Exception as e:
+        if name == 'torch':
+            raise
+        print(f"⚠️ {name} backend unavailable ({e}), falling back to PyTorch")
+        selected = TorchBackend(weights, imgsz=imgsz)
+        selected.load()
+    return selected
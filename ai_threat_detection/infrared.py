@@ -0,0 +1,67 @@
+import cv2
+import numpy as np
+
+# -----------------------------------------------------
+# Infrared Rendering with Reused Buffers
+# -----------------------------------------------------
+
+class IRProcessor:
+    def __init__(self, clip_limit=2.0, tile_grid=(8, 8), noise_sigma=0.0, process_scale=1.0,
+                 colormap=cv2.COLORMAP_HOT, noise_pool=4, rng=None):
+        """CLAHE + colormap IR view; buffers are allocated once per frame size
+
+        With process_scale < 1 the contrast enhancement and grain run on a
+        downscaled image and only the result is upscaled to display size.
+        """
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tile_grid)
+        self.noise_sigma = noise_sigma
+        self.process_scale = process_scale
+        self.colormap = colormap
+        self.noise_pool = noise_pool
+
+        self.shape = None  # frame (height, width) the buffers were built for
+
+    def _allocate(self, frame_shape):
+        height, width = frame_shape[:2]
+        self.shape = (height, width)
+        self.size = (max(1, int(width * self.process_scale)),
+                     max(1, int(height * self.process_scale)))
+        proc_w, proc_h = self.size
+
+        self.gray = np.empty((height, width), dtype=np.uint8)
+        self.small = np.empty((proc_h, proc_w), dtype=np.uint8) if self.scaled else self.gray
+        self.enhanced = np.empty((proc_h, proc_w), dtype=np.uint8)
+        self.full = np.empty((height, width), dtype=np.uint8) if self.scaled else self.enhanced
+        self.output = np.empty((height, width, 3), dtype=np.uint8)
+
+        # Signed grain, added with saturation (no uint8 wraparound)
+        if self.noise_sigma > 0:
+            noise = self.rng.normal(0, self.noise_sigma, (self.noise_pool, proc_h, proc_w))
+            self.noise = np.round(noise).astype(np.int16)
+        else:
+            self.noise = None
+
+    @property
+    def scaled(self):
+        return self.process_scale != 1.0
+
+    def process(self, bgr_frame):
+        """IR view of a BGR frame; the returned buffer is reused next call"""
+        if self.shape != bgr_frame.shape[:2]:
+            self._allocate(bgr_frame.shape)
+
+        cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2GRAY, dst=self.gray)
+        if self.scaled:
+            cv2.resize(self.gray, self.size, dst=self.small, interpolation=cv2.INTER_AREA)
+        self.clahe.apply(self.small, dst=self.enhanced)
+
+        if self.noise is not None:
+            grain = self.noise[self.rng.integers(self.noise_pool)]
+            cv2.add(self.enhanced, grain, dst=self.enhanced, dtype=cv2.CV_8U)
+
+        if self.scaled:
+            cv2.resize(self.enhanced, (self.shape[1], self.shape[0]), dst=self.full,
+                       interpolation=cv2.INTER_LINEAR)
+        cv2.applyColorMap(self.full, self.colormap, dst=self.output)
+        return self.output
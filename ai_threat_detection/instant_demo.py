@@ -3,155 +3,75 @@ import streamlit as st
 from ultralytics import YOLO
 import threading
 from PIL import Image
-import plotly.graph_objects as go
 import plotly.express as px
 import matplotlib.pyplot as plt
 from datetime import datetime
 import torch
 from roboflow import Roboflow
+from inference_backends import create_backend
+from charts import LidarChart, RadarChart
+from video_output import JPEGEncoder, SensorMosaic
+from lidar import LidarEngine, LidarStructure, ObstacleDetector
+from infrared import IRProcessor
+from thermal import ThermalEngine
+from radar import (RadarBand, RadarSimulator, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_MEDIUM,
+                   TYPE_AIRCRAFT, TYPE_PERSONNEL, TYPE_VEHICLE)
+from detections import (ClassLookup, Detection, LEVEL_PERSON, THREAT_LEVEL_NAMES,
+                        person_mask, results_to_array, threat_mask)
 
 # -----------------------------------------------------
 # Military Drone Sensor Simulator
 # -----------------------------------------------------
 class MilitaryDroneSensorSimulator:
-    def __init__(self):
+    def __init__(self, seed=None):
+        # Shared random generator (pass a seed for reproducible runs)
+        self.rng = np.random.default_rng(seed)
+        
         self.radar_range = 5000  # meters
-        self.lidar_points = 1000
+        self.lidar_points = 100_000
         self.thermal_temp_range = (-40, 60)  # Celsius
         
-    def generate_thermal_data(self, rgb_frame):
-        """Convert RGB to realistic thermal imaging"""
-        # Convert to grayscale and enhance for thermal effect
-        gray = cv2.cvtColor(rgb_frame, cv2.COLOR_BGR2GRAY)
-        
-        # Apply thermal colormap
-        thermal = cv2.applyColorMap(gray, cv2.COLORMAP_JET)
-        
-        # Generate temperature overlay
-        height, width = gray.shape
-        temp_overlay = np.random.normal(25, 8, (height, width))  # Base 25°C ± 8°C
-        
-        # Simulate human body heat signatures (37°C)
-        for _ in range(np.random.randint(1, 3)):
-            x = np.random.randint(50, width-50)
-            y = np.random.randint(50, height-50)
-            size = np.random.randint(25, 40)
-            cv2.circle(temp_overlay, (x, y), size, 37, -1)
-        
-        # Add environmental heat sources
-        for _ in range(np.random.randint(0, 2)):
-            x = np.random.randint(30, width-30)
-            y = np.random.randint(30, height-30)
-            cv2.rectangle(temp_overlay, (x-20, y-20), (x+20, y+20), 45, -1)  # Hot objects
-        
-        return thermal, temp_overlay
+        # Thermal: persistent field (25°C ± 8°C), body heat at detected personnel
+        self.thermal = ThermalEngine(baseline=25, noise=8, rng=self.rng)
+        
+        # IR: CLAHE and buffers created once, signed grain (no uint8 wraparound)
+        self.ir = IRProcessor(noise_sigma=3, rng=self.rng)
+        
+        # Radar: persistent contacts, personnel 3/8, vehicles 3/8, aircraft 2/8
+        self.radar = RadarSimulator([
+            RadarBand(0.92, TYPE_PERSONNEL, PRIORITY_LOW, 100, 1000, rcs=1),
+            RadarBand(0.95, TYPE_VEHICLE, PRIORITY_MEDIUM, 1000, 5000, rcs=5),
+            RadarBand(0.98, TYPE_AIRCRAFT, PRIORITY_HIGH, 5000, 15000, rcs=10)
+        ], n_contacts=29, radar_range=self.radar_range, rng=self.rng)
+        
+        # LIDAR: ground, 3 buildings and 2 vehicles (buildings get most returns)
+        self.lidar = LidarEngine(self.lidar_points, extent=50.0, structures=[
+            LidarStructure(3, spread=40, width=(5, 15), depth=(5, 15), height=(5, 20), share=300),
+            LidarStructure(2, spread=30, width=(4, 4), depth=(8, 8), height=(2, 2), share=40)
+        ], ground_fraction=0.47, rng=self.rng)
+        self.obstacle_detector = ObstacleDetector(alert_range=15.0, rng=self.rng)
+        
+    def generate_thermal_data(self, rgb_frame, person_boxes=()):
+        """Thermal view of the frame and stats of the persistent temperature field"""
+        self.thermal.update(rgb_frame.shape, person_boxes)
+        return self.thermal.render(rgb_frame), self.thermal.stats()
     
     def generate_radar_data(self):
-        """Simulate military radar sweep with realistic targets"""
-        angles = np.linspace(0, 360, 360)
-        ranges = []
-        targets = []
-        
-        for angle in angles:
-            # Simulate different types of radar contacts
-            rand = np.random.random()
-            
-            if rand > 0.98:  # Aircraft signature (2% chance)
-                distance = np.random.uniform(5000, 15000)
-                targets.append({
-                    'type': 'AIRCRAFT', 
-                    'range': distance, 
-                    'bearing': angle,
-                    'rcs': 10,  # Radar Cross Section
-                    'priority': 'HIGH'
-                })
-            elif rand > 0.95:  # Vehicle signature (3% chance)
-                distance = np.random.uniform(1000, 5000)
-                targets.append({
-                    'type': 'VEHICLE', 
-                    'range': distance, 
-                    'bearing': angle,
-                    'rcs': 5,
-                    'priority': 'MEDIUM'
-                })
-            elif rand > 0.92:  # Personnel signature (3% chance)
-                distance = np.random.uniform(100, 1000)
-                targets.append({
-                    'type': 'PERSONNEL', 
-                    'range': distance, 
-                    'bearing': angle,
-                    'rcs': 1,
-                    'priority': 'LOW'
-                })
-            else:
-                distance = self.radar_range  # No detection
-            
-            ranges.append(distance)
-        
-        return angles, ranges, targets
+        """Advance the radar scene one sweep; returns the changed tracks (RadarTrackDelta)"""
+        return self.radar.step()
     
     def generate_lidar_data(self):
-        """Generate realistic 3D LIDAR point cloud with structures"""
-        # Ground plane
-        ground_points = 300
-        x_ground = np.random.uniform(-50, 50, ground_points)
-        y_ground = np.random.uniform(-50, 50, ground_points) 
-        z_ground = np.random.uniform(-2, 2, ground_points)
-        
-        # Building structures
-        buildings = []
-        for i in range(3):  # 3 buildings
-            bx = np.random.uniform(-40, 40)
-            by = np.random.uniform(-40, 40)
-            bw = np.random.uniform(5, 15)
-            bh = np.random.uniform(5, 20)
-            
-            # Create building walls
-            wall_points = 100
-            bx_pts = np.random.uniform(bx, bx+bw, wall_points)
-            by_pts = np.random.uniform(by, by+bw, wall_points)
-            bz_pts = np.random.uniform(0, bh, wall_points)
-            
-            buildings.extend([bx_pts, by_pts, bz_pts])
-        
-        # Vehicle signatures
-        vehicles = []
-        for i in range(2):  # 2 vehicles
-            vx = np.random.uniform(-30, 30)
-            vy = np.random.uniform(-30, 30)
-            
-            # Vehicle outline
-            vehicle_points = 20
-            vx_pts = np.random.uniform(vx, vx+4, vehicle_points)
-            vy_pts = np.random.uniform(vy, vy+8, vehicle_points)
-            vz_pts = np.random.uniform(0, 2, vehicle_points)
-            
-            vehicles.extend([vx_pts, vy_pts, vz_pts])
-        
-        # Combine all points
-        x = np.concatenate([x_ground] + [buildings[i] for i in range(0, len(buildings), 3)] + [vehicles[i] for i in range(0, len(vehicles), 3)])
-        y = np.concatenate([y_ground] + [buildings[i] for i in range(1, len(buildings), 3)] + [vehicles[i] for i in range(1, len(vehicles), 3)])
-        z = np.concatenate([z_ground] + [buildings[i] for i in range(2, len(buildings), 3)] + [vehicles[i] for i in range(2, len(vehicles), 3)])
-        
-        return x, y, z
+        """Generate a realistic 3D LIDAR scan with structures; (N, 3) float32 buffer"""
+        return self.lidar.scan()
+    
+    def detect_lidar_obstacles(self, points):
+        """Ground removal and clustering; returns (OBSTACLE_DTYPE array, Detection records)"""
+        obstacles = self.obstacle_detector.detect(points)
+        return obstacles, self.obstacle_detector.to_detections(obstacles)
     
     def generate_ir_data(self, rgb_frame):
-        """Generate military-grade infrared imaging"""
-        # Convert to grayscale
-        gray = cv2.cvtColor(rgb_frame, cv2.COLOR_BGR2GRAY)
-        
-        # Apply military IR characteristics
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-        enhanced = clahe.apply(gray)
-        
-        # Add IR noise and grain
-        noise = np.random.normal(0, 3, enhanced.shape).astype(np.uint8)
-        ir_image = cv2.add(enhanced, noise)
-        
-        # Apply military IR colormap (bone/hot)
-        ir_colored = cv2.applyColorMap(ir_image, cv2.COLORMAP_HOT)
-        
-        return ir_colored
+        """Generate military-grade infrared imaging (buffer reused by the next call)"""
+        return self.ir.process(rgb_frame)
 
 # -----------------------------------------------------
 # Dataset Download Function  
@@ -169,17 +89,21 @@ def download_weapon_dataset():
 # Enhanced Military Drone Threat Detection System
 # -----------------------------------------------------
 class MilitaryDroneThreatDetector:
-    def __init__(self, use_weapon_model=True):
+    def __init__(self, use_weapon_model=True, backend=None):
         print("🚁 Initializing Military Drone Multi-Sensor System...")
         
         # Initialize sensor simulator
         self.sensor_sim = MilitaryDroneSensorSimulator()
         
+        # Inference runtime (torch, onnx, openvino, openvino-int8)
+        self.inference_args = {'conf': 0.3, 'verbose': False, 'imgsz': 480}
+        self.backend_name = backend
+        
         # Initialize weapon detection model
         weapon_model_path = "runs/detect/weapon_detector/weights/best.pt"
         
         if use_weapon_model and os.path.exists(weapon_model_path):
-            self.model = YOLO(weapon_model_path)
+            self.model = self.load_model(weapon_model_path)
             print("✅ Military Weapon Detection Model Loaded")
             self.using_weapon_model = True
             self.weapon_classes = {
@@ -187,13 +111,34 @@ class MilitaryDroneThreatDetector:
                 3: 'monedero', 4: 'billete', 5: 'tarjeta'
             }
         else:
-            self.model = YOLO('yolov8n.pt')
+            self.model = self.load_model('yolov8n.pt')
             print("✅ Standard Detection Model Loaded")
             self.using_weapon_model = False
             self.threat_keywords = [
                 'scissors', 'knife', 'blade', 'pen', 'pencil', 'stick',
                 'tool', 'bottle', 'cup', 'phone', 'remote', 'bat'
             ]
+        
+        self.class_lookup = None
+        self._lookup_model = None
+    
+    def load_model(self, weights):
+        """Load weights on the configured inference backend"""
+        self.backend = create_backend(weights, imgsz=self.inference_args['imgsz'],
+                                      backend=self.backend_name)
+        return self.backend.model
+    
+    def get_class_lookup(self):
+        """Class-ID lookup for the current model (rebuilt after retraining)"""
+        if self._lookup_model is not self.model:
+            if self.using_weapon_model:
+                weapon_ids = [class_id for class_id, name in self.weapon_classes.items()
+                              if name in ['knife', 'pistol']]
+                self.class_lookup = ClassLookup(self.model.names, immediate_ids=weapon_ids)
+            else:
+                self.class_lookup = ClassLookup(self.model.names, self.threat_keywords)
+            self._lookup_model = self.model
+        return self.class_lookup
     
     def train_weapon_model(self):
         """Train specialized weapon detection model"""
@@ -223,7 +168,7 @@ class MilitaryDroneThreatDetector:
             status_text.text("✅ Military weapon detection model trained!")
             
             # Update to use trained model
-            self.model = YOLO('runs/detect/weapon_detector/weights/best.pt')
+            self.model = self.load_model('runs/detect/weapon_detector/weights/best.pt')
             self.using_weapon_model = True
             
             st.success("🎯 Model training completed! Enhanced threat detection active.")
@@ -235,50 +180,45 @@ class MilitaryDroneThreatDetector:
     
     def detect_threats(self, frame):
         """Military-grade threat detection with person tracking"""
-        results = self.model(frame, conf=0.3, verbose=False, imgsz=480)
-        
-        persons = []
-        threats = []
-        
-        for result in results:
-            if result.boxes is not None:
-                for box in result.boxes:
-                    class_id = int(box.cls[0])
-                    confidence = float(box.conf[0])
-                    bbox = box.xyxy[0].tolist()
-                    class_name = self.model.names[class_id]
-                    
-                    if class_name.lower() == 'person':
-                        persons.append({
-                            'name': 'PERSONNEL',
-                            'confidence': confidence,
-                            'bbox': [int(x) for x in bbox],
-                            'threat_level': 'NEUTRAL',
-                            'status': 'MONITORING'
-                        })
-                    else:
-                        # Weapon/threat detection logic
-                        is_weapon = False
-                        threat_level = 'MONITOR'
-                        
-                        if self.using_weapon_model:
-                            weapon_name = self.weapon_classes.get(class_id, 'unknown')
-                            if weapon_name in ['knife', 'pistol']:
-                                is_weapon = True
-                                threat_level = 'IMMEDIATE_THREAT'
-                        else:
-                            if any(keyword in class_name.lower() for keyword in self.threat_keywords):
-                                is_weapon = True
-                                threat_level = 'POTENTIAL_THREAT'
-                        
-                        if is_weapon or confidence > 0.5:
-                            threats.append({
-                                'name': class_name.upper(),
-                                'confidence': confidence,
-                                'bbox': [int(x) for x in bbox],
-                                'threat_level': threat_level,
-                                'type': 'weapon' if is_weapon else 'object'
-                            })
+        results = self.model(frame, **self.inference_args)
+        return self.process_results(results, frame)
+    
+    def process_results(self, results, frame):
+        """Turn YOLO results for one frame into person and threat detections"""
+        # Pull boxes out once as arrays and classify by class ID
+        detections = results_to_array(results, self.get_class_lookup())
+        levels = detections['level']
+        confidences = detections['confidence']
+        
+        persons_arr = detections[person_mask(detections)]
+        persons = [
+            Detection('PERSONNEL', confidence, bbox, class_id=class_id,
+                      threat_level='NEUTRAL', status='MONITORING')
+            for class_id, confidence, bbox in zip(
+                persons_arr['class_id'].tolist(),
+                persons_arr['confidence'].tolist(),
+                persons_arr['bbox'].tolist()
+            )
+        ]
+        
+        # Weapons always count; other objects only when confident
+        is_weapon = threat_mask(detections)
+        keep = (levels != LEVEL_PERSON) & (is_weapon | (confidences > 0.5))
+        threats_arr = detections[keep]
+        names = self.get_class_lookup().names
+        
+        threats = [
+            Detection(names[class_id].upper(), confidence, bbox, class_id=class_id,
+                      threat_level=THREAT_LEVEL_NAMES.get(level, 'MONITOR'),
+                      type='weapon' if weapon else 'object')
+            for class_id, confidence, bbox, level, weapon in zip(
+                threats_arr['class_id'].tolist(),
+                threats_arr['confidence'].tolist(),
+                threats_arr['bbox'].tolist(),
+                threats_arr['level'].tolist(),
+                is_weapon[keep].tolist()
+            )
+        ]
         
         return persons + threats
 
@@ -347,6 +287,8 @@ def create_military_dashboard():
             ["Visual", "Thermal", "Radar", "LIDAR", "Infrared"],
             default=["Visual", "Thermal", "Radar"]
         )
+        chart_refresh = st.slider("Chart Refresh (s)", 0.1, 5.0, 1.0)
+        jpeg_quality = st.slider("Video JPEG Quality", 30, 95, 75)
         
         # Threat levels
         st.subheader("⚠️ Threat Settings")
@@ -366,8 +308,8 @@ def create_military_dashboard():
         threat_status_placeholder = st.empty()
     
     with col2:
-        st.subheader("🌡️ Thermal Imaging")
-        thermal_placeholder = st.empty()
+        st.subheader("🌡️ Thermal / 🔴 Infrared")
+        sensor_view_placeholder = st.empty()
         temp_metrics_placeholder = st.empty()
     
     # Radar and LIDAR row
@@ -381,16 +323,9 @@ def create_military_dashboard():
         st.subheader("📊 LIDAR Point Cloud")
         lidar_placeholder = st.empty()
     
-    # IR and metrics row
-    col5, col6 = st.columns(2)
-    
-    with col5:
-        st.subheader("🔴 Infrared Spectrum")
-        ir_placeholder = st.empty()
-    
-    with col6:
-        st.subheader("📈 Mission Metrics")
-        metrics_placeholder = st.empty()
+    # Metrics row
+    st.subheader("📈 Mission Metrics")
+    metrics_placeholder = st.empty()
     
     # Real-time surveillance
     if st.button("🚀 Start Multi-Sensor Surveillance", type="primary"):
@@ -400,9 +335,59 @@ def create_military_dashboard():
             st.error("❌ Camera not accessible")
             return
         
+        # Charts are built once; each refresh only swaps trace data
+        if 'radar_chart' not in st.session_state:
+            st.session_state.radar_chart = RadarChart(
+                layout=dict(
+                    polar=dict(
+                        radialaxis=dict(visible=True, range=[0, 15000], color='white'),
+                        angularaxis=dict(color='white'),
+                        bgcolor="black"
+                    ),
+                    showlegend=False,
+                    height=400,
+                    paper_bgcolor="black",
+                    font_color="white"
+                ),
+                contact_size=6,
+                target_size=10,
+                max_contacts=50,
+                max_targets=5,
+                radar_range=st.session_state.detector.sensor_sim.radar_range
+            )
+            st.session_state.lidar_chart = LidarChart(
+                layout=dict(
+                    scene=dict(
+                        xaxis_title='X (meters)',
+                        yaxis_title='Y (meters)',
+                        zaxis_title='Z (meters)',
+                        bgcolor="black",
+                        xaxis=dict(gridcolor='gray'),
+                        yaxis=dict(gridcolor='gray'),
+                        zaxis=dict(gridcolor='gray')
+                    ),
+                    height=400,
+                    paper_bgcolor="black"
+                ),
+                obstacle_size=6,
+                opacity=0.8,
+                max_points=2000,
+                text_color='white',
+                rng=st.session_state.detector.sensor_sim.rng
+            )
+        radar_chart = st.session_state.radar_chart
+        lidar_chart = st.session_state.lidar_chart
+        radar_chart.refresh_interval = lidar_chart.refresh_interval = chart_refresh
+        
+        # Frames are JPEG-encoded once at display size; thermal and IR share one tiled image
+        video_encoder = JPEGEncoder(quality=jpeg_quality, width=640)
+        sensor_encoder = JPEGEncoder(quality=jpeg_quality)
+        sensor_mosaic = SensorMosaic((320, 240), columns=2, labels=["THERMAL", "INFRARED"])
+        
         # Real-time loop
         frame_count = 0
         threat_detections = 0
+        lidar_points, lidar_obstacles, lidar_threats = None, [], []  # last scan, reused between scans
         
         while cap.isOpened():
             ret, frame = cap.read()
@@ -411,27 +396,33 @@ def create_military_dashboard():
             
             frame_count += 1
             
+            # Threat detection (first, so thermal heat follows detected personnel)
+            detections = st.session_state.detector.detect_threats(frame)
+            
             # Generate multi-sensor data
             if "Thermal" in active_sensors:
-                thermal_img, temp_data = st.session_state.detector.sensor_sim.generate_thermal_data(frame)
+                person_boxes = [d['bbox'] for d in detections if d['threat_level'] == 'NEUTRAL']
+                thermal_img, temp_stats = st.session_state.detector.sensor_sim.generate_thermal_data(
+                    frame, person_boxes)
             if "Radar" in active_sensors:
-                radar_angles, radar_ranges, radar_targets = st.session_state.detector.sensor_sim.generate_radar_data()
-            if "LIDAR" in active_sensors:
-                lidar_x, lidar_y, lidar_z = st.session_state.detector.sensor_sim.generate_lidar_data()
+                radar_delta = st.session_state.detector.sensor_sim.generate_radar_data()
+            if "LIDAR" in active_sensors and lidar_chart.due():
+                # 100k-point scan and obstacle detection only when the chart will show them
+                lidar_points = st.session_state.detector.sensor_sim.generate_lidar_data()
+                lidar_obstacles, lidar_threats = \
+                    st.session_state.detector.sensor_sim.detect_lidar_obstacles(lidar_points)
             if "Infrared" in active_sensors:
                 ir_img = st.session_state.detector.sensor_sim.generate_ir_data(frame)
             
-            # Threat detection
-            detections = st.session_state.detector.detect_threats(frame)
-            
-            # Count threats
+            # Count threats (camera detections plus LIDAR obstacles inside alert range)
             current_threats = len([d for d in detections if d.get('threat_level') != 'NEUTRAL'])
+            current_threats += len([t for t in lidar_threats if t['threat_level']])
             threat_detections += current_threats
             
             # Update visual display
             if "Visual" in active_sensors:
-                # Draw detection boxes
-                display_frame = frame.copy()
+                # Draw detection boxes (sensors already consumed the raw frame, so no copy)
+                display_frame = frame
                 for detection in detections:
                     bbox = detection['bbox']
                     threat_level = detection.get('threat_level', 'MONITOR')
@@ -451,7 +442,7 @@ def create_military_dashboard():
                     cv2.putText(display_frame, f"{detection['name']} {detection['confidence']:.2f}", 
                               (bbox[0], bbox[1]-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
                 
-                visual_placeholder.image(display_frame, channels="BGR", use_column_width=True)
+                visual_placeholder.image(video_encoder.encode(display_frame), use_column_width=True)
                 
                 # Threat status
                 if current_threats > 0:
@@ -471,86 +462,26 @@ def create_military_dashboard():
                     </div>
                     """, unsafe_allow_html=True)
             
-            # Update thermal display
+            # Update thermal and IR display (one tiled frame, inactive views stay black)
+            if "Thermal" in active_sensors or "Infrared" in active_sensors:
+                sensor_view = sensor_mosaic.compose([
+                    thermal_img if "Thermal" in active_sensors else None,
+                    ir_img if "Infrared" in active_sensors else None
+                ])
+                sensor_view_placeholder.image(sensor_encoder.encode(sensor_view), use_column_width=True)
             if "Thermal" in active_sensors:
-                thermal_placeholder.image(thermal_img, channels="BGR", use_column_width=True)
-                temp_metrics_placeholder.metric("Average Temperature", f"{temp_data.mean():.1f}°C")
+                temp_metrics_placeholder.metric("Average Temperature", f"{temp_stats.mean:.1f}°C",
+                                                f"max {temp_stats.max:.1f}°C", delta_color="off")
             
             # Update radar
             if "Radar" in active_sensors:
-                fig_radar = go.Figure()
-                
-                # Plot radar sweep
-                detected_ranges = [r for r in radar_ranges if r < st.session_state.detector.sensor_sim.radar_range]
-                detected_angles = [radar_angles[i] for i, r in enumerate(radar_ranges) if r < st.session_state.detector.sensor_sim.radar_range]
-                
-                fig_radar.add_trace(go.Scatterpolar(
-                    r=detected_ranges[:50],
-                    theta=detected_angles[:50],
-                    mode='markers',
-                    marker=dict(size=6, color='lime'),
-                    name='Contacts'
-                ))
-                
-                # Add target annotations
-                for target in radar_targets[:5]:  # Show first 5 targets
-                    fig_radar.add_trace(go.Scatterpolar(
-                        r=[target['range']],
-                        theta=[target['bearing']],
-                        mode='markers+text',
-                        marker=dict(size=10, color='red' if target['priority'] == 'HIGH' else 'orange'),
-                        text=[target['type']],
-                        name=target['type']
-                    ))
-                
-                fig_radar.update_layout(
-                    polar=dict(
-                        radialaxis=dict(visible=True, range=[0, 15000], color='white'),
-                        angularaxis=dict(color='white'),
-                        bgcolor="black"
-                    ),
-                    showlegend=False,
-                    height=400,
-                    paper_bgcolor="black",
-                    font_color="white"
-                )
-                
-                radar_placeholder.plotly_chart(fig_radar, use_container_width=True)
+                radar_chart.render(radar_placeholder, radar_delta)
             
             # Update LIDAR
             if "LIDAR" in active_sensors:
-                fig_lidar = go.Figure(data=[go.Scatter3d(
-                    x=lidar_x[:300],
-                    y=lidar_y[:300],
-                    z=lidar_z[:300],
-                    mode='markers',
-                    marker=dict(
-                        size=2,
-                        color=lidar_z[:300],
-                        colorscale='Plasma',
-                        opacity=0.8
-                    )
-                )])
-                
-                fig_lidar.update_layout(
-                    scene=dict(
-                        xaxis_title='X (meters)',
-                        yaxis_title='Y (meters)',
-                        zaxis_title='Z (meters)',
-                        bgcolor="black",
-                        xaxis=dict(gridcolor='gray'),
-                        yaxis=dict(gridcolor='gray'),
-                        zaxis=dict(gridcolor='gray')
-                    ),
-                    height=400,
-                    paper_bgcolor="black"
-                )
-                
-                lidar_placeholder.plotly_chart(fig_lidar, use_container_width=True)
-            
-            # Update IR
-            if "Infrared" in active_sensors:
-                ir_placeholder.image(ir_img, channels="BGR", use_column_width=True)
+                # Voxel-downsampled so buildings and vehicles stay visible
+                lidar_chart.render(lidar_placeholder, lidar_points, lidar_obstacles,
+                                   [t['name'] for t in lidar_threats])
             
             # Update metrics
             metrics_placeholder.markdown(f"""
@@ -559,6 +490,7 @@ def create_military_dashboard():
                 <p>Frames Processed: {frame_count}</p>
                 <p>Total Threats: {threat_detections}</p>
                 <p>Active Sensors: {len(active_sensors)}</p>
+                <p>LIDAR Obstacles: {len(lidar_threats)}</p>
                 <p>System Status: {'🔴 ALERT' if current_threats > 0 else '🟢 OPERATIONAL'}</p>
                 <p>Mission Time: {frame_count // 10}s</p>
             </div>
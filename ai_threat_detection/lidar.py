@@ -0,0 +1,283 @@
+import cv2
+import numpy as np
+
+from detections import Detection, THREAT_LEVEL_NAMES, LEVEL_POTENTIAL
+
+# -----------------------------------------------------
+# Scene Description
+# -----------------------------------------------------
+
+class LidarStructure:
+    def __init__(self, count, spread, width, depth, height, share=1.0):
+        """count boxes placed within +/-spread meters; sizes are (low, high) ranges
+
+        share is this structure type's fraction of the non-ground points.
+        """
+        self.count = count
+        self.spread = spread
+        self.width = width
+        self.depth = depth
+        self.height = height
+        self.share = share
+
+# -----------------------------------------------------
+# Scan Generator (one preallocated buffer)
+# -----------------------------------------------------
+
+class LidarEngine:
+    def __init__(self, n_points=100_000, extent=25.0, structures=(), ground_fraction=0.6,
+                 ground_roughness=0.05, min_range=1.0, rng=None):
+        """Spinning-LIDAR style scans written into one reused (n_points, 3) float32 buffer"""
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.n_points = n_points
+        self.extent = extent                      # max ground range (meters)
+        self.structures = list(structures)
+        self.ground_roughness = ground_roughness  # ground height noise (meters)
+        self.min_range = min_range
+
+        self.points = np.empty((n_points, 3), dtype=np.float32)
+        self.n_ground = n_points if not self.structures else int(n_points * ground_fraction)
+
+        # Points per structure type, by share
+        shares = np.array([s.share for s in self.structures], dtype=np.float64)
+        remaining = n_points - self.n_ground
+        if len(shares):
+            counts = np.floor(remaining * shares / shares.sum()).astype(int)
+            counts[-1] += remaining - counts.sum()
+        else:
+            counts = np.zeros(0, dtype=int)
+        self.structure_points = counts.tolist()
+
+        # Box layout: (K, 3) minimum corners and sizes, fixed for the scene
+        self.box_min, self.box_size = self._layout()
+
+    def _layout(self):
+        mins, sizes = [], []
+        for structure in self.structures:
+            k = structure.count
+            size = np.c_[self.rng.uniform(*structure.width, k),
+                         self.rng.uniform(*structure.depth, k),
+                         self.rng.uniform(*structure.height, k)]
+            corner = np.c_[self.rng.uniform(-structure.spread, structure.spread, (k, 2)),
+                           np.zeros(k)]
+            mins.append(corner)
+            sizes.append(size)
+        if not mins:
+            return np.zeros((0, 3), np.float32), np.zeros((0, 3), np.float32)
+        return (np.concatenate(mins).astype(np.float32),
+                np.concatenate(sizes).astype(np.float32))
+
+    def _fill_ground(self, block):
+        """Ground returns; uniform range gives the 1/r density of a rotating scanner"""
+        self.rng.random(dtype=np.float32, out=block)
+        ranges = block[:, 0] * (self.extent - self.min_range) + self.min_range
+        angles = block[:, 1] * (2 * np.pi)
+        np.cos(angles, out=block[:, 0])
+        np.sin(angles, out=block[:, 1])
+        block[:, 0] *= ranges
+        block[:, 1] *= ranges
+        block[:, 2] -= 0.5
+        block[:, 2] *= 2 * self.ground_roughness
+
+    def _fill_box(self, block, box_min, box_size):
+        """Returns on the walls and roof of one box"""
+        n = len(block)
+        self.rng.random(dtype=np.float32, out=block)
+        block *= box_size
+        block += box_min
+
+        # Snap each point onto one face: x-, x+, y-, y+ walls or the roof
+        wall_x = box_size[1] * box_size[2]
+        wall_y = box_size[0] * box_size[2]
+        roof = box_size[0] * box_size[1]
+        areas = np.array([wall_x, wall_x, wall_y, wall_y, roof], dtype=np.float64)
+        face = self.rng.choice(5, size=n, p=areas / areas.sum())
+        axis = np.array([0, 0, 1, 1, 2])[face]
+        side = np.array([0, 1, 0, 1, 1], dtype=np.float32)[face]
+        block[np.arange(n), axis] = box_min[axis] + side * box_size[axis]
+
+    def scan(self):
+        """Generate one scan in place; returns the (n_points, 3) buffer
+
+        The buffer is overwritten by the next scan, copy it to keep a scan.
+        """
+        self._fill_ground(self.points[:self.n_ground])
+
+        start = self.n_ground
+        box = 0
+        for structure, n_points in zip(self.structures, self.structure_points):
+            # Split this structure type's points evenly between its boxes
+            bounds = np.linspace(start, start + n_points, structure.count + 1).astype(int)
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                self._fill_box(self.points[lo:hi], self.box_min[box], self.box_size[box])
+                box += 1
+            start += n_points
+        return self.points
+
+# -----------------------------------------------------
+# Downsampling
+# -----------------------------------------------------
+
+def random_downsample(points, max_points, rng=None):
+    """Uniform random subset of at most max_points rows"""
+    if len(points) <= max_points:
+        return points
+    rng = rng if rng is not None else np.random.default_rng()
+    idx = rng.choice(len(points), size=max_points, replace=False)
+    idx.sort()
+    return points[idx]
+
+
+def voxel_downsample(points, voxel_size):
+    """Centroid of the points in each occupied voxel_size cube"""
+    if len(points) == 0:
+        return points
+    cells = np.floor((points - points.min(axis=0)) / voxel_size).astype(np.int64)
+    dims = cells.max(axis=0) + 1
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+
+    out = np.empty((len(counts), 3), dtype=points.dtype)
+    for axis in range(3):
+        out[:, axis] = np.bincount(inverse, weights=points[:, axis]) / counts
+    return out
+
+
+def display_sample(points, max_points=2000, voxel_size=0.5, oversample=25, rng=None):
+    """Structure-preserving subset for plotting: voxel grid, then random cap
+
+    Very large scans are first thinned at random to oversample * max_points so
+    the voxel pass (a sort) stays cheap; voxels still even out point density.
+    """
+    points = random_downsample(points, max_points * oversample, rng=rng)
+    return random_downsample(voxel_downsample(points, voxel_size), max_points, rng=rng)
+
+# -----------------------------------------------------
+# Ground Segmentation and Obstacle Clustering
+# -----------------------------------------------------
+
+# One row per obstacle cluster (sensor frame, meters)
+OBSTACLE_DTYPE = np.dtype([
+    ('min', np.float32, (3,)),
+    ('max', np.float32, (3,)),
+    ('centroid', np.float32, (3,)),
+    ('height', np.float32),  # above the ground plane
+    ('range', np.float32),   # horizontal distance to the centroid
+    ('n_points', np.int32)
+])
+
+
+def fit_ground_plane(points, threshold=0.2, iterations=64, sample_size=4096,
+                     max_tilt=15.0, rng=None):
+    """RANSAC plane (a, b, c, d) with c > 0, all hypotheses scored in one pass
+
+    Hypotheses are scored on a random sample of the cloud, then the winner is
+    refined by least squares on its inliers from the full cloud.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    sample = points[rng.integers(0, len(points), min(sample_size, len(points)))].astype(np.float64)
+
+    # (iterations, 3) triplets -> plane normals
+    tri = sample[rng.integers(0, len(sample), (iterations, 3))]
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    norms = np.linalg.norm(normals, axis=1)
+    norms[norms == 0] = np.inf
+    normals /= norms[:, None]
+    normals *= np.where(normals[:, 2:3] < 0, -1.0, 1.0)
+    offsets = -np.einsum('ij,ij->i', normals, tri[:, 0])
+
+    # Near-horizontal planes only
+    scores = (np.abs(sample @ normals.T + offsets) < threshold).sum(axis=0)
+    scores[normals[:, 2] < np.cos(np.radians(max_tilt))] = -1
+    best = int(np.argmax(scores))
+    plane = np.r_[normals[best], offsets[best]]
+
+    # Least-squares refinement z = ax + by + c on the inliers
+    distances = points @ plane[:3].astype(np.float32) + np.float32(plane[3])
+    inliers = np.abs(distances) < threshold
+    if inliers.sum() >= 3:
+        ground = points[inliers]
+        design = np.c_[ground[:, :2], np.ones(len(ground), dtype=np.float32)]
+        (a, b, c), *_ = np.linalg.lstsq(design, ground[:, 2], rcond=None)
+        normal = np.array([-a, -b, 1.0])
+        scale = np.linalg.norm(normal)
+        plane = np.r_[normal, -c] / scale
+    return plane
+
+
+def cluster_obstacles(points, heights, cell_size=0.5, min_points=20, min_height=0.3):
+    """Euclidean clustering on an occupancy grid (8-connected cells) -> OBSTACLE_DTYPE"""
+    if len(points) == 0:
+        return np.zeros(0, dtype=OBSTACLE_DTYPE)
+
+    origin = points[:, :2].min(axis=0)
+    cells = ((points[:, :2] - origin) / cell_size).astype(np.int32)
+    width, height = cells.max(axis=0) + 1
+    flat = cells[:, 1] * width + cells[:, 0]
+
+    occupancy = (np.bincount(flat, minlength=width * height) > 0).astype(np.uint8)
+    n_labels, grid_labels = cv2.connectedComponents(occupancy.reshape(height, width), connectivity=8)
+    labels = grid_labels.ravel()[flat]
+
+    # Per-cluster reductions over label-sorted points
+    order = np.argsort(labels, kind='stable')
+    sorted_labels = labels[order]
+    starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]])
+    grouped = points[order]
+    counts = np.diff(np.r_[starts, len(points)])
+
+    out = np.empty(len(starts), dtype=OBSTACLE_DTYPE)
+    out['min'] = np.minimum.reduceat(grouped, starts, axis=0)
+    out['max'] = np.maximum.reduceat(grouped, starts, axis=0)
+    out['centroid'] = np.add.reduceat(grouped, starts, axis=0) / counts[:, None]
+    out['height'] = np.maximum.reduceat(heights[order], starts)
+    out['range'] = np.hypot(out['centroid'][:, 0], out['centroid'][:, 1])
+    out['n_points'] = counts
+
+    keep = (counts >= min_points) & (out['height'] >= min_height)
+    return out[keep]
+
+
+class ObstacleDetector:
+    def __init__(self, ground_threshold=0.2, iterations=64, sample_size=4096, cell_size=0.5,
+                 min_points=20, min_height=0.3, alert_range=15.0, rng=None):
+        """Remove the ground plane from a scan and cluster what stands on it"""
+        self.ground_threshold = ground_threshold  # meters from the plane counted as ground
+        self.iterations = iterations
+        self.sample_size = sample_size
+        self.cell_size = cell_size
+        self.min_points = min_points
+        self.min_height = min_height
+        self.alert_range = alert_range  # obstacles closer than this are potential threats
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        self.plane = None
+        self.ground_mask = None
+
+    def detect(self, points):
+        """OBSTACLE_DTYPE array for one (N, 3) scan"""
+        self.plane = fit_ground_plane(points, self.ground_threshold, self.iterations,
+                                      self.sample_size, rng=self.rng)
+        heights = points @ self.plane[:3].astype(np.float32) + np.float32(self.plane[3])
+        self.ground_mask = heights < self.ground_threshold
+        above = ~self.ground_mask
+        return cluster_obstacles(points[above], heights[above], self.cell_size,
+                                 self.min_points, self.min_height)
+
+    def to_detections(self, obstacles):
+        """Detection records for the threat picture; bbox is the ground footprint in meters"""
+        detections = []
+        for obstacle in obstacles:
+            near = obstacle['range'] < self.alert_range
+            x1, y1 = obstacle['min'][:2].tolist()
+            x2, y2 = obstacle['max'][:2].tolist()
+            detections.append(Detection(
+                f"OBSTACLE ({obstacle['height']:.1f}m)",
+                min(1.0, int(obstacle['n_points']) / 200.0),
+                [round(x1, 2), round(y1, 2), round(x2, 2), round(y2, 2)],
+                type='lidar',
+                status='OBSTACLE',
+                threat_level=THREAT_LEVEL_NAMES[LEVEL_POTENTIAL] if near else None,
+                original_class='lidar_obstacle'
+            ))
+        return detections
@@ -0,0 +1,347 @@
+import time
+
+import numpy as np
+
+# -----------------------------------------------------
+# Radar Contact Codes
+# -----------------------------------------------------
+
+TYPE_NONE = 0
+TYPE_PERSONNEL = 1
+TYPE_VEHICLE = 2
+TYPE_AIRCRAFT = 3
+TYPE_NAMES = np.array(['NONE', 'PERSONNEL', 'VEHICLE', 'AIRCRAFT'])
+
+PRIORITY_NONE = 0
+PRIORITY_LOW = 1
+PRIORITY_MEDIUM = 2
+PRIORITY_HIGH = 3
+PRIORITY_NAMES = np.array(['NONE', 'LOW', 'MEDIUM', 'HIGH'])
+
+# One row per radar return
+CONTACT_DTYPE = np.dtype([
+    ('id', np.int64),
+    ('bearing', np.float32),
+    ('range', np.float32),
+    ('type', np.uint8),
+    ('priority', np.uint8),
+    ('rcs', np.float32)
+])
+
+
+class RadarBand:
+    def __init__(self, threshold, contact_type, priority, min_range, max_range, rcs=0.0):
+        """Contact class; its share of the scene is the gap to the next band's threshold"""
+        self.threshold = threshold
+        self.contact_type = contact_type
+        self.priority = priority
+        self.min_range = min_range
+        self.max_range = max_range
+        self.rcs = rcs
+
+# -----------------------------------------------------
+# Columnar Sweep Result
+# -----------------------------------------------------
+
+class RadarSweep:
+    def __init__(self, bearings, ranges, types, priorities, rcs, radar_range, ids=None):
+        """One full sweep as parallel arrays (bearing, range, type, priority, rcs)"""
+        self.ids = ids if ids is not None else np.arange(len(bearings))
+        self.bearings = bearings
+        self.ranges = ranges
+        self.types = types
+        self.priorities = priorities
+        self.rcs = rcs
+        self.radar_range = radar_range
+
+    @property
+    def targets(self):
+        """Mask of bearings with a return of any type"""
+        return self.types != TYPE_NONE
+
+    @property
+    def in_range(self):
+        """Mask of returns inside the displayed radar range"""
+        return self.ranges < self.radar_range
+
+    def priority_mask(self, priority):
+        return self.priorities == priority
+
+    def target_count(self):
+        return int(np.count_nonzero(self.targets))
+
+    def contacts(self, mask=None):
+        """Structured CONTACT_DTYPE array of the targets (optionally further masked)"""
+        mask = self.targets if mask is None else (mask & self.targets)
+        out = np.empty(int(np.count_nonzero(mask)), dtype=CONTACT_DTYPE)
+        out['id'] = self.ids[mask]
+        out['bearing'] = self.bearings[mask]
+        out['range'] = self.ranges[mask]
+        out['type'] = self.types[mask]
+        out['priority'] = self.priorities[mask]
+        out['rcs'] = self.rcs[mask]
+        return out
+
+# -----------------------------------------------------
+# Persistent Radar Scene (kinematic contacts)
+# -----------------------------------------------------
+
+# Speed range (m/s) per contact type
+SPEEDS = {
+    TYPE_PERSONNEL: (0.5, 2.0),
+    TYPE_VEHICLE: (5.0, 25.0),
+    TYPE_AIRCRAFT: (60.0, 250.0)
+}
+
+
+def polar_to_xy(ranges, bearings):
+    """Bearing in degrees clockwise from north -> east/north meters"""
+    theta = np.radians(bearings)
+    return ranges * np.sin(theta), ranges * np.cos(theta)
+
+
+def xy_to_polar(x, y):
+    return np.hypot(x, y), np.degrees(np.arctan2(x, y)) % 360.0
+
+
+class RadarScene:
+    def __init__(self, bands, n_contacts, rng=None, detection_probability=0.9,
+                 range_noise=5.0, bearing_noise=0.3, turn_rate=5.0):
+        """Contacts that persist and move between sweeps; departures are replaced"""
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.detection_probability = detection_probability
+        self.range_noise = range_noise      # meters (1 sigma)
+        self.bearing_noise = bearing_noise  # degrees (1 sigma)
+        self.turn_rate = turn_rate          # degrees/s heading jitter
+
+        # Contact mix from the band thresholds
+        bands = sorted(bands, key=lambda band: band.threshold)
+        edges = np.r_[[band.threshold for band in bands], 1.0]
+        self.band_weights = np.diff(edges) / (1.0 - edges[0])
+        self.band_types = np.array([band.contact_type for band in bands], dtype=np.uint8)
+        self.band_priorities = np.array([band.priority for band in bands], dtype=np.uint8)
+        self.band_min = np.array([band.min_range for band in bands])
+        self.band_max = np.array([band.max_range for band in bands])
+        self.band_rcs = np.array([band.rcs for band in bands], dtype=np.float32)
+        self.max_range = float(self.band_max.max())
+
+        n = n_contacts
+        self.ids = np.zeros(n, dtype=np.int64)
+        self.types = np.zeros(n, dtype=np.uint8)
+        self.priorities = np.zeros(n, dtype=np.uint8)
+        self.rcs = np.zeros(n, dtype=np.float32)
+        self.x = np.zeros(n)
+        self.y = np.zeros(n)
+        self.heading = np.zeros(n)
+        self.speed = np.zeros(n)
+        self.next_id = 1
+        self._spawn(np.arange(n))
+
+    def _spawn(self, idx):
+        """(Re)place contacts at idx with fresh IDs, positions and velocities"""
+        k = len(idx)
+        if k == 0:
+            return
+        band = self.rng.choice(len(self.band_weights), size=k, p=self.band_weights)
+        ranges = self.rng.uniform(self.band_min[band], self.band_max[band])
+        bearings = self.rng.uniform(0, 360, k)
+
+        self.ids[idx] = np.arange(self.next_id, self.next_id + k)
+        self.next_id += k
+        self.types[idx] = self.band_types[band]
+        self.priorities[idx] = self.band_priorities[band]
+        self.rcs[idx] = self.band_rcs[band]
+        self.x[idx], self.y[idx] = polar_to_xy(ranges, bearings)
+        self.heading[idx] = self.rng.uniform(0, 360, k)
+
+        speeds = np.empty(k)
+        for contact_type, (low, high) in SPEEDS.items():
+            mask = self.types[idx] == contact_type
+            speeds[mask] = self.rng.uniform(low, high, int(mask.sum()))
+        self.speed[idx] = speeds
+
+    def advance(self, dt):
+        """Move every contact dt seconds along its (slowly wandering) heading"""
+        if dt <= 0:
+            return
+        n = len(self.ids)
+        self.heading += self.rng.normal(0, self.turn_rate * np.sqrt(dt), n)
+        dx, dy = polar_to_xy(self.speed * dt, self.heading)
+        self.x += dx
+        self.y += dy
+
+        # Contacts leaving coverage are replaced by new ones
+        gone = np.flatnonzero(np.hypot(self.x, self.y) > self.max_range)
+        self._spawn(gone)
+
+    def observe(self):
+        """Noisy returns for this sweep: (ids, ranges, bearings, types, priorities, rcs)"""
+        seen = self.rng.random(len(self.ids)) < self.detection_probability
+        k = int(seen.sum())
+        ranges, bearings = xy_to_polar(self.x[seen], self.y[seen])
+        ranges = np.maximum(ranges + self.rng.normal(0, self.range_noise, k), 0.0)
+        bearings = (bearings + self.rng.normal(0, self.bearing_noise, k)) % 360.0
+        return (self.ids[seen], ranges, bearings,
+                self.types[seen], self.priorities[seen], self.rcs[seen])
+
+# -----------------------------------------------------
+# Incremental Alpha-Beta Track Manager
+# -----------------------------------------------------
+
+class RadarTrackDelta:
+    def __init__(self, updated, removed):
+        """Tracks that moved/appeared since last published, and IDs that were dropped"""
+        self.updated = updated  # CONTACT_DTYPE array
+        self.removed = removed  # contact IDs
+
+    def __len__(self):
+        return len(self.updated) + len(self.removed)
+
+
+class RadarTrackManager:
+    def __init__(self, alpha=0.5, beta=0.1, max_coast=3.0, change_threshold=20.0, capacity=1024):
+        """Alpha-beta tracks keyed by contact ID, updated only where returns arrive"""
+        self.alpha = alpha
+        self.beta = beta
+        self.max_coast = max_coast                # seconds without a return before a track drops
+        self.change_threshold = change_threshold  # meters moved before a track is re-published
+
+        self.slot_of = np.full(capacity, -1, dtype=np.int64)  # contact ID -> slot
+        self._allocate(capacity)
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def _allocate(self, capacity):
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.last_update = np.zeros(capacity)
+        self.types = np.zeros(capacity, dtype=np.uint8)
+        self.priorities = np.zeros(capacity, dtype=np.uint8)
+        self.rcs = np.zeros(capacity, dtype=np.float32)
+        self.published_x = np.zeros(capacity)
+        self.published_y = np.zeros(capacity)
+        self.published = np.zeros(capacity, dtype=bool)
+
+    def _grow(self):
+        old = len(self.ids)
+        arrays = {name: getattr(self, name) for name in (
+            'ids', 'active', 'x', 'y', 'vx', 'vy', 'last_update', 'types', 'priorities',
+            'rcs', 'published_x', 'published_y', 'published')}
+        self._allocate(old * 2)
+        for name, values in arrays.items():
+            getattr(self, name)[:old] = values
+        self.free.extend(range(old * 2 - 1, old - 1, -1))
+
+    def _slots_for(self, ids):
+        """Slots for contact IDs, allocating slots for unseen IDs; returns (slots, is_new)"""
+        if len(ids) and ids.max() >= len(self.slot_of):
+            grown = np.full(max(len(self.slot_of) * 2, int(ids.max()) + 1), -1, dtype=np.int64)
+            grown[:len(self.slot_of)] = self.slot_of
+            self.slot_of = grown
+        slots = self.slot_of[ids]
+        is_new = slots < 0
+        for i in np.flatnonzero(is_new).tolist():
+            if not self.free:
+                self._grow()
+            slot = self.free.pop()
+            slots[i] = slot
+            self.slot_of[ids[i]] = slot
+        return slots, is_new
+
+    def update(self, now, ids, ranges, bearings, types, priorities, rcs):
+        """Apply one sweep of returns; returns a RadarTrackDelta"""
+        slots, is_new = self._slots_for(ids)
+        mx, my = polar_to_xy(ranges, bearings)
+
+        # New tracks start at the measurement with zero velocity
+        new = slots[is_new]
+        self.ids[new] = ids[is_new]
+        self.active[new] = True
+        self.x[new], self.y[new] = mx[is_new], my[is_new]
+        self.vx[new] = self.vy[new] = 0.0
+        self.published[new] = False
+        self.types[new] = types[is_new]
+        self.priorities[new] = priorities[is_new]
+        self.rcs[new] = rcs[is_new]
+
+        # Existing tracks: predict to now, then alpha-beta correct (only measured slots)
+        old = slots[~is_new]
+        if len(old):
+            dt = np.maximum(now - self.last_update[old], 1e-3)
+            px = self.x[old] + self.vx[old] * dt
+            py = self.y[old] + self.vy[old] * dt
+            rx = mx[~is_new] - px
+            ry = my[~is_new] - py
+            self.x[old] = px + self.alpha * rx
+            self.y[old] = py + self.alpha * ry
+            self.vx[old] += (self.beta / dt) * rx
+            self.vy[old] += (self.beta / dt) * ry
+        self.last_update[slots] = now
+
+        # Drop tracks that have coasted too long
+        stale = np.flatnonzero(self.active & (now - self.last_update > self.max_coast))
+        removed = self.ids[stale].copy()
+        self.active[stale] = False
+        self.slot_of[removed] = -1
+        self.free.extend(stale.tolist())
+
+        # Publish only tracks that are new or moved more than change_threshold
+        moved = np.hypot(self.x[slots] - self.published_x[slots],
+                         self.y[slots] - self.published_y[slots]) > self.change_threshold
+        changed = slots[~self.published[slots] | moved]
+        self.published_x[changed] = self.x[changed]
+        self.published_y[changed] = self.y[changed]
+        self.published[changed] = True
+
+        return RadarTrackDelta(self._contacts(changed), removed)
+
+    def _contacts(self, slots):
+        out = np.empty(len(slots), dtype=CONTACT_DTYPE)
+        ranges, bearings = xy_to_polar(self.x[slots], self.y[slots])
+        out['id'] = self.ids[slots]
+        out['bearing'] = bearings
+        out['range'] = ranges
+        out['type'] = self.types[slots]
+        out['priority'] = self.priorities[slots]
+        out['rcs'] = self.rcs[slots]
+        return out
+
+    def track_count(self):
+        return int(np.count_nonzero(self.active))
+
+    def sweep(self, radar_range):
+        """All active tracks as a RadarSweep for display"""
+        slots = np.flatnonzero(self.active)
+        contacts = self._contacts(slots)
+        return RadarSweep(contacts['bearing'], contacts['range'], contacts['type'],
+                          contacts['priority'], contacts['rcs'], radar_range, ids=contacts['id'])
+
+# -----------------------------------------------------
+# Scene + Tracks, Stepped by Wall Clock
+# -----------------------------------------------------
+
+class RadarSimulator:
+    def __init__(self, bands, n_contacts, radar_range, rng=None, **track_args):
+        """Persistent scene observed each sweep and fed to the track manager"""
+        self.radar_range = radar_range
+        self.scene = RadarScene(bands, n_contacts, rng=rng)
+        self.tracks = RadarTrackManager(**track_args)
+        self.delta = None  # tracks changed by the last sweep
+        self.last_sweep = None
+
+    def step(self, now=None):
+        """Advance the scene to now and update tracks; returns the RadarTrackDelta"""
+        now = time.time() if now is None else now
+        if self.last_sweep is not None:
+            self.scene.advance(now - self.last_sweep)
+        self.last_sweep = now
+        self.delta = self.tracks.update(now, *self.scene.observe())
+        return self.delta
+
+    def sweep(self, now=None):
+        """step() and return all tracks as a RadarSweep"""
+        self.step(now)
+        return self.tracks.sweep(self.radar_range)
@@ -0,0 +1,133 @@
+import math
+import time
+
+import cv2
+
+# -----------------------------------------------------
+# Adaptive Detection Scheduler
+# -----------------------------------------------------
+
+DETECT = 'detect'  # full-frame YOLO
+ROI = 'roi'        # YOLO on the motion region only
+SKIP = 'skip'      # trackers predict, no YOLO
+
+
+class AdaptiveScheduler:
+    def __init__(self, target_fps=15, max_interval=5, motion_threshold=0.01,
+                 roi_max_fraction=0.35, roi_margin=0.25, motion_width=160, smoothing=0.2):
+        """Decide per frame whether to run YOLO, run it on a motion crop, or skip"""
+        self.target_fps = target_fps
+        self.max_interval = max_interval          # frames between forced full detections
+        self.motion_threshold = motion_threshold  # fraction of changed pixels that counts as motion
+        self.roi_max_fraction = roi_max_fraction  # larger motion areas get a full-frame run
+        self.roi_margin = roi_margin
+        self.motion_width = motion_width
+        self.smoothing = smoothing
+
+        self.prev_small = None
+        self.frames_since_detect = 0
+        self.roi = None
+
+        # Measured inference latency (seconds) per decision type
+        self.latency = {DETECT: None, ROI: None}
+
+        # Metrics
+        self.decisions = {DETECT: 0, ROI: 0, SKIP: 0}
+        self.last_decision = None
+        self.last_reason = None
+        self.motion_score = 0.0
+        self.roi_fraction = 0.0
+        self.started = time.perf_counter()
+
+    def measure_motion(self, frame):
+        """Changed-pixel fraction and motion bounding box from a downsampled difference"""
+        height, width = frame.shape[:2]
+        scale = self.motion_width / width
+        small = cv2.resize(frame, (self.motion_width, max(1, int(height * scale))),
+                           interpolation=cv2.INTER_AREA)
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        small = cv2.GaussianBlur(small, (5, 5), 0)
+
+        prev, self.prev_small = self.prev_small, small
+        if prev is None or prev.shape != small.shape:
+            return 1.0, None
+
+        diff = cv2.absdiff(small, prev)
+        _, mask = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)
+        score = cv2.countNonZero(mask) / mask.size
+        if score == 0:
+            return 0.0, None
+
+        # Motion box back in full-frame pixels, padded by roi_margin
+        x, y, w, h = cv2.boundingRect(mask)
+        pad_x, pad_y = w * self.roi_margin, h * self.roi_margin
+        x1 = max(0, int((x - pad_x) / scale))
+        y1 = max(0, int((y - pad_y) / scale))
+        x2 = min(width, int(math.ceil((x + w + pad_x) / scale)))
+        y2 = min(height, int(math.ceil((y + h + pad_y) / scale)))
+        return score, (x1, y1, x2, y2)
+
+    def min_interval(self, decision):
+        """Frames one inference of this kind must be spread over to hold target_fps"""
+        latency = self.latency[decision]
+        if latency is None:
+            return 1
+        return max(1, math.ceil(latency * self.target_fps))
+
+    def decide(self, frame):
+        """Return DETECT, ROI or SKIP for this frame (ROI box in self.roi)"""
+        self.frames_since_detect += 1
+        self.motion_score, motion_box = self.measure_motion(frame)
+        height, width = frame.shape[:2]
+        self.roi = None
+        self.roi_fraction = 0.0
+        if motion_box is not None:
+            x1, y1, x2, y2 = motion_box
+            self.roi_fraction = (x2 - x1) * (y2 - y1) / float(width * height)
+
+        if self.frames_since_detect >= max(self.max_interval, self.min_interval(DETECT)):
+            decision, reason = DETECT, 'refresh'
+        elif self.motion_score < self.motion_threshold:
+            decision, reason = SKIP, 'static'
+        elif motion_box is not None and self.roi_fraction <= self.roi_max_fraction:
+            if self.frames_since_detect < self.min_interval(ROI):
+                decision, reason = SKIP, 'budget'
+            else:
+                decision, reason = ROI, 'motion'
+                self.roi = motion_box
+        elif self.frames_since_detect < self.min_interval(DETECT):
+            decision, reason = SKIP, 'budget'
+        else:
+            decision, reason = DETECT, 'motion'
+
+        if decision != SKIP:
+            self.frames_since_detect = 0
+        self.decisions[decision] += 1
+        self.last_decision = decision
+        self.last_reason = reason
+        return decision
+
+    def record_inference(self, decision, seconds):
+        """Feed back how long the last YOLO run took"""
+        current = self.latency[decision]
+        if current is None:
+            self.latency[decision] = seconds
+        else:
+            self.latency[decision] = current + self.smoothing * (seconds - current)
+
+    def get_metrics(self):
+        """Decision counts, motion and latency figures for the UI"""
+        total = sum(self.decisions.values())
+        elapsed = max(time.perf_counter() - self.started, 1e-6)
+        ran = self.decisions[DETECT] + self.decisions[ROI]
+        return {
+            'decisions': dict(self.decisions),
+            'last_decision': self.last_decision,
+            'last_reason': self.last_reason,
+            'motion_score': self.motion_score,
+            'roi_fraction': self.roi_fraction,
+            'detect_latency_ms': (self.latency[DETECT] or 0.0) * 1000.0,
+            'roi_latency_ms': (self.latency[ROI] or 0.0) * 1000.0,
+            'inference_ratio': ran / total if total else 0.0,
+            'inference_fps': ran / elapsed
+        }
@@ -0,0 +1,317 @@
+import http.server
+import json
+import math
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from urllib.parse import parse_qs, urlparse
+
+import folium
+from folium.plugins import Realtime
+from folium.utilities import JsCode
+
+# -----------------------------------------------------
+# Incremental Tactical Map
+# -----------------------------------------------------
+
+METERS_PER_DEGREE = 111320.0
+
+# Marker color per entity status
+STATUS_COLORS = {
+    'PLATFORM': 'blue',
+    'DANGER': 'red',
+    'SAFE': 'green',
+    'IMMEDIATE_THREAT': 'darkred',
+    'POTENTIAL_THREAT': 'orange'
+}
+
+
+def ground_distance(lat1, lon1, lat2, lon2):
+    """Approximate distance in meters (equirectangular, fine at map scale)"""
+    dy = (lat2 - lat1) * METERS_PER_DEGREE
+    dx = (lon2 - lon1) * METERS_PER_DEGREE * math.cos(math.radians((lat1 + lat2) * 0.5))
+    return math.hypot(dx, dy)
+
+
+def point_feature(feature_id, lat, lon, **properties):
+    """GeoJSON Point feature (coordinates are lon, lat)"""
+    properties.setdefault('color', STATUS_COLORS.get(properties.get('status'), 'gray'))
+    return {
+        'type': 'Feature',
+        'id': feature_id,
+        'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+        'properties': properties
+    }
+
+
+def line_feature(feature_id, latlons, **properties):
+    """GeoJSON LineString feature from an (N, 2) lat/lon array"""
+    properties.setdefault('color', STATUS_COLORS.get(properties.get('status'), 'gray'))
+    return {
+        'type': 'Feature',
+        'id': feature_id,
+        'geometry': {'type': 'LineString', 'coordinates': [[lon, lat] for lat, lon in latlons]},
+        'properties': properties
+    }
+
+
+class MapDelta:
+    def __init__(self, upserts, removed):
+        """Features added or changed since the last update, and IDs that disappeared"""
+        self.upserts = upserts
+        self.removed = removed
+
+    def __len__(self):
+        return len(self.upserts) + len(self.removed)
+
+    def to_geojson(self):
+        return {'type': 'FeatureCollection', 'features': self.upserts, 'removed': self.removed}
+
+
+class TacticalMapLayer:
+    def __init__(self, lat, lon, zoom=18, refresh_interval=2.0, min_move=1.0, history=64):
+        """Base map built once; entities kept as GeoJSON features keyed by track ID"""
+        self.refresh_interval = refresh_interval  # seconds between map refreshes
+        self.min_move = min_move                  # meters an entity must move to be re-sent
+        self.map = self._build_base_map(lat, lon, zoom)
+        self.features = {}
+        self.accuracy = 0.0
+        self.last_refresh = 0.0
+        self.refreshes = 0
+        self.version = 0                        # bumped by every non-empty delta
+        self.history = deque(maxlen=history)    # (version, MapDelta) for changes_since()
+        self.lock = threading.Lock()            # update() vs. the feed server thread
+        self.realtime = None
+
+    @staticmethod
+    def _build_base_map(lat, lon, zoom):
+        m = folium.Map(location=[lat, lon], zoom_start=zoom, tiles='OpenStreetMap')
+        folium.TileLayer(
+            tiles='https://mt1.google.com/vt/lyrs=s&x={x}&y={y}&z={z}',
+            attr='Google Satellite',
+            name='Satellite View',
+            overlay=False,
+            control=True
+        ).add_to(m)
+        folium.LayerControl().add_to(m)
+        return m
+
+    def due(self, now=None):
+        """True when the map should refresh (independent of the video frame rate)"""
+        now = time.time() if now is None else now
+        return now - self.last_refresh >= self.refresh_interval
+
+    def entity_features(self, gps_data, persons=(), threats=(), trail=None):
+        """Current features: the platform, its trail and every located person and threat"""
+        lat, lon = gps_data['latitude'], gps_data['longitude']
+        features = {
+            'platform': point_feature(
+                'platform', lat, lon, name='Military Base Position', status='PLATFORM',
+                details=f"Alt {gps_data['altitude']:.1f}m, {gps_data['satellites']} satellites"),
+            'accuracy': point_feature(
+                'accuracy', lat, lon, name='GPS Accuracy', status='PLATFORM',
+                details=f"{gps_data['accuracy']}m", radius=gps_data['accuracy'])
+        }
+        if trail is not None and len(trail) >= 2:
+            features['trail'] = line_feature('trail', trail, name='Platform Trail', status='PLATFORM',
+                                             details=f"{len(trail)} points")
+        for kind, entities in (('person', persons), ('threat', threats)):
+            for i, entity in enumerate(entities):
+                offset = entity.get('gps_offset')
+                if offset is None:
+                    continue
+                track_id = entity.get('track_id')
+                feature_id = f"{kind}-{track_id}" if track_id is not None else f"{kind}-n{i}"
+                status = entity.get('status') if kind == 'person' else entity.get('threat_level')
+                features[feature_id] = point_feature(
+                    feature_id, lat + offset['lat_offset'], lon + offset['lon_offset'],
+                    name=entity['name'], status=status,
+                    details=f"Confidence {entity['confidence']:.2f}, "
+                            f"{len(entity.get('nearby_threats', []))} threats nearby")
+        return features
+
+    def update(self, gps_data, persons=(), threats=(), trail=None, now=None):
+        """Diff the current entities against the map; returns a MapDelta
+
+        trail is an optional (N, 2) lat/lon breadcrumb line for the platform.
+        """
+        self.last_refresh = time.time() if now is None else now
+        self.refreshes += 1
+        self.accuracy = gps_data['accuracy']
+
+        current = self.entity_features(gps_data, persons, threats, trail)
+        with self.lock:
+            delta = self._diff(current)
+            if len(delta):
+                self.version += 1
+                self.history.append((self.version, delta))
+        return delta
+
+    def _diff(self, current):
+        upserts = []
+        for feature_id, feature in current.items():
+            previous = self.features.get(feature_id)
+            if previous is not None and previous['properties'] == feature['properties']:
+                if feature['geometry']['type'] != 'Point':
+                    if previous['geometry'] == feature['geometry']:
+                        continue
+                else:
+                    (lon1, lat1) = previous['geometry']['coordinates']
+                    (lon2, lat2) = feature['geometry']['coordinates']
+                    if ground_distance(lat1, lon1, lat2, lon2) < self.min_move:
+                        continue
+            self.features[feature_id] = feature
+            upserts.append(feature)
+
+        removed = [feature_id for feature_id in self.features if feature_id not in current]
+        for feature_id in removed:
+            del self.features[feature_id]
+        return MapDelta(upserts, removed)
+
+    def changes_since(self, version):
+        """Net changes after version, for a map that has applied everything up to it
+
+        A map too far behind (or ahead, after a restart) gets every feature
+        with reset=True and must drop what it has first.
+        """
+        with self.lock:
+            oldest = self.history[0][0] if self.history else self.version + 1
+            if version <= 0 or version > self.version or version < oldest - 1:
+                return {'version': self.version, 'reset': True,
+                        'upserts': list(self.features.values()), 'removed': []}
+            upserts, removed = {}, set()
+            for delta_version, delta in self.history:
+                if delta_version <= version:
+                    continue
+                for feature in delta.upserts:
+                    upserts[feature['id']] = feature
+                    removed.discard(feature['id'])
+                for feature_id in delta.removed:
+                    upserts.pop(feature_id, None)
+                    removed.add(feature_id)
+            return {'version': self.version, 'reset': False,
+                    'upserts': list(upserts.values()), 'removed': sorted(removed)}
+
+    def attach_feed(self, url):
+        """Add a layer that polls a MapFeedServer and applies only the changes
+
+        The base map is rendered once (stable st_folium key); afterwards the
+        browser fetches deltas itself every refresh_interval, so markers move
+        without re-sending or remounting the map.
+        """
+        if self.realtime is not None:
+            return self.realtime
+        self.realtime = Realtime(
+            {'type': 'FeatureCollection', 'features': []},  # replaced below, once the JS name is known
+            interval=int(self.refresh_interval * 1000),
+            get_feature_id=JsCode("function(feature) { return feature.id; }"),
+            point_to_layer=JsCode(_POINT_TO_LAYER),
+            style=JsCode("function(feature) { return {color: feature.properties.color, weight: 3}; }"),
+            on_each_feature=JsCode(_ON_EACH_FEATURE),
+        )
+        self.realtime.src = JsCode(_FEED_SOURCE.replace('REALTIME', self.realtime.get_name())
+                                   .replace('FEED_URL', json.dumps(url)))
+        self.realtime.add_to(self.map)
+        return self.realtime
+
+
+# Leaflet.Realtime source: fetch the changes since the version this map has applied,
+# drop removed (and changed, to restyle them) features, then hand over the upserts
+_FEED_SOURCE = """function(success, error) {
+    var realtime = REALTIME;
+    fetch(FEED_URL + '?since=' + (realtime.feedVersion || 0))
+        .then(function(response) { return response.json(); })
+        .then(function(delta) {
+            var layers = realtime._featureLayers || {};
+            var stale = delta.reset ? Object.keys(layers) : delta.removed;
+            stale = stale.concat(delta.upserts.map(function(feature) { return feature.id; }));
+            realtime.remove(stale.filter(function(id) { return id in layers; }).map(function(id) {
+                return {type: 'Feature', id: id, properties: {}, geometry: null};
+            }));
+            realtime.feedVersion = delta.version;
+            success({type: 'FeatureCollection', features: delta.upserts});
+        })
+        .catch(function(e) {
+            console.warn('Tactical map feed ' + FEED_URL + ' unreachable from this browser', e);
+            error(e);
+        });
+}"""
+
+_POINT_TO_LAYER = """function(feature, latlng) {
+    var p = feature.properties;
+    if (p.radius !== undefined) {
+        return L.circle(latlng, {radius: p.radius, color: 'blue', fillColor: 'lightblue', fillOpacity: 0.2});
+    }
+    return L.circleMarker(latlng, {radius: 7, color: p.color, fillColor: p.color, fillOpacity: 0.9, weight: 3});
+}"""
+
+_ON_EACH_FEATURE = """function(feature, layer) {
+    var p = feature.properties;
+    layer.bindPopup(p.name + '<br>' + (p.status || '') + '<br>' + (p.details || ''));
+}"""
+
+
+class _MapFeedHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.strip('/') != 'entities':
+            self.send_error(404)
+            return
+        try:
+            since = int(parse_qs(url.query).get('since', ['0'])[0])
+        except ValueError:
+            since = 0
+        body = json.dumps(self.server.layer.changes_since(since), separators=(',', ':')).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')  # the map lives in a component iframe
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class MapFeedServer:
+    def __init__(self, layer, host='127.0.0.1', port=8555, public_url=None):
+        """Serve layer.changes_since(N) as JSON at http://host:port/entities?since=N
+
+        The map polls the feed from the viewer's browser, so url must be reachable
+        from there: bind host to an external interface (e.g. 0.0.0.0) and give the
+        address viewers use as public_url ("{port}" is replaced by the bound port).
+        """
+        self.httpd = _ThreadingServer((host, port), _MapFeedHandler)
+        self.httpd.layer = layer
+        self.public_url = public_url
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        if self.public_url:
+            return self.public_url.format(port=port)
+        if host in ('0.0.0.0', '::'):
+            host = socket.getfqdn()
+        return f"http://{host}:{port}/entities"
+
+    @property
+    def local_only(self):
+        """True when only a browser on this machine can reach the feed"""
+        return not self.public_url and self.httpd.server_address[0].startswith('127.')
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
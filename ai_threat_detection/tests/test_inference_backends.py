@@ -0,0 +1,40 @@
+"""Exported backends must accept batches (run from ai_threat_detection/: python -m unittest discover tests)"""
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HAVE_ULTRALYTICS = importlib.util.find_spec('ultralytics') is not None
+HAVE_OPENVINO = importlib.util.find_spec('openvino') is not None
+
+
+@unittest.skipUnless(HAVE_ULTRALYTICS, "ultralytics is not installed")
+class ExportArgsTests(unittest.TestCase):
+    def test_openvino_exports_keep_a_dynamic_batch(self):
+        from inference_backends import OnnxRuntimeBackend, OpenVINOBackend, OpenVINOInt8Backend
+
+        for backend in (OnnxRuntimeBackend, OpenVINOBackend, OpenVINOInt8Backend):
+            self.assertTrue(backend.export_args.get('dynamic'), backend.name)
+        self.assertEqual(OpenVINOInt8Backend.export_args, {'half': False, 'dynamic': True, 'int8': True})
+
+
+@unittest.skipUnless(HAVE_ULTRALYTICS and HAVE_OPENVINO, "ultralytics and openvino are required")
+class OpenVINOBatchTests(unittest.TestCase):
+    def test_batch_predict(self):
+        from inference_backends import OpenVINOBackend
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            backend = OpenVINOBackend('yolov8n.pt', imgsz=320, cache_dir=cache_dir)
+            model = backend.load()
+            frames = [np.zeros((240, 320, 3), dtype=np.uint8) for _ in range(4)]
+            results = model(frames, imgsz=320, verbose=False)
+            self.assertEqual(len(results), len(frames))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from charts import RadarChart
+from radar import (CONTACT_DTYPE, RadarBand, RadarSimulator, RadarTrackDelta, PRIORITY_HIGH,
+                   PRIORITY_LOW, TYPE_PERSONNEL, TYPE_VEHICLE)
+
+
+class Placeholder:
+    def __init__(self):
+        self.sent = 0
+
+    def plotly_chart(self, figure, **kwargs):
+        self.sent += 1
+
+
+def simulator(n_contacts, seed):
+    return RadarSimulator([
+        RadarBand(0.6, TYPE_PERSONNEL, PRIORITY_LOW, 100, 2000),
+        RadarBand(0.98, TYPE_VEHICLE, PRIORITY_HIGH, 500, 8000)
+    ], n_contacts=n_contacts, radar_range=5000, rng=np.random.default_rng(seed))
+
+
+class RadarChartTests(unittest.TestCase):
+    def test_deltas_keep_the_chart_in_step_with_the_tracks(self):
+        radar = simulator(300, seed=0)
+        chart = RadarChart({}, radar_range=5000, refresh_interval=1.0)
+        placeholder = Placeholder()
+        for i in range(60):
+            chart.render(placeholder, radar.step(now=i * 0.5), now=i * 0.5)
+
+        tracked = radar.tracks.sweep(radar.radar_range).contacts()
+        self.assertEqual(sorted(chart.contacts['id'].tolist()), sorted(tracked['id'].tolist()))
+        self.assertEqual(placeholder.sent, chart.refreshes)
+        self.assertLessEqual(chart.refreshes, 30)  # at most once per refresh_interval
+        self.assertEqual(chart.figure.data[1].text, ('VEHICLE',) * chart.max_targets)
+
+    def test_no_redraw_without_changed_tracks(self):
+        radar = simulator(5, seed=1)
+        chart = RadarChart({}, refresh_interval=0.0)
+        placeholder = Placeholder()
+        self.assertTrue(chart.render(placeholder, radar.step(now=0.0), now=0.0))
+        empty = RadarTrackDelta(np.zeros(0, dtype=CONTACT_DTYPE), np.zeros(0, dtype=np.int64))
+        self.assertFalse(chart.render(placeholder, empty, now=1.0))
+        self.assertEqual(placeholder.sent, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
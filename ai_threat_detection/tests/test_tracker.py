@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detections import Detection
+from tracker import ByteTracker
+
+
+def person(x, confidence=0.9):
+    return Detection('PERSON', confidence, [x, 100, x + 50, 200], status='SAFE')
+
+
+class ByteTrackerTests(unittest.TestCase):
+    def run_detector(self, tracker, detections):
+        tracker.predict()
+        tracker.update(detections)
+        return detections
+
+    def skip_frames(self, tracker, frames):
+        predicted = []
+        for _ in range(frames):
+            tracker.predict()
+            predicted.append(tracker.predicted_detections())
+        return predicted
+
+    def test_missed_track_is_predicted_until_dropped(self):
+        tracker = ByteTracker(max_misses=3)
+        for x in range(100, 140, 10):  # moving right, detector every frame
+            track_id = self.run_detector(tracker, [person(x)])[0].track_id
+
+        # detector runs every 4th frame and misses the person from here on
+        for run in range(1, tracker.max_misses + 2):
+            self.run_detector(tracker, [])
+            frames = self.skip_frames(tracker, 3)
+            if run <= tracker.max_misses:
+                self.assertEqual([[d.track_id for d in frame] for frame in frames], [[track_id]] * 3, run)
+                self.assertEqual(len(tracker.coasting_tracks()), 1)
+                self.assertEqual(tracker.active_tracks(), [])
+            else:
+                self.assertEqual(frames, [[], [], []])
+
+    def test_coasting_track_keeps_moving_and_recovers_its_id(self):
+        tracker = ByteTracker()
+        for x in range(100, 140, 10):
+            track_id = self.run_detector(tracker, [person(x)])[0].track_id
+        self.run_detector(tracker, [])
+        boxes = [frame[0].bbox[0] for frame in self.skip_frames(tracker, 2)]
+        self.assertGreater(boxes[1], boxes[0])  # constant-velocity prediction
+        self.assertEqual(self.run_detector(tracker, [person(170)])[0].track_id, track_id)
+        self.assertEqual(tracker.predicted_detections(exclude={track_id}), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
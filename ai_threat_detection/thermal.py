@@ -0,0 +1,102 @@
+import cv2
+import numpy as np
+
+# -----------------------------------------------------
+# Persistent Thermal Field
+# -----------------------------------------------------
+
+class ThermalStats:
+    def __init__(self, mean, max, hotspots):
+        """Summary of the temperature field; hotspots are dicts in frame pixels"""
+        self.mean = mean
+        self.max = max
+        self.hotspots = hotspots
+
+    def __repr__(self):
+        return f"ThermalStats(mean={self.mean:.1f}, max={self.max:.1f}, hotspots={len(self.hotspots)})"
+
+
+class ThermalEngine:
+    def __init__(self, baseline=25.0, noise=5.0, body_temp=37.0, field_scale=0.25,
+                 cooling=0.15, heating=0.5, hotspot_temp=33.0, min_hotspot_cells=4,
+                 noise_pool=8, rng=None):
+        """Temperature field kept between frames and updated in place
+
+        The float32 field is held at field_scale of the frame resolution. Each
+        update relaxes it toward one of a few precomputed noisy backgrounds and
+        warms the person boxes toward body temperature, so no new random field
+        is drawn per frame.
+        """
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.baseline = baseline
+        self.noise = noise
+        self.body_temp = body_temp
+        self.field_scale = field_scale
+        self.cooling = cooling        # per-frame pull toward the background
+        self.heating = heating        # per-frame pull toward body temperature
+        self.hotspot_temp = hotspot_temp
+        self.min_hotspot_cells = min_hotspot_cells  # smaller warm blobs are noise
+        self.noise_pool = noise_pool
+
+        self.shape = None  # frame (height, width) the buffers were built for
+
+    def _allocate(self, frame_shape):
+        height, width = frame_shape[:2]
+        field_h = max(1, int(round(height * self.field_scale)))
+        field_w = max(1, int(round(width * self.field_scale)))
+        self.shape = (height, width)
+
+        backgrounds = self.rng.normal(self.baseline, self.noise, (self.noise_pool, field_h, field_w))
+        self.backgrounds = backgrounds.astype(np.float32)
+        self.field = self.backgrounds[0].copy()
+        self.hot_mask = np.empty((field_h, field_w), dtype=np.uint8)
+
+        # Display buffers at frame resolution
+        self.gray = np.empty((height, width), dtype=np.uint8)
+        self.thermal = np.empty((height, width, 3), dtype=np.uint8)
+
+    def update(self, frame_shape, person_boxes=()):
+        """Advance the field one frame with heat at the given xyxy frame boxes"""
+        if self.shape != tuple(frame_shape[:2]):
+            self._allocate(frame_shape)
+
+        # Relax toward a background drawn from the pool
+        background = self.backgrounds[self.rng.integers(self.noise_pool)]
+        cv2.addWeighted(self.field, 1.0 - self.cooling, background, self.cooling, 0.0, dst=self.field)
+
+        # Body heat over the torso (inner part of each person box)
+        field_h, field_w = self.field.shape
+        for x1, y1, x2, y2 in person_boxes:
+            inset = (x2 - x1) * 0.2
+            fx1 = max(0, int((x1 + inset) * self.field_scale))
+            fx2 = min(field_w, int((x2 - inset) * self.field_scale) + 1)
+            fy1 = max(0, int(y1 * self.field_scale))
+            fy2 = min(field_h, int(y2 * self.field_scale) + 1)
+            if fx2 <= fx1 or fy2 <= fy1:
+                continue
+            region = self.field[fy1:fy2, fx1:fx2]
+            region *= 1.0 - self.heating
+            region += self.heating * self.body_temp
+        return self.field
+
+    def stats(self):
+        """Mean, max and hotspot regions of the current field"""
+        mean = float(cv2.mean(self.field)[0])
+        _, max_temp, _, _ = cv2.minMaxLoc(self.field)
+
+        cv2.compare(self.field, self.hotspot_temp, cv2.CMP_GT, dst=self.hot_mask)
+        n, _, boxes, _ = cv2.connectedComponentsWithStats(self.hot_mask, connectivity=8)
+        inv = 1.0 / self.field_scale
+        hotspots = [
+            {'bbox': [int(x * inv), int(y * inv), int((x + w) * inv), int((y + h) * inv)],
+             'area': int(area * inv * inv)}
+            for x, y, w, h, area in boxes[1:n].tolist()
+            if area >= self.min_hotspot_cells
+        ]
+        return ThermalStats(mean, float(max_temp), hotspots)
+
+    def render(self, bgr_frame):
+        """JET-colormapped view of the frame; the returned buffer is reused next call"""
+        cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2GRAY, dst=self.gray)
+        cv2.applyColorMap(self.gray, cv2.COLORMAP_JET, dst=self.thermal)
+        return self.thermal
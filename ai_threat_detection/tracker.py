@@ -0,0 +1,237 @@
+import numpy as np
+
+from association import box_iou
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # scipy is optional; fall back to greedy IoU matching
+    linear_sum_assignment = None
+
+# -----------------------------------------------------
+# Constant-Velocity Kalman Filter for Boxes
+# -----------------------------------------------------
+
+class KalmanBoxFilter:
+    """Kalman filter over (cx, cy, w, h) with constant velocity, stepped once per frame"""
+
+    def __init__(self, std_position=1.0 / 20, std_velocity=1.0 / 160):
+        self.std_position = std_position
+        self.std_velocity = std_velocity
+
+        self.motion = np.eye(8)
+        self.motion[:4, 4:] = np.eye(4)
+        self.observation = np.eye(4, 8)
+
+    def initiate(self, measurement):
+        """New state from a (cx, cy, w, h) measurement"""
+        mean = np.r_[measurement, np.zeros(4)]
+        scale = np.r_[measurement[2:], measurement[2:]]
+        std = np.r_[2 * self.std_position * scale, 10 * self.std_velocity * scale]
+        return mean, np.diag(np.square(std))
+
+    def multi_predict(self, means, covariances):
+        """Advance a stack of (N, 8) states by one frame"""
+        scale = np.c_[means[:, 2:4], means[:, 2:4]]
+        std = np.c_[self.std_position * scale, self.std_velocity * scale]
+        noise = np.zeros((len(means), 8, 8))
+        idx = np.arange(8)
+        noise[:, idx, idx] = np.square(std)
+
+        means = means @ self.motion.T
+        covariances = self.motion @ covariances @ self.motion.T + noise
+        return means, covariances
+
+    def update(self, mean, covariance, measurement):
+        """Correct one state with a (cx, cy, w, h) measurement"""
+        std = self.std_position * np.r_[mean[2:4], mean[2:4]]
+        innovation_cov = self.observation @ covariance @ self.observation.T + np.diag(np.square(std))
+        gain = np.linalg.solve(innovation_cov, self.observation @ covariance).T
+        mean = mean + gain @ (measurement - self.observation @ mean)
+        covariance = covariance - gain @ innovation_cov @ gain.T
+        return mean, covariance
+
+
+def xyxy_to_cxcywh(boxes):
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    return np.c_[(boxes[:, :2] + boxes[:, 2:]) * 0.5, boxes[:, 2:] - boxes[:, :2]]
+
+
+def cxcywh_to_xyxy(states):
+    half = np.maximum(states[:, 2:4], 1.0) * 0.5
+    return np.c_[states[:, :2] - half, states[:, :2] + half]
+
+# -----------------------------------------------------
+# Single Track
+# -----------------------------------------------------
+
+class Track:
+    def __init__(self, track_id, mean, covariance, detection):
+        """One tracked object with its filter state and latest detection"""
+        self.track_id = track_id
+        self.mean = mean
+        self.covariance = covariance
+        self.detection = detection
+        self.hits = 1
+        self.misses = 0  # detector runs since the last match
+
+        # DANGER hysteresis
+        self.nearby_threats = []
+        self.danger = False
+        self.danger_streak = 0
+        self.safe_streak = 0
+
+    def box(self):
+        """Current (predicted or corrected) box as integer xyxy"""
+        return [int(v) for v in cxcywh_to_xyxy(self.mean[None, :4])[0]]
+
+    def update_danger(self, is_danger, danger_on=2, danger_off=4):
+        """Switch DANGER on/off only after consecutive agreeing observations"""
+        if is_danger:
+            self.danger_streak += 1
+            self.safe_streak = 0
+            if self.danger_streak >= danger_on:
+                self.danger = True
+        else:
+            self.safe_streak += 1
+            self.danger_streak = 0
+            if self.safe_streak >= danger_off:
+                self.danger = False
+        return self.danger
+
+# -----------------------------------------------------
+# ByteTrack-Style Multi-Object Tracker
+# -----------------------------------------------------
+
+def boxes_overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def match_iou(tracks_xyxy, dets_xyxy, min_iou):
+    """Match tracks to detections by IoU; returns (pairs, unmatched_tracks, unmatched_dets)"""
+    n_tracks, n_dets = len(tracks_xyxy), len(dets_xyxy)
+    if n_tracks == 0 or n_dets == 0:
+        return [], list(range(n_tracks)), list(range(n_dets))
+
+    iou = box_iou(np.asarray(tracks_xyxy, dtype=np.float64),
+                  np.asarray(dets_xyxy, dtype=np.float64))
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(-iou)
+        pairs = [(r, c) for r, c in zip(rows.tolist(), cols.tolist()) if iou[r, c] >= min_iou]
+    else:
+        # Greedy: best remaining IoU first
+        pairs = []
+        used_tracks, used_dets = set(), set()
+        for flat in np.argsort(-iou, axis=None).tolist():
+            r, c = divmod(flat, n_dets)
+            if iou[r, c] < min_iou:
+                break
+            if r in used_tracks or c in used_dets:
+                continue
+            pairs.append((r, c))
+            used_tracks.add(r)
+            used_dets.add(c)
+
+    matched_tracks = {r for r, _ in pairs}
+    matched_dets = {c for _, c in pairs}
+    return (pairs,
+            [r for r in range(n_tracks) if r not in matched_tracks],
+            [c for c in range(n_dets) if c not in matched_dets])
+
+
+class ByteTracker:
+    def __init__(self, high_threshold=0.5, match_iou=0.3, low_match_iou=0.5, max_misses=3):
+        """Track detections across frames with persistent IDs"""
+        self.high_threshold = high_threshold  # detections above start new tracks
+        self.match_iou = match_iou
+        self.low_match_iou = low_match_iou
+        self.max_misses = max_misses  # detector runs a lost track survives
+        self.kalman = KalmanBoxFilter()
+        self.tracks = []
+        self.next_id = 1
+
+    def predict(self):
+        """Advance every track by one frame"""
+        if not self.tracks:
+            return
+        means = np.stack([track.mean for track in self.tracks])
+        covariances = np.stack([track.covariance for track in self.tracks])
+        means, covariances = self.kalman.multi_predict(means, covariances)
+        for track, mean, covariance in zip(self.tracks, means, covariances):
+            track.mean = mean
+            track.covariance = covariance
+
+    def update(self, detections, region=None):
+        """Match this frame's detections to tracks (call predict() first).
+
+        With region=(x1, y1, x2, y2) only the tracks overlapping that region take part,
+        so a detector run on a crop does not count as a miss for tracks outside it.
+        Sets detection.track_id and returns the matched/new tracks in detection order.
+        """
+        if region is None:
+            candidates = self.tracks
+        else:
+            candidates = [track for track in self.tracks if boxes_overlap(track.box(), region)]
+        for track in candidates:
+            track.misses += 1
+
+        scores = np.array([d.confidence for d in detections], dtype=np.float64)
+        high = [i for i in range(len(detections)) if scores[i] >= self.high_threshold]
+        low = [i for i in range(len(detections)) if scores[i] < self.high_threshold]
+        det_boxes = [detections[i].bbox for i in range(len(detections))]
+        matched = {}
+
+        # First pass: confident detections against every track
+        pairs, free_tracks, free_high = match_iou(
+            [track.box() for track in candidates], [det_boxes[i] for i in high], self.match_iou)
+        for t, d in pairs:
+            matched[high[d]] = candidates[t]
+
+        # Second pass: weak detections recover tracks the first pass missed
+        remaining = [candidates[t] for t in free_tracks]
+        pairs, _, _ = match_iou(
+            [track.box() for track in remaining], [det_boxes[i] for i in low], self.low_match_iou)
+        for t, d in pairs:
+            matched[low[d]] = remaining[t]
+
+        # Correct matched tracks
+        measurements = xyxy_to_cxcywh(det_boxes) if detections else np.zeros((0, 4))
+        for i, track in matched.items():
+            track.mean, track.covariance = self.kalman.update(
+                track.mean, track.covariance, measurements[i])
+            track.detection = detections[i]
+            track.hits += 1
+            track.misses = 0
+
+        # Unmatched confident detections start new tracks
+        for d in free_high:
+            i = high[d]
+            mean, covariance = self.kalman.initiate(measurements[i])
+            track = Track(self.next_id, mean, covariance, detections[i])
+            self.next_id += 1
+            self.tracks.append(track)
+            matched[i] = track
+
+        # Drop tracks lost for too long
+        self.tracks = [track for track in self.tracks if track.misses <= self.max_misses]
+
+        for i, track in matched.items():
+            detections[i].track_id = track.track_id
+        return [matched[i] for i in sorted(matched)]
+
+    def active_tracks(self):
+        """Tracks matched on the most recent detector run"""
+        return [track for track in self.tracks if track.misses == 0]
+
+    def coasting_tracks(self):
+        """Tracks missed on recent detector runs but kept for up to max_misses runs"""
+        return [track for track in self.tracks if track.misses > 0]
+
+    def predicted_detections(self, exclude=()):
+        """Latest detection of every live track (active or coasting), moved to its predicted box
+
+        Coasting tracks keep their box until they are dropped, so an object the
+        detector misses once does not flicker on the frames in between.
+        Track IDs in exclude (e.g. just matched) are skipped.
+        """
+        return [track.detection.copy(bbox=track.box())
+                for track in self.tracks if track.track_id not in exclude]
@@ -0,0 +1,188 @@
+import http.server
+import socketserver
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# -----------------------------------------------------
+# JPEG Encoding (once per displayed frame)
+# -----------------------------------------------------
+
+class JPEGEncoder:
+    def __init__(self, quality=80, width=None, use_turbojpeg=True):
+        """Downscale to the display width and encode BGR frames to JPEG bytes
+
+        Uses TurboJPEG when PyTurboJPEG and libturbojpeg are installed, else
+        cv2.imencode. The resize buffer is reused while the frame size is stable.
+        """
+        self.quality = quality
+        self.width = width  # display width in pixels (None keeps the frame size)
+        self.turbo = None
+        if use_turbojpeg:
+            try:
+                from turbojpeg import TurboJPEG
+                self.turbo = TurboJPEG()
+            except Exception:
+                self.turbo = None  # module or shared library missing
+        self.params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        self.scaled = None
+        self.frames = 0
+        self.bytes_out = 0
+        self.encode_ms = 0.0
+
+    @property
+    def backend(self):
+        return 'turbojpeg' if self.turbo is not None else 'opencv'
+
+    def set_quality(self, quality):
+        self.quality = quality
+        self.params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+
+    def resize(self, bgr):
+        """Frame at the display width (a reused buffer, or the input if already small)"""
+        h, w = bgr.shape[:2]
+        if self.width is None or w <= self.width:
+            return bgr
+        size = (self.width, max(1, round(h * self.width / w)))
+        if self.scaled is None or self.scaled.shape[1::-1] != size:
+            self.scaled = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        cv2.resize(bgr, size, dst=self.scaled, interpolation=cv2.INTER_AREA)
+        return self.scaled
+
+    def encode(self, bgr):
+        started = time.perf_counter()
+        frame = np.ascontiguousarray(self.resize(bgr))
+        if self.turbo is not None:
+            data = self.turbo.encode(frame, quality=self.quality)  # BGR is TurboJPEG's default
+        else:
+            ok, buf = cv2.imencode('.jpg', frame, self.params)
+            if not ok:
+                raise ValueError("JPEG encoding failed")
+            data = buf.tobytes()
+        self.encode_ms = (time.perf_counter() - started) * 1000.0
+        self.frames += 1
+        self.bytes_out += len(data)
+        return data
+
+# -----------------------------------------------------
+# Tiled Sensor Views
+# -----------------------------------------------------
+
+class SensorMosaic:
+    def __init__(self, tile_size=(320, 240), columns=1, labels=None):
+        """Several sensor views resized into one preallocated canvas (row-major tiles)"""
+        self.tile_w, self.tile_h = tile_size
+        self.columns = columns
+        self.labels = labels or []
+        self.canvas = None
+        self.tile = np.empty((self.tile_h, self.tile_w, 3), dtype=np.uint8)
+
+    def compose(self, frames):
+        """Tile BGR frames into the canvas; missing (None) views stay black"""
+        rows = -(-len(frames) // self.columns)
+        shape = (rows * self.tile_h, self.columns * self.tile_w, 3)
+        if self.canvas is None or self.canvas.shape != shape:
+            self.canvas = np.zeros(shape, dtype=np.uint8)
+
+        for i, frame in enumerate(frames):
+            row, col = divmod(i, self.columns)
+            y, x = row * self.tile_h, col * self.tile_w
+            target = self.canvas[y:y + self.tile_h, x:x + self.tile_w]
+            if frame is None:
+                target[:] = 0
+                continue
+            cv2.resize(frame, (self.tile_w, self.tile_h), dst=self.tile, interpolation=cv2.INTER_AREA)
+            target[:] = self.tile
+            if i < len(self.labels):
+                cv2.putText(target, self.labels[i], (8, 22), cv2.FONT_HERSHEY_SIMPLEX,
+                            0.6, (255, 255, 255), 2)
+        return self.canvas
+
+# -----------------------------------------------------
+# MJPEG Stream over HTTP
+# -----------------------------------------------------
+
+class _MJPEGHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        stream = self.server.streams.get(self.path.split('?')[0].strip('/'))
+        if stream is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=frame')
+        self.end_headers()
+        seq = 0
+        try:
+            while not self.server.stopping:
+                seq, data = stream.wait(seq, timeout=1.0)
+                if data is None:
+                    continue
+                self.wfile.write(b'--frame\r\nContent-Type: image/jpeg\r\n'
+                                 b'Content-Length: ' + str(len(data)).encode() + b'\r\n\r\n')
+                self.wfile.write(data)
+                self.wfile.write(b'\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # viewer closed the page
+
+    def log_message(self, *args):
+        pass
+
+
+class _LatestFrame:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.seq = 0
+        self.data = None
+
+    def publish(self, data):
+        with self.cond:
+            self.seq += 1
+            self.data = data
+            self.cond.notify_all()
+
+    def wait(self, after, timeout):
+        """(seq, jpeg) newer than after, or (after, None) on timeout"""
+        with self.cond:
+            if not self.cond.wait_for(lambda: self.seq > after, timeout):
+                return after, None
+            return self.seq, self.data
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class MJPEGServer:
+    def __init__(self, host='127.0.0.1', port=8554, streams=('video', 'sensors')):
+        """Serve the newest JPEG of each stream at http://host:port/<stream>
+
+        Every viewer receives the same encoded bytes; nothing is re-encoded per client.
+        """
+        self.httpd = _ThreadingServer((host, port), _MJPEGHandler)
+        self.httpd.streams = {name: _LatestFrame() for name in streams}
+        self.httpd.stopping = False
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def address(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, stream):
+        return f"{self.address}/{stream}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def publish(self, stream, jpeg):
+        self.httpd.streams[stream].publish(jpeg)
+
+    def stop(self):
+        self.httpd.stopping = True
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -1,3 +1,23 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Camera, DetectionEvent, ThreatTrack
+
+
+@admin.register(Camera)
+class CameraAdmin(admin.ModelAdmin):
+    list_display = ('name', 'location', 'is_active', 'created_at')
+
+
+@admin.register(DetectionEvent)
+class DetectionEventAdmin(admin.ModelAdmin):
+    list_display = ('timestamp', 'camera', 'class_name', 'threat_level', 'confidence', 'track_id')
+    list_filter = ('threat_level', 'camera')
+    list_select_related = ('camera',)
+    show_full_result_count = False  # COUNT(*) over millions of rows on every page
+
+
+@admin.register(ThreatTrack)
+class ThreatTrackAdmin(admin.ModelAdmin):
+    list_display = ('track_id', 'camera', 'class_name', 'threat_level', 'first_seen', 'last_seen', 'detections')
+    list_filter = ('threat_level', 'camera')
+    list_select_related = ('camera',)
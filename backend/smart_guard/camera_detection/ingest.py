@@ -0,0 +1,133 @@
+import json
+import math
+import threading
+import time
+
+from .models import Camera, THREAT_LEVEL_CODES
+
+try:
+    import msgpack
+except ImportError:  # NDJSON only
+    msgpack = None
+
+NDJSON_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonlines')
+MSGPACK_TYPES = ('application/msgpack', 'application/x-msgpack')
+
+MAX_ERRORS_REPORTED = 10
+
+
+class IngestError(ValueError):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def decode_batch(body, content_type):
+    """Request body -> list of detection dicts (NDJSON lines or a msgpack array/stream)"""
+    content_type = content_type.split(';')[0].strip().lower()
+    if content_type in MSGPACK_TYPES:
+        if msgpack is None:
+            raise IngestError("msgpack is not installed on this server; send application/x-ndjson", 415)
+        unpacker = msgpack.Unpacker(raw=False)
+        items = []
+        try:
+            unpacker.feed(body)
+            while unpacker.tell() < len(body):
+                obj = unpacker.unpack()
+                items.extend(obj if isinstance(obj, list) else [obj])
+        except (ValueError, msgpack.UnpackException) as e:  # OutOfData, FormatError, StackError, ...
+            raise IngestError(f"invalid msgpack ({type(e).__name__})")
+        return items
+    if content_type in NDJSON_TYPES or content_type == 'application/json':
+        try:
+            if content_type == 'application/json':
+                data = json.loads(body)
+                return data if isinstance(data, list) else [data]
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        except ValueError as e:
+            raise IngestError(f"invalid JSON: {e}")
+    raise IngestError(f"unsupported content type '{content_type}'", 415)
+
+
+def _level(value):
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return THREAT_LEVEL_CODES[value.upper()]
+    value = int(value)
+    if not 0 <= value <= 3:
+        raise ValueError("threat_level out of range")
+    return value
+
+
+def _coord(value):
+    value = int(value)
+    if not -32768 <= value <= 32767:
+        raise ValueError("bbox coordinate out of range")
+    return value
+
+
+def to_record(item, camera_id, now):
+    """Validate one detector dict into a DetectionWriter record (raises on bad input)
+
+    Accepts Detection.to_dict() output: name/class_name, confidence, bbox,
+    optional track_id, threat_level or status, timestamp (epoch seconds),
+    latitude/longitude.
+    """
+    bbox = item['bbox']
+    if len(bbox) != 4:
+        raise ValueError("bbox needs 4 values")
+    confidence = float(item['confidence'])
+    if not 0.0 <= confidence <= 1.0:
+        raise ValueError("confidence out of range")
+    timestamp = float(item.get('timestamp', now))
+    if not math.isfinite(timestamp):
+        raise ValueError("bad timestamp")
+    track_id = item.get('track_id')
+    latitude, longitude = item.get('latitude'), item.get('longitude')
+    return {
+        'camera_id': camera_id,
+        'timestamp': timestamp,
+        'track_id': None if track_id is None else int(track_id),
+        'class_name': str(item.get('class_name') or item['name'])[:32],
+        'threat_level': _level(item.get('threat_level', item.get('status'))),
+        'confidence': confidence,
+        'x1': _coord(bbox[0]), 'y1': _coord(bbox[1]), 'x2': _coord(bbox[2]), 'y2': _coord(bbox[3]),
+        'latitude': None if latitude is None else float(latitude),
+        'longitude': None if longitude is None else float(longitude),
+    }
+
+
+def validate_batch(items, camera_ids, default_camera=None):
+    """(records, errors); items without a known camera name are errors"""
+    now = time.time()
+    records, errors = [], []
+    for i, item in enumerate(items):
+        try:
+            camera_id = camera_ids[item.get('camera', default_camera)]
+            records.append(to_record(item, camera_id, now))
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            errors.append({'index': i, 'error': f"{type(e).__name__}: {e}"})
+    return records, errors
+
+
+class CameraCache:
+    def __init__(self):
+        """Camera name -> ID; cameras are registered the first time a detector reports them"""
+        self.ids = {}
+        self.lock = threading.Lock()
+
+    def resolve(self, names):
+        """IDs for every name (creating missing cameras); runs in a worker thread"""
+        missing = {name for name in names
+                   if isinstance(name, str) and 0 < len(name) <= 64 and name not in self.ids}
+        if missing:
+            with self.lock:
+                Camera.objects.bulk_create([Camera(name=name) for name in missing],
+                                           ignore_conflicts=True)
+                for camera_id, name in Camera.objects.filter(name__in=missing).values_list('id', 'name'):
+                    self.ids[name] = camera_id
+        return self.ids
+
+
+camera_cache = CameraCache()
@@ -0,0 +1,215 @@
+import asyncio
+import heapq
+import json
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+
+from .models import LEVEL_POTENTIAL, Camera
+
+logger = logging.getLogger(__name__)
+
+
+def sse_message(event, data, event_id=None):
+    """One server-sent event; data is an already encoded JSON string"""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {data}\n\n".encode()
+
+
+class Subscription:
+    def __init__(self, loop, cameras=None, min_level=0, maxsize=32):
+        """One client's bounded buffer of SSE messages, owned by its event loop
+
+        A full buffer drops its oldest message, so a client that cannot keep up
+        loses history (and is told how much) instead of holding up the hub.
+        """
+        self.loop = loop
+        self.cameras = frozenset(cameras) if cameras else None
+        self.min_level = min_level
+        self.buffer = deque(maxlen=maxsize)
+        self.ready = asyncio.Event()
+        self.dropped = 0        # lost since the client last read
+        self.total_dropped = 0
+
+    @property
+    def key(self):
+        return self.cameras, self.min_level
+
+    def matches(self, camera_id, threat_level):
+        return threat_level >= self.min_level and (self.cameras is None or camera_id in self.cameras)
+
+    def push(self, messages):
+        """Runs on the subscription's loop"""
+        for message in messages:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+                self.total_dropped += 1
+            self.buffer.append(message)
+        if messages:
+            self.ready.set()
+
+    async def get(self, timeout=None):
+        """Everything buffered (waiting up to timeout for something); [] on timeout"""
+        if not self.buffer:
+            self.ready.clear()
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        messages = []
+        if self.dropped:
+            messages.append(sse_message('dropped', json.dumps({'dropped': self.dropped})))
+            self.dropped = 0
+        messages.extend(self.buffer)
+        self.buffer.clear()
+        return messages
+
+
+def _deliver(batch):
+    for subscription, messages in batch:
+        subscription.push(messages)
+
+
+class DetectionHub:
+    def __init__(self, buffer_size=32):
+        """In-process pub/sub fanning written detections out to stream subscribers
+
+        publish() is a DetectionWriter listener: it encodes each batch once per
+        distinct (cameras, min_level) filter and hands the messages to every
+        subscriber's loop in one call_soon_threadsafe, so the writer thread
+        never waits on a client.
+        """
+        self.buffer_size = buffer_size
+        self.lock = threading.Lock()
+        self.subscribers = {}  # event loop -> set of Subscriptions
+        self.names = {}        # camera id -> name
+        self.seq = 0
+        self.published = 0
+
+    def subscribe(self, cameras=None, min_level=0):
+        """Subscription on the running loop for camera IDs (None = all) at or above min_level"""
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(loop, cameras, min_level, self.buffer_size)
+        with self.lock:
+            self.subscribers.setdefault(loop, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscribers.get(subscription.loop)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscribers[subscription.loop]
+
+    def subscriber_count(self):
+        with self.lock:
+            return sum(len(subscriptions) for subscriptions in self.subscribers.values())
+
+    def _camera_names(self, events):
+        """Camera id -> name; unresolved names stay None for this batch and are retried next time"""
+        missing = {event.camera_id for event in events} - self.names.keys()
+        if missing:
+            try:
+                self.names.update(Camera.objects.filter(id__in=missing).values_list('id', 'name'))
+            except Exception:  # e.g. "database is locked"
+                logger.warning("Could not resolve camera names for the live stream", exc_info=True)
+        return self.names
+
+    def publish(self, events):
+        """Fan a written batch of DetectionEvents out; returns the number of subscribers reached
+
+        Runs on the writer thread, so failures are logged here and never raised.
+        """
+        try:
+            return self._publish(events)
+        except Exception:
+            logger.exception("Live stream publish failed for %d detections", len(events))
+            return 0
+
+    def _publish(self, events):
+        with self.lock:
+            targets = {loop: list(subscriptions) for loop, subscriptions in self.subscribers.items()}
+        if not targets or not events:
+            return 0
+        self.seq += 1
+        names = self._camera_names(events)
+
+        # encode each event once, grouped by (camera, level) so filters pick whole groups
+        groups = {}
+        for i, event in enumerate(events):
+            groups.setdefault((event.camera_id, event.threat_level), []).append((i, json.dumps({
+                'id': event.pk,
+                'camera': names.get(event.camera_id),
+                'timestamp': event.timestamp.isoformat(),
+                'track_id': event.track_id,
+                'class_name': event.class_name,
+                'threat_level': event.threat_level,
+                'confidence': event.confidence,
+                'bbox': [event.x1, event.y1, event.x2, event.y2],
+                'latitude': event.latitude,
+                'longitude': event.longitude
+            }, separators=(',', ':'))))
+
+        alerts = {}
+        for (camera_id, level), encoded in groups.items():
+            if level < LEVEL_POTENTIAL:
+                continue
+            batch = [events[i] for i, _ in encoded]
+            alerts[camera_id, level] = sse_message('alert', json.dumps({
+                'camera': names.get(camera_id),
+                'threat_level': level,
+                'count': len(batch),
+                'class_names': sorted({event.class_name for event in batch}),
+                'max_confidence': max(event.confidence for event in batch),
+                'last_seen': max(event.timestamp for event in batch).isoformat()
+            }, separators=(',', ':')), self.seq)
+
+        # subscribers with the same filter share one list of messages
+        payloads = {}
+
+        def messages_for(subscription):
+            messages = payloads.get(subscription.key)
+            if messages is None:
+                matching = [encoded for (camera_id, level), encoded in groups.items()
+                            if subscription.matches(camera_id, level)]
+                messages = [alert for (camera_id, level), alert in alerts.items()
+                            if subscription.matches(camera_id, level)]
+                if matching:
+                    data = ','.join(text for _, text in heapq.merge(*matching))
+                    messages.append(sse_message('detections', f'[{data}]', self.seq))
+                payloads[subscription.key] = messages
+            return messages
+
+        reached = 0
+        for loop, subscriptions in targets.items():
+            batch = [(subscription, messages_for(subscription)) for subscription in subscriptions]
+            batch = [(subscription, messages) for subscription, messages in batch if messages]
+            if not batch:
+                continue
+            try:
+                loop.call_soon_threadsafe(_deliver, batch)
+            except RuntimeError:  # loop closed; its subscribers are gone
+                continue
+            reached += len(batch)
+        self.published += 1
+        return reached
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_hub():
+    """Process-wide hub listening to the detection writer"""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            from .writer import get_writer
+
+            config = getattr(settings, 'DETECTION_STREAM', {})
+            _hub = DetectionHub(buffer_size=config.get('BUFFER_SIZE', 32))
+            get_writer().listeners.append(_hub.publish)
+        return _hub
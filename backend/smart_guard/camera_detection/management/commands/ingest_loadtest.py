@@ -0,0 +1,115 @@
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from django.core.management.base import BaseCommand, CommandError
+
+from camera_detection.ingest import msgpack
+
+CLASSES = [('person', 'SAFE'), ('person', 'DANGER'), ('knife', 'IMMEDIATE_THREAT'),
+           ('scissors', 'POTENTIAL_THREAT'), ('cell phone', 'POTENTIAL_THREAT')]
+
+
+def synthetic_batch(rng, camera, size, track_base):
+    now = time.time()
+    batch = []
+    for _ in range(size):
+        name, level = rng.choice(CLASSES)
+        x, y = rng.randint(0, 600), rng.randint(0, 440)
+        batch.append({
+            'camera': camera, 'timestamp': now, 'name': name, 'threat_level': level,
+            'confidence': round(rng.uniform(0.3, 0.99), 3), 'track_id': track_base + rng.randint(0, 20),
+            'bbox': [x, y, x + rng.randint(20, 200), y + rng.randint(20, 300)]
+        })
+    return batch
+
+
+class Command(BaseCommand):
+    help = "Drive the detection ingest endpoint with synthetic traffic from simulated detectors"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/api/detections/ingest/')
+        parser.add_argument('--detectors', type=int, default=16, help="Concurrent detector processes to simulate")
+        parser.add_argument('--cameras', type=int, default=8)
+        parser.add_argument('--batch', type=int, default=50, help="Detections per request")
+        parser.add_argument('--rate', type=float, default=4.0, help="Requests per second per detector")
+        parser.add_argument('--duration', type=float, default=30.0, help="Seconds to run")
+        parser.add_argument('--format', choices=['ndjson', 'msgpack'], default='ndjson')
+        parser.add_argument('--token', default=os.environ.get('SMARTGUARD_TOKEN'),
+                            help="Detector API token (see issue_token; default $SMARTGUARD_TOKEN)")
+
+    def handle(self, *args, **options):
+        if options['format'] == 'msgpack' and msgpack is None:
+            raise CommandError("msgpack is not installed")
+        if not options['token']:
+            raise CommandError("ingest needs a detector token: pass --token or set SMARTGUARD_TOKEN")
+
+        lock = threading.Lock()
+        totals = {'sent': 0, 'accepted': 0, 'throttled': 0, 'failed': 0}
+        latencies = []
+        deadline = time.time() + options['duration']
+
+        def encode(batch):
+            if options['format'] == 'msgpack':
+                return msgpack.packb(batch), 'application/msgpack'
+            return '\n'.join(json.dumps(item) for item in batch).encode(), 'application/x-ndjson'
+
+        def detector(index):
+            rng = random.Random(index)
+            camera = f"loadtest-{index % options['cameras']}"
+            interval = 1.0 / options['rate']
+            next_send = time.time()
+            while time.time() < deadline:
+                body, content_type = encode(synthetic_batch(rng, camera, options['batch'], index * 100))
+                request = urllib.request.Request(options['url'], data=body, method='POST',
+                                                 headers={'Content-Type': content_type,
+                                                          'Authorization': f"Bearer {options['token']}"})
+                started = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(request, timeout=10) as response:
+                        result = json.loads(response.read())
+                    with lock:
+                        totals['sent'] += options['batch']
+                        totals['accepted'] += result['accepted']
+                        latencies.append(time.perf_counter() - started)
+                except urllib.error.HTTPError as e:
+                    with lock:
+                        if e.code == 429:
+                            totals['throttled'] += 1
+                        else:
+                            totals['failed'] += 1
+                    if e.code == 429:
+                        # Back off as the server asks, then carry on at the normal rate
+                        time.sleep(float(e.headers.get('Retry-After', 1)))
+                        next_send = time.time()
+                        continue
+                except OSError:
+                    with lock:
+                        totals['failed'] += 1
+                next_send += interval
+                time.sleep(max(0.0, next_send - time.time()))
+
+        started = time.time()
+        threads = [threading.Thread(target=detector, args=(i,), daemon=True)
+                   for i in range(options['detectors'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - started
+
+        latencies.sort()
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+
+        self.stdout.write(
+            f"{totals['accepted'] / elapsed:.0f} detections/s accepted "
+            f"({totals['accepted']}/{totals['sent']} in {elapsed:.1f}s) | "
+            f"429s {totals['throttled']} | failures {totals['failed']} | "
+            f"latency p50 {percentile(0.5):.1f}ms p95 {percentile(0.95):.1f}ms p99 {percentile(0.99):.1f}ms"
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from camera_detection.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the minute/hour rollup tables from raw detection events"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help="Only rebuild buckets from this ISO 8601 datetime on")
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError("--since must be an ISO 8601 datetime")
+        rebuild_rollups(since)
+        self.stdout.write("Rollups rebuilt")
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Camera',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('location', models.CharField(blank=True, max_length=100)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DetectionEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField()),
+                ('track_id', models.IntegerField(blank=True, null=True)),
+                ('class_name', models.CharField(max_length=32)),
+                ('threat_level', models.PositiveSmallIntegerField(choices=[(0, 'None'), (1, 'Person'), (2, 'Potential threat'), (3, 'Immediate threat')], default=0)),
+                ('confidence', models.FloatField()),
+                ('x1', models.SmallIntegerField()),
+                ('y1', models.SmallIntegerField()),
+                ('x2', models.SmallIntegerField()),
+                ('y2', models.SmallIntegerField()),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('camera', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='camera_detection.camera')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['camera', 'timestamp'], name='event_camera_time_idx'), models.Index(fields=['threat_level', 'timestamp'], name='event_level_time_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ThreatTrack',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('track_id', models.IntegerField()),
+                ('class_name', models.CharField(max_length=32)),
+                ('threat_level', models.PositiveSmallIntegerField(choices=[(0, 'None'), (1, 'Person'), (2, 'Potential threat'), (3, 'Immediate threat')], default=0)),
+                ('first_seen', models.DateTimeField()),
+                ('last_seen', models.DateTimeField()),
+                ('detections', models.PositiveIntegerField(default=0)),
+                ('max_confidence', models.FloatField(default=0.0)),
+                ('camera', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tracks', to='camera_detection.camera')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['camera', 'track_id', 'last_seen'], name='track_camera_id_idx'), models.Index(fields=['camera', 'last_seen'], name='track_camera_time_idx'), models.Index(fields=['threat_level', 'last_seen'], name='track_level_time_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('camera_detection', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HourRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField()),
+                ('threat_level', models.PositiveSmallIntegerField(choices=[(0, 'None'), (1, 'Person'), (2, 'Potential threat'), (3, 'Immediate threat')])),
+                ('class_name', models.CharField(max_length=32)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('max_confidence', models.FloatField(default=0.0)),
+                ('camera', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='camera_detection.camera')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['bucket'], name='hour_rollup_time_idx'), models.Index(fields=['threat_level', 'bucket'], name='hour_rollup_level_idx')],
+                'constraints': [models.UniqueConstraint(fields=('camera', 'bucket', 'threat_level', 'class_name'), name='hour_rollup_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MinuteRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField()),
+                ('threat_level', models.PositiveSmallIntegerField(choices=[(0, 'None'), (1, 'Person'), (2, 'Potential threat'), (3, 'Immediate threat')])),
+                ('class_name', models.CharField(max_length=32)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('max_confidence', models.FloatField(default=0.0)),
+                ('camera', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='camera_detection.camera')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['bucket'], name='minute_rollup_time_idx'), models.Index(fields=['threat_level', 'bucket'], name='minute_rollup_level_idx')],
+                'constraints': [models.UniqueConstraint(fields=('camera', 'bucket', 'threat_level', 'class_name'), name='minute_rollup_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 05:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('camera_detection', '0002_hourrollup_minuterollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='detectionevent',
+            index=models.Index(fields=['timestamp'], name='event_time_idx'),
+        ),
+    ]
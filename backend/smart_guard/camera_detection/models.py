@@ -1,3 +1,128 @@
 from django.db import models
 
-# Create your models here.
+# threat levels use the same codes as the detector (ai_threat_detection/detections.py)
+LEVEL_NONE = 0
+LEVEL_PERSON = 1
+LEVEL_POTENTIAL = 2
+LEVEL_IMMEDIATE = 3
+
+THREAT_LEVEL_CHOICES = [
+    (LEVEL_NONE, 'None'),
+    (LEVEL_PERSON, 'Person'),
+    (LEVEL_POTENTIAL, 'Potential threat'),
+    (LEVEL_IMMEDIATE, 'Immediate threat'),
+]
+
+# names the detector puts in threat_level / status, mapped to codes
+THREAT_LEVEL_CODES = {
+    'NONE': LEVEL_NONE,
+    'NEUTRAL': LEVEL_PERSON,
+    'SAFE': LEVEL_PERSON,
+    'DANGER': LEVEL_IMMEDIATE,
+    'POTENTIAL_THREAT': LEVEL_POTENTIAL,
+    'IMMEDIATE_THREAT': LEVEL_IMMEDIATE,
+    # LIDAR obstacles: those inside the alert range also carry threat_level POTENTIAL_THREAT
+    'OBSTACLE': LEVEL_NONE,
+}
+
+
+class Camera(models.Model):
+    name = models.CharField(max_length=64, unique=True)
+    location = models.CharField(max_length=100, blank=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+# one row per detected object per frame, written in batches by writer.DetectionWriter
+class DetectionEvent(models.Model):
+    # the (camera, timestamp) index leads with camera, so no separate FK index
+    camera = models.ForeignKey(Camera, on_delete=models.CASCADE, db_index=False,
+                               related_name='events')
+    timestamp = models.DateTimeField()
+    track_id = models.IntegerField(null=True, blank=True)
+    class_name = models.CharField(max_length=32)
+    threat_level = models.PositiveSmallIntegerField(choices=THREAT_LEVEL_CHOICES, default=LEVEL_NONE)
+    confidence = models.FloatField()
+    # bbox in pixels (x1, y1, x2, y2)
+    x1 = models.SmallIntegerField()
+    y1 = models.SmallIntegerField()
+    x2 = models.SmallIntegerField()
+    y2 = models.SmallIntegerField()
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['timestamp'], name='event_time_idx'),
+            models.Index(fields=['camera', 'timestamp'], name='event_camera_time_idx'),
+            models.Index(fields=['threat_level', 'timestamp'], name='event_level_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.class_name} {self.confidence:.2f} @ {self.camera_id} {self.timestamp}"
+
+
+# one row per tracked object; a track ID seen again after TRACK_GAP starts a new row
+class ThreatTrack(models.Model):
+    camera = models.ForeignKey(Camera, on_delete=models.CASCADE, db_index=False,
+                               related_name='tracks')
+    track_id = models.IntegerField()
+    class_name = models.CharField(max_length=32)
+    threat_level = models.PositiveSmallIntegerField(choices=THREAT_LEVEL_CHOICES, default=LEVEL_NONE)
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField()
+    detections = models.PositiveIntegerField(default=0)
+    max_confidence = models.FloatField(default=0.0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['camera', 'track_id', 'last_seen'], name='track_camera_id_idx'),
+            models.Index(fields=['camera', 'last_seen'], name='track_camera_time_idx'),
+            models.Index(fields=['threat_level', 'last_seen'], name='track_level_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"track {self.track_id} ({self.class_name}) @ {self.camera_id}"
+
+
+# incrementally maintained aggregates of DetectionEvent (see rollups.py);
+# one row per camera, bucket start, threat level and class
+class RollupBase(models.Model):
+    camera = models.ForeignKey(Camera, on_delete=models.CASCADE, db_index=False, related_name='+')
+    bucket = models.DateTimeField()
+    threat_level = models.PositiveSmallIntegerField(choices=THREAT_LEVEL_CHOICES)
+    class_name = models.CharField(max_length=32)
+    count = models.PositiveIntegerField(default=0)
+    max_confidence = models.FloatField(default=0.0)
+
+    class Meta:
+        abstract = True
+
+
+class MinuteRollup(RollupBase):
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['camera', 'bucket', 'threat_level', 'class_name'],
+                                    name='minute_rollup_key'),
+        ]
+        indexes = [
+            models.Index(fields=['bucket'], name='minute_rollup_time_idx'),
+            models.Index(fields=['threat_level', 'bucket'], name='minute_rollup_level_idx'),
+        ]
+
+
+class HourRollup(RollupBase):
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['camera', 'bucket', 'threat_level', 'class_name'],
+                                    name='hour_rollup_key'),
+        ]
+        indexes = [
+            models.Index(fields=['bucket'], name='hour_rollup_time_idx'),
+            models.Index(fields=['threat_level', 'bucket'], name='hour_rollup_level_idx'),
+        ]
@@ -0,0 +1,52 @@
+import base64
+import heapq
+import json
+from datetime import datetime
+
+from django.db.models import Q
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(moment, pk):
+    raw = json.dumps([moment.isoformat(), pk], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        moment, pk = json.loads(raw)
+        return datetime.fromisoformat(moment), int(pk)
+    except (ValueError, TypeError) as e:
+        raise CursorError(f"invalid cursor: {e}")
+
+
+def _seek(queryset, field, cursor, limit):
+    queryset = queryset.order_by(f'-{field}', '-id')
+    if cursor:
+        moment, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(**{f'{field}__lt': moment}) | Q(**{field: moment, 'id__lt': pk}))
+    return list(queryset[:limit + 1])
+
+
+def keyset_page(queryset, field, cursor=None, limit=100):
+    """Newest-first page ordered by (field, id) and the cursor for the next one
+
+    Seeks past the cursor with a (field, id) comparison instead of OFFSET, so
+    page N costs the same as page 1 however large the table grows. A list of
+    querysets (e.g. one per threat level, each an equality prefix of an index)
+    is read as separate ordered scans and merged.
+    """
+    if isinstance(queryset, (list, tuple)):
+        scans = [_seek(part, field, cursor, limit) for part in queryset]
+        rows = list(heapq.merge(*scans, key=lambda row: (row[field], row['id']), reverse=True))
+        rows = rows[:limit + 1]
+    else:
+        rows = _seek(queryset, field, cursor, limit)
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last[field], last['id'])
@@ -0,0 +1,67 @@
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models import Count, Max
+from django.db.models.functions import TruncHour, TruncMinute
+
+from .models import DetectionEvent, HourRollup, MinuteRollup
+
+# resolution name -> (model, truncation of the event timestamp)
+RESOLUTIONS = {
+    'minute': (MinuteRollup, lambda ts: ts.replace(second=0, microsecond=0), TruncMinute),
+    'hour': (HourRollup, lambda ts: ts.replace(minute=0, second=0, microsecond=0), TruncHour),
+}
+
+
+def _upsert(model, rows):
+    """Add counts into existing buckets (INSERT ... ON CONFLICT DO UPDATE)"""
+    greatest = 'GREATEST' if connection.vendor == 'postgresql' else 'MAX'
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {table} (camera_id, bucket, threat_level, class_name, count, max_confidence) "
+            f"VALUES (%s, %s, %s, %s, %s, %s) "
+            f"ON CONFLICT (camera_id, bucket, threat_level, class_name) DO UPDATE SET "
+            f"count = {table}.count + excluded.count, "
+            f"max_confidence = {greatest}({table}.max_confidence, excluded.max_confidence)",
+            rows)
+
+
+def update_rollups(events):
+    """Fold a batch of stored DetectionEvents into every rollup table
+
+    Called by DetectionWriter inside the flush transaction, so rollups and raw
+    events never disagree.
+    """
+    for model, truncate, _ in RESOLUTIONS.values():
+        buckets = defaultdict(lambda: [0, 0.0])
+        for event in events:
+            key = (event.camera_id, truncate(event.timestamp), event.threat_level, event.class_name)
+            bucket = buckets[key]
+            bucket[0] += 1
+            bucket[1] = max(bucket[1], event.confidence)
+        _upsert(model, [
+            (camera_id, connection.ops.adapt_datetimefield_value(start), level, class_name, count, confidence)
+            for (camera_id, start, level, class_name), (count, confidence) in buckets.items()
+        ])
+
+
+def rebuild_rollups(since=None):
+    """Recompute rollups from raw events (backfill, or after deleting events)"""
+    for model, truncate, trunc in RESOLUTIONS.values():
+        events = DetectionEvent.objects.all()
+        stale = model.objects.all()
+        if since is not None:
+            start = truncate(since)  # whole buckets only
+            events = events.filter(timestamp__gte=start)
+            stale = stale.filter(bucket__gte=start)
+        stale.delete()
+        rows = (events.annotate(start=trunc('timestamp'))
+                .values('camera_id', 'start', 'threat_level', 'class_name')
+                .annotate(n=Count('id'), top=Max('confidence'))
+                .order_by())
+        model.objects.bulk_create(
+            (model(camera_id=row['camera_id'], bucket=row['start'], threat_level=row['threat_level'],
+                   class_name=row['class_name'], count=row['n'], max_confidence=row['top'])
+             for row in rows.iterator()),
+            batch_size=1000)
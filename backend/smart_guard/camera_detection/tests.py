@@ -1,3 +1,495 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.db import OperationalError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from users.auth import issue_token
+from users.models import User
+
+from .ingest import camera_cache, msgpack
+from .live import DetectionHub, get_hub
+from .models import (LEVEL_IMMEDIATE, LEVEL_NONE, LEVEL_PERSON, LEVEL_POTENTIAL, Camera, DetectionEvent,
+                     HourRollup, MinuteRollup, ThreatTrack)
+from .pagination import CursorError, decode_cursor, encode_cursor
+from .rollups import rebuild_rollups
+from .writer import DetectionWriter
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_events(cameras, count, first_id=1):
+    """count events cycling through cameras and threat levels"""
+    return [
+        DetectionEvent(
+            pk=first_id + i, camera_id=cameras[i % len(cameras)].id,
+            timestamp=START + timedelta(milliseconds=i), track_id=i % 7,
+            class_name='knife' if i % 4 >= LEVEL_POTENTIAL else 'person',
+            threat_level=i % 4, confidence=0.5, x1=0, y1=0, x2=10, y2=10
+        )
+        for i in range(count)
+    ]
+
+
+def make_record(camera, seconds, track_id=None, level=LEVEL_NONE, confidence=0.5, class_name='person'):
+    """DetectionWriter record at START + seconds"""
+    return {'camera_id': camera.id, 'timestamp': START.timestamp() + seconds, 'track_id': track_id,
+            'class_name': class_name, 'threat_level': level, 'confidence': confidence,
+            'x1': 0, 'y1': 0, 'x2': 10, 'y2': 10}
+
+
+def parse_sse(messages):
+    """[(event, data)] from a list of SSE messages"""
+    parsed = []
+    for chunk in b''.join(messages).decode().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in chunk.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            parsed.append((fields['event'], json.loads(fields['data'])))
+    return parsed
+
+
+def ndjson(*items):
+    return '\n'.join(json.dumps(item) for item in items).encode()
+
+
+def detection(**fields):
+    return dict({'name': 'person', 'confidence': 0.8, 'bbox': [10, 20, 110, 220], 'status': 'SAFE',
+                 'timestamp': START.timestamp()}, **fields)
+
+
+class IngestViewTests(TestCase):
+    url = '/api/detections/ingest/'
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username='node-1', rank='PVT', unit='1st', first_name='A', last_name='B')
+        cls.auth = {'headers': {'Authorization': f"Bearer {issue_token(user, 'detector')}"}}
+
+    def setUp(self):
+        camera_cache.ids.clear()  # IDs from other tests were rolled back
+        self.writer = DetectionWriter(max_pending=100)  # not started: submitted records stay queued
+        patcher = mock.patch('camera_detection.views.get_writer', return_value=self.writer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, body, content_type='application/x-ndjson', **params):
+        url = self.url + (f"?camera={params['camera']}" if 'camera' in params else '')
+        return self.client.post(url, body, content_type=content_type, **self.auth)
+
+    def test_ndjson_batch_is_queued_and_cameras_registered(self):
+        response = self.post(ndjson(detection(camera='north'), detection(camera='south', track_id=4,
+                                                                        threat_level='IMMEDIATE_THREAT')))
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['accepted'], 2)
+        self.assertEqual(set(Camera.objects.values_list('name', flat=True)), {'north', 'south'})
+
+        records = list(self.writer.pending)
+        self.assertEqual(records[0]['camera_id'], Camera.objects.get(name='north').id)
+        self.assertEqual(records[1]['threat_level'], LEVEL_IMMEDIATE)
+        self.assertEqual(records[1]['track_id'], 4)
+        self.assertEqual((records[0]['x1'], records[0]['y2']), (10, 220))
+
+    def test_json_array_and_default_camera(self):
+        response = self.post(json.dumps([detection(), detection(camera='other')]), 'application/json',
+                             camera='gate')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(sorted(r['camera_id'] for r in self.writer.pending),
+                         sorted(Camera.objects.filter(name__in=['gate', 'other']).values_list('id', flat=True)))
+
+    def test_invalid_items_are_reported_individually(self):
+        response = self.post(ndjson(detection(camera='gate'),
+                                    detection(camera='gate', bbox=[1, 2, 3]),
+                                    detection(camera='gate', confidence=1.5),
+                                    detection(camera='gate', threat_level='HOSTILE'),
+                                    detection(),  # no camera
+                                    detection(camera=['not', 'a', 'name']),
+                                    # LIDAR obstacles (bbox is a ground footprint in meters)
+                                    detection(camera='gate', name='OBSTACLE (2.1m)', status='OBSTACLE',
+                                              type='lidar', bbox=[-3.5, 1.25, -1.0, 4.75]),
+                                    detection(camera='gate', name='OBSTACLE (0.8m)', status='OBSTACLE',
+                                              threat_level='POTENTIAL_THREAT', type='lidar',
+                                              bbox=[2.0, 2.0, 3.5, 2.5])))
+        result = response.json()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual((result['accepted'], result['rejected']), (3, 5))
+        self.assertEqual([error['index'] for error in result['errors']], [1, 2, 3, 4, 5])
+        self.assertEqual(self.writer.backlog(), 3)
+        self.assertEqual([record['threat_level'] for record in list(self.writer.pending)[1:]],
+                         [LEVEL_NONE, LEVEL_POTENTIAL])
+
+    def test_bad_bodies(self):
+        self.assertEqual(self.post(b'{"name": ', 'application/x-ndjson').status_code, 400)
+        self.assertEqual(self.post(b'<xml/>', 'application/xml').status_code, 415)
+        response = self.post(b'\xc1', 'application/msgpack')  # 0xc1 is never valid msgpack
+        self.assertEqual(response.status_code, 415 if msgpack is None else 400)
+        self.assertEqual(self.writer.backlog(), 0)
+
+    def test_full_queue_answers_429_with_retry_after(self):
+        self.writer.submit([{}] * 95)
+        response = self.post(ndjson(*[detection(camera='gate')] * 10))
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertEqual(response.json()['retry_after'], int(response['Retry-After']))
+        self.assertEqual(self.writer.backlog(), 95)  # the whole batch was refused
+
+    def test_requires_detector_token(self):
+        response = self.client.post(self.url, ndjson(detection(camera='gate')),
+                                    content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 401)
+
+
+class RecordingWriter(DetectionWriter):
+    """Writer whose flushes are only recorded, to test when the thread flushes"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+        self.flushed = threading.Event()
+
+    def flush(self, batch):
+        self.batches.append(batch)
+        self.flushed.set()
+
+
+class DetectionWriterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.camera = Camera.objects.create(name='gate')
+
+    def test_flushes_on_size_and_interval(self):
+        writer = RecordingWriter(flush_size=10, flush_interval=0.2).start()
+        try:
+            writer.submit([{'n': i} for i in range(10)])
+            self.assertTrue(writer.flushed.wait(0.1))  # full batch: no wait for the interval
+            self.assertEqual(len(writer.batches[0]), 10)
+
+            writer.flushed.clear()
+            started = time.monotonic()
+            writer.submit([{'n': i} for i in range(3)])
+            self.assertTrue(writer.flushed.wait(2.0))
+            self.assertGreaterEqual(time.monotonic() - started, 0.1)  # partial batch waits for the interval
+            self.assertEqual(len(writer.batches[1]), 3)
+        finally:
+            writer.stop()
+
+    def test_stop_flushes_what_is_queued(self):
+        writer = RecordingWriter(flush_size=100, flush_interval=60.0).start()
+        writer.submit([{'n': i} for i in range(5)])
+        writer.stop()
+        self.assertEqual(sum(len(batch) for batch in writer.batches), 5)
+
+    def test_refuses_beyond_max_pending(self):
+        writer = DetectionWriter(max_pending=10)  # not started, so nothing drains
+        self.assertTrue(writer.submit([make_record(self.camera, i) for i in range(8)]))
+        self.assertFalse(writer.submit([make_record(self.camera, i) for i in range(3)]))
+        self.assertEqual(writer.backlog(), 8)
+        self.assertEqual(writer.rejected, 3)
+        self.assertTrue(writer.submit([make_record(self.camera, 8), make_record(self.camera, 9)]))
+
+    def test_flush_writes_events_and_tracks(self):
+        writer = DetectionWriter(track_gap=60.0)
+        writer.flush([make_record(self.camera, 0, track_id=1, level=LEVEL_PERSON, confidence=0.6),
+                      make_record(self.camera, 1, track_id=1, level=LEVEL_PERSON, confidence=0.7),
+                      make_record(self.camera, 1, track_id=2),
+                      make_record(self.camera, 2)])
+        self.assertEqual(DetectionEvent.objects.count(), 4)
+        self.assertEqual(ThreatTrack.objects.count(), 2)
+
+        # within the gap: the open track is extended through the raw UPDATE
+        writer.flush([make_record(self.camera, 30, track_id=1, level=LEVEL_IMMEDIATE, confidence=0.9,
+                                  class_name='knife'),
+                      make_record(self.camera, 31, track_id=1, level=LEVEL_PERSON, confidence=0.4)])
+        track = ThreatTrack.objects.get(track_id=1)
+        self.assertEqual(track.detections, 4)
+        self.assertEqual(track.threat_level, LEVEL_IMMEDIATE)
+        self.assertEqual(track.max_confidence, 0.9)
+        self.assertEqual(track.first_seen, START)
+        self.assertEqual(track.last_seen, START + timedelta(seconds=31))
+
+        # past the gap: the same track ID starts a new track
+        writer.flush([make_record(self.camera, 200, track_id=1, confidence=0.3)])
+        tracks = list(ThreatTrack.objects.filter(track_id=1).order_by('first_seen'))
+        self.assertEqual(len(tracks), 2)
+        self.assertEqual((tracks[0].detections, tracks[1].detections), (4, 1))
+        self.assertEqual(tracks[1].threat_level, LEVEL_NONE)
+        self.assertEqual(writer.stats()['written'], 7)
+
+    def test_failing_listener_does_not_stop_others(self):
+        writer = DetectionWriter()
+        seen = []
+
+        def broken(events):
+            raise RuntimeError('listener bug')
+
+        writer.listeners += [broken, seen.append]
+        with self.assertLogs('camera_detection.writer', 'ERROR'):
+            writer.flush([make_record(self.camera, 0)])
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(writer.written, 1)
+
+    def test_failed_batch_is_logged_and_counted(self):
+        writer = DetectionWriter()
+        with self.assertLogs('camera_detection.writer', 'ERROR'):
+            writer.flush([make_record(self.camera, 0, class_name=None)])  # NOT NULL violation
+        self.assertEqual(writer.errors, 1)
+        self.assertEqual(DetectionEvent.objects.count(), 0)
+
+
+def random_records(cameras, count, seed=0):
+    """Events spread over three hours, all cameras, levels and a few classes"""
+    rng = random.Random(seed)
+    return [make_record(rng.choice(cameras), rng.uniform(0, 3 * 3600), track_id=rng.randint(0, 30),
+                        level=rng.randint(LEVEL_NONE, LEVEL_IMMEDIATE), confidence=round(rng.random(), 3),
+                        class_name=rng.choice(['person', 'knife', 'scissors']))
+            for _ in range(count)]
+
+
+def rollup_rows(model):
+    return sorted(model.objects.values_list('camera_id', 'bucket', 'threat_level', 'class_name', 'count',
+                                            'max_confidence'))
+
+
+class RollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cameras = [Camera.objects.create(name=f'cam-{i}') for i in range(3)]
+
+    def test_incremental_rollups_match_rebuild(self):
+        writer = DetectionWriter()
+        records = random_records(self.cameras, 2000)
+        for i in range(0, len(records), 150):  # buckets are hit again by later flushes
+            writer.flush(records[i:i + 150])
+        incremental = {model: rollup_rows(model) for model in (MinuteRollup, HourRollup)}
+        self.assertEqual(sum(row[4] for row in incremental[HourRollup]), 2000)
+        self.assertEqual(sum(row[4] for row in incremental[MinuteRollup]), 2000)
+
+        rebuild_rollups()
+        for model, rows in incremental.items():
+            self.assertEqual(rollup_rows(model), rows)
+
+        # a partial rebuild only touches whole buckets from since on
+        rebuild_rollups(since=START + timedelta(hours=1, minutes=30))
+        for model, rows in incremental.items():
+            self.assertEqual(rollup_rows(model), rows)
+
+
+class QueryViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cameras = [Camera.objects.create(name=f'cam-{i}') for i in range(3)]
+        DetectionWriter().flush(random_records(cls.cameras, 400, seed=1))
+        # identical timestamps, so paging has to break ties on id
+        DetectionWriter().flush([make_record(cls.cameras[0], 60, level=LEVEL_IMMEDIATE)] * 12)
+        user = User.objects.create(username='ops', rank='PVT', unit='1st', first_name='A', last_name='B')
+        cls.auth = {'headers': {'Authorization': f"Bearer {issue_token(user, 'console')}"}}
+
+    def walk(self, url, params, limit):
+        rows, cursor = [], None
+        for _ in range(1000):
+            page = dict(params, limit=limit, since='2025-12-31T00:00:00Z', **({'cursor': cursor} if cursor else {}))
+            response = self.client.get(url, page, **self.auth)
+            self.assertEqual(response.status_code, 200, response.content)
+            body = response.json()
+            self.assertLessEqual(len(body['results']), limit)
+            rows += body['results']
+            cursor = body['next_cursor']
+            if cursor is None:
+                return rows
+        self.fail("pagination did not finish")
+
+    def test_event_pages_match_one_ordered_query(self):
+        events = DetectionEvent.objects.order_by('-timestamp', '-id')
+        for params, expected in [
+            ({}, events),
+            ({'min_level': LEVEL_POTENTIAL}, events.filter(threat_level__gte=LEVEL_POTENTIAL)),  # merged per level
+            ({'camera': 'cam-0', 'min_level': LEVEL_PERSON},
+             events.filter(camera__name='cam-0', threat_level__gte=LEVEL_PERSON)),
+            ({'class_name': 'knife', 'min_level': LEVEL_NONE}, events.filter(class_name='knife')),
+        ]:
+            rows = self.walk('/api/detections/events/', params, limit=7)
+            self.assertEqual([row['id'] for row in rows], list(expected.values_list('id', flat=True)), params)
+
+    def test_rollup_pages_match_one_ordered_query(self):
+        for resolution, model in [('minute', MinuteRollup), ('hour', HourRollup)]:
+            rows = self.walk('/api/detections/rollups/', {'resolution': resolution, 'min_level': LEVEL_POTENTIAL},
+                             limit=9)
+            expected = model.objects.filter(threat_level__gte=LEVEL_POTENTIAL).order_by('-bucket', '-id')
+            self.assertEqual([(row['bucket'], row['count']) for row in rows],
+                             [(bucket.isoformat().replace('+00:00', 'Z'), count)
+                              for bucket, count in expected.values_list('bucket', 'count')])
+
+    def test_bad_parameters(self):
+        for url, params in [
+            ('/api/detections/events/', {'cursor': 'not-a-cursor'}),
+            ('/api/detections/events/', {'cursor': encode_cursor(START, 1)[:-3]}),
+            ('/api/detections/events/', {'hours': 'inf'}),
+            ('/api/detections/events/', {'hours': '1e12'}),
+            ('/api/detections/events/', {'hours': '-1'}),
+            ('/api/detections/events/', {'since': 'yesterday'}),
+            ('/api/detections/events/', {'limit': '0'}),
+            ('/api/detections/rollups/', {'resolution': 'day'}),
+            ('/api/detections/rollups/', {'min_level': 'high'}),
+        ]:
+            response = self.client.get(url, params, **self.auth)
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_event_pages_use_an_index(self):
+        cursor = encode_cursor(START + timedelta(seconds=30), 10 ** 9)
+        for params in [{}, {'class_name': 'knife'}, {'camera': 'cam-0'}, {'min_level': LEVEL_POTENTIAL},
+                       {'camera': 'cam-0', 'min_level': LEVEL_PERSON}, {'cursor': cursor}]:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/detections/events/', dict(params, limit=5), **self.auth)
+            self.assertEqual(response.status_code, 200, response.content)
+            selects = [query['sql'] for query in queries if 'camera_detection_detectionevent' in query['sql']]
+            self.assertTrue(selects, params)
+            for sql in selects:
+                with connection.cursor() as db:
+                    db.execute(f'EXPLAIN QUERY PLAN {sql}')
+                    plan = ' | '.join(row[-1] for row in db.fetchall())
+                self.assertIn('SEARCH camera_detection_detectionevent USING INDEX', plan, params)
+                self.assertNotIn('TEMP B-TREE', plan, params)
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(START, 42)), (START, 42))
+        for bad in ['', 'e30', encode_cursor(START, 1)[::-1]]:
+            with self.assertRaises(CursorError):
+                decode_cursor(bad)
+
+
+class DetectionHubTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cameras = [Camera.objects.create(name=f'cam-{i}') for i in range(3)]
+
+    async def test_fans_out_to_hundreds_of_filtered_subscribers(self):
+        hub = DetectionHub(buffer_size=8)
+        filters = [(None, 0), ([self.cameras[0].id], 0), ([self.cameras[1].id], LEVEL_POTENTIAL),
+                   ([self.cameras[0].id, self.cameras[2].id], LEVEL_IMMEDIATE), (None, LEVEL_POTENTIAL)]
+        subscriptions = [hub.subscribe(*filters[i % len(filters)]) for i in range(500)]
+        self.assertEqual(hub.subscriber_count(), 500)
+
+        events = make_events(self.cameras, 200)
+        reached = await sync_to_async(hub.publish)(events)
+        self.assertEqual(reached, 500)
+
+        names = {camera.id: camera.name for camera in self.cameras}
+        by_id = {event.pk: event for event in events}
+        for subscription in subscriptions:
+            messages = parse_sse(await subscription.get(timeout=1.0))
+            expected = [e.pk for e in events if subscription.matches(e.camera_id, e.threat_level)]
+            detections = [data for event, data in messages if event == 'detections']
+            self.assertEqual(len(detections), 1)
+            self.assertEqual([d['id'] for d in detections[0]], expected)  # in write order
+            for detection in detections[0]:
+                self.assertEqual(detection['camera'], names[by_id[detection['id']].camera_id])
+
+            alerts = [data for event, data in messages if event == 'alert']
+            self.assertTrue(alerts)
+            for alert in alerts:
+                self.assertGreaterEqual(alert['threat_level'], max(LEVEL_POTENTIAL, subscription.min_level))
+                self.assertEqual(alert['class_names'], ['knife'])
+
+        for subscription in subscriptions:
+            hub.unsubscribe(subscription)
+        self.assertEqual(hub.subscriber_count(), 0)
+
+    async def test_slow_subscriber_drops_oldest_without_delaying_others(self):
+        hub = DetectionHub(buffer_size=4)
+        slow = hub.subscribe()
+        fast = [hub.subscribe() for _ in range(200)]
+
+        received = {id(subscription): [] for subscription in fast}
+        for batch in range(20):
+            await sync_to_async(hub.publish)(make_events(self.cameras, 3, first_id=batch * 3 + 1))
+            for subscription in fast:
+                received[id(subscription)] += parse_sse(await subscription.get(timeout=1.0))
+
+        for messages in received.values():
+            self.assertEqual([event for event, _ in messages].count('detections'), 20)
+            self.assertNotIn('dropped', [event for event, _ in messages])
+
+        messages = parse_sse(await slow.get(timeout=1.0))
+        # 20 batches of one alert and one detections message; only the newest 4 are kept
+        self.assertEqual(messages[0], ('dropped', {'dropped': 36}))
+        self.assertEqual(len(messages), 1 + 4)
+        self.assertEqual(messages[-1][1][-1]['id'], 60)
+        self.assertEqual(slow.total_dropped, 36)
+
+    async def test_publish_survives_database_errors(self):
+        hub = DetectionHub()
+        subscription = hub.subscribe()
+        with mock.patch.object(Camera.objects, 'filter', side_effect=OperationalError('database is locked')), \
+                self.assertLogs('camera_detection.live', 'WARNING'):
+            reached = await sync_to_async(hub.publish)(make_events(self.cameras, 4))
+        self.assertEqual(reached, 1)
+        detections = [data for event, data in parse_sse(await subscription.get(timeout=1.0))
+                      if event == 'detections'][0]
+        self.assertEqual([d['camera'] for d in detections], [None] * 4)
+
+        with mock.patch.object(hub, '_publish', side_effect=RuntimeError('boom')), \
+                self.assertLogs('camera_detection.live', 'ERROR'):
+            self.assertEqual(hub.publish(make_events(self.cameras, 1)), 0)
+
+    async def test_idle_subscriber_times_out(self):
+        hub = DetectionHub()
+        subscription = hub.subscribe()
+        self.assertEqual(await subscription.get(timeout=0.01), [])
+        self.assertEqual(await sync_to_async(hub.publish)([]), 0)
+
+
+class StreamViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cameras = [Camera.objects.create(name=f'cam-{i}') for i in range(2)]
+        user = User.objects.create(username='watch', rank='PVT', unit='1st', first_name='A', last_name='B')
+        cls.auth = {'headers': {'Authorization': f"Bearer {issue_token(user, 'console')}"}}
+
+    async def test_stream_delivers_filtered_batches(self):
+        response = await self.async_client.get('/api/detections/stream/',
+                                               {'camera': 'cam-1', 'min_level': LEVEL_POTENTIAL},
+                                               **self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        hub = get_hub()
+        content = response.streaming_content
+        self.assertEqual(await anext(content), b'retry: 3000\n\n')  # subscribes on first read
+        subscribers = hub.subscriber_count()
+        self.assertGreaterEqual(subscribers, 1)
+
+        events = make_events(self.cameras, 16)
+        await sync_to_async(hub.publish)(events)
+        messages = parse_sse([await anext(content)])
+        detections = [data for event, data in messages if event == 'detections'][0]
+        self.assertEqual([d['id'] for d in detections],
+                         [e.pk for e in events
+                          if e.camera_id == self.cameras[1].id and e.threat_level >= LEVEL_POTENTIAL])
+        self.assertTrue(all(d['camera'] == 'cam-1' for d in detections))
+        self.assertNotIn(LEVEL_NONE, [d['threat_level'] for d in detections])
+
+        # a client disconnect cancels the response task while it waits for messages
+        waiting = asyncio.ensure_future(anext(content))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        self.assertEqual(hub.subscriber_count(), subscribers - 1)
+
+    async def test_stream_rejects_bad_filters(self):
+        response = await self.async_client.get('/api/detections/stream/', {'camera': 'nope'}, **self.auth)
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get('/api/detections/stream/', {'min_level': 'high'}, **self.auth)
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.get('/api/detections/stream/')
+        self.assertEqual(response.status_code, 401)
 
-# Create your tests here.
+    def test_stream_needs_asgi(self):
+        response = self.client.get('/api/detections/stream/', **self.auth)  # WSGI request
+        self.assertEqual(response.status_code, 501)
+        self.assertIn('ASGI', response.json()['error'])
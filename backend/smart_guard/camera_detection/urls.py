@@ -0,0 +1,12 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'camera_detection'
+
+urlpatterns = [
+    path('ingest/', views.ingest, name='ingest'),
+    path('events/', views.events, name='events'),
+    path('rollups/', views.rollups, name='rollups'),
+    path('stream/', views.stream, name='stream'),
+]
@@ -1,3 +1,229 @@
-from django.shortcuts import render
+import math
+from datetime import timedelta
 
-# Create your views here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from users.auth import require_permission
+
+from .ingest import MAX_ERRORS_REPORTED, IngestError, camera_cache, decode_batch, validate_batch
+from .live import get_hub
+from .models import LEVEL_IMMEDIATE, Camera, DetectionEvent
+from .pagination import CursorError, keyset_page
+from .rollups import RESOLUTIONS
+from .writer import get_writer
+
+
+def retry_after(writer):
+    """Seconds until the writer's backlog should have drained"""
+    rows_per_second = writer.flush_size / max(writer.flush_ms / 1000.0, writer.flush_interval / 10)
+    return max(1, math.ceil(writer.backlog() / rows_per_second))
+
+
+@csrf_exempt
+@require_POST
+@require_permission('ingest_detections', sessions=False)
+async def ingest(request):
+    """Batch of detections as NDJSON (one object per line) or msgpack
+
+    A ?camera= query parameter applies to items without their own 'camera'.
+    Needs a detector's Bearer token. Responds 202 once queued for the batched
+    writer, or 429 with Retry-After when the writer's queue is full (the whole
+    batch should be resent).
+    """
+    try:
+        items = decode_batch(request.body, request.content_type or '')
+    except IngestError as e:
+        return JsonResponse({'error': str(e)}, status=e.status)
+
+    default_camera = request.GET.get('camera')
+    names = {name for name in (item.get('camera', default_camera) for item in items
+                               if isinstance(item, dict))
+             if isinstance(name, str)}
+    known = camera_cache.ids
+    if not names.issubset(known):
+        known = await sync_to_async(camera_cache.resolve)(names)
+
+    records, errors = validate_batch(items, known, default_camera)
+    writer = get_writer()
+    if records and not writer.submit(records):
+        seconds = retry_after(writer)
+        response = JsonResponse({'error': 'ingest queue full', 'retry_after': seconds}, status=429)
+        response['Retry-After'] = str(seconds)
+        return response
+
+    return JsonResponse({
+        'accepted': len(records),
+        'rejected': len(errors),
+        'errors': errors[:MAX_ERRORS_REPORTED],
+        'backlog': writer.backlog()
+    }, status=202)
+
+
+# ---------------- dashboard queries (keyset pagination) ----------------
+
+MAX_PAGE = 1000
+MAX_HOURS = 24 * 366 * 10
+
+
+def _time_range(params):
+    """(since, until) from ?since=&until= (ISO 8601) or ?hours= (default 24)"""
+    until = parse_datetime(params['until']) if 'until' in params else None
+    if 'since' in params:
+        since = parse_datetime(params['since'])
+    else:
+        hours = float(params.get('hours', 24))
+        if not 0 < hours <= MAX_HOURS:  # also rejects nan/inf, which timedelta cannot hold
+            raise ValueError(f"hours must be between 0 and {MAX_HOURS}")
+        since = timezone.now() - timedelta(hours=hours)
+    if since is None or ('until' in params and until is None):
+        raise ValueError("since/until must be ISO 8601 datetimes")
+    return since, until
+
+
+def _values(queryset, *fields):
+    if isinstance(queryset, list):
+        return [part.values(*fields) for part in queryset]
+    return queryset.values(*fields)
+
+
+def _page_args(params):
+    limit = min(int(params.get('limit', 100)), MAX_PAGE)
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return limit, params.get('cursor')
+
+
+def _by_level(queryset, params):
+    """min_level as one queryset per level: threat_level=N keeps the (level, time) index ordered"""
+    min_level = int(params['min_level'])
+    return [queryset.filter(threat_level=level) for level in range(max(min_level, 0), LEVEL_IMMEDIATE + 1)]
+
+
+def _filtered(queryset, params, time_field):
+    since, until = _time_range(params)
+    queryset = queryset.filter(**{f'{time_field}__gte': since})
+    if until is not None:
+        queryset = queryset.filter(**{f'{time_field}__lt': until})
+    if 'camera' in params:
+        queryset = queryset.filter(camera__name=params['camera'])
+    if 'class_name' in params:
+        queryset = queryset.filter(class_name=params['class_name'])
+    if 'min_level' in params:
+        if 'camera' in params:
+            return queryset.filter(threat_level__gte=int(params['min_level']))
+        return _by_level(queryset, params)
+    return queryset
+
+
+@require_GET
+@require_permission('view_detections')
+def rollups(request):
+    """Per-minute or per-hour counts by camera, threat level and class (newest first)"""
+    params = request.GET
+    resolution = params.get('resolution', 'minute')
+    if resolution not in RESOLUTIONS:
+        return JsonResponse({'error': f"resolution must be one of {', '.join(RESOLUTIONS)}"}, status=400)
+    model = RESOLUTIONS[resolution][0]
+    try:
+        limit, cursor = _page_args(params)
+        queryset = _values(_filtered(model.objects.all(), params, 'bucket'),
+                           'id', 'camera__name', 'bucket', 'threat_level', 'class_name', 'count',
+                           'max_confidence')
+        rows, next_cursor = keyset_page(queryset, 'bucket', cursor, limit)
+    except (ValueError, CursorError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({
+        'resolution': resolution,
+        'results': [
+            {'camera': row['camera__name'], 'bucket': row['bucket'], 'threat_level': row['threat_level'],
+             'class_name': row['class_name'], 'count': row['count'], 'max_confidence': row['max_confidence']}
+            for row in rows
+        ],
+        'next_cursor': next_cursor
+    })
+
+
+@require_GET
+@require_permission('view_detections')
+def events(request):
+    """Raw detection events (newest first), served from the timestamp, (camera, timestamp) or per-level index"""
+    params = request.GET
+    try:
+        limit, cursor = _page_args(params)
+        queryset = _values(_filtered(DetectionEvent.objects.all(), params, 'timestamp'),
+                           'id', 'camera__name', 'timestamp', 'track_id', 'class_name', 'threat_level',
+                           'confidence', 'x1', 'y1', 'x2', 'y2', 'latitude', 'longitude')
+        rows, next_cursor = keyset_page(queryset, 'timestamp', cursor, limit)
+    except (ValueError, CursorError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({
+        'results': [
+            {'id': row['id'], 'camera': row['camera__name'], 'timestamp': row['timestamp'],
+             'track_id': row['track_id'], 'class_name': row['class_name'],
+             'threat_level': row['threat_level'], 'confidence': row['confidence'],
+             'bbox': [row['x1'], row['y1'], row['x2'], row['y2']],
+             'latitude': row['latitude'], 'longitude': row['longitude']}
+            for row in rows
+        ],
+        'next_cursor': next_cursor
+    })
+
+
+# ---------------- live push (server-sent events) ----------------
+
+async def _sse(cameras, min_level, heartbeat):
+    hub = get_hub()
+    subscription = hub.subscribe(cameras, min_level)
+    try:
+        yield b'retry: 3000\n\n'
+        while True:
+            messages = await subscription.get(timeout=heartbeat)
+            yield b''.join(messages) if messages else b': keepalive\n\n'
+    finally:
+        hub.unsubscribe(subscription)
+
+
+@require_GET
+@require_permission('view_detections')
+async def stream(request):
+    """Server-sent events for detections as they are written
+
+    'detections' events carry the batch's events (same fields as events/) and
+    'alert' events summarize potential/immediate threats per camera; a
+    'dropped' event tells a client that fell behind how many messages it
+    missed. Filter with ?camera= (repeatable) and ?min_level=. Needs an ASGI
+    server (smart_guard.asgi) in the process that ingests detections; under
+    WSGI (runserver, gunicorn) the response would be buffered forever, so it
+    answers 501 instead.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'the detection stream needs an ASGI server, '
+                                      'e.g. uvicorn smart_guard.asgi:application'}, status=501)
+    params = request.GET
+    try:
+        min_level = int(params.get('min_level', 0))
+    except ValueError:
+        return JsonResponse({'error': 'min_level must be an integer'}, status=400)
+    cameras = None
+    names = params.getlist('camera')
+    if names:
+        cameras = [camera_id async for camera_id in
+                   Camera.objects.filter(name__in=names).values_list('id', flat=True)]
+        if not cameras:
+            return JsonResponse({'error': 'unknown camera'}, status=404)
+
+    heartbeat = getattr(settings, 'DETECTION_STREAM', {}).get('HEARTBEAT', 15.0)
+    response = StreamingHttpResponse(_sse(cameras, min_level, heartbeat),
+                                     content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # keep reverse proxies from buffering the stream
+    return response
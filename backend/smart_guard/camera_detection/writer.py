@@ -0,0 +1,207 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from .models import DetectionEvent, ThreatTrack
+from .rollups import update_rollups
+
+logger = logging.getLogger(__name__)
+
+# field names a record may carry (anything else is ignored)
+EVENT_FIELDS = ('camera_id', 'timestamp', 'track_id', 'class_name', 'threat_level', 'confidence',
+                'x1', 'y1', 'x2', 'y2', 'latitude', 'longitude')
+
+
+def to_datetime(value):
+    """Epoch seconds or datetime -> aware UTC datetime"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+class DetectionWriter:
+    def __init__(self, flush_size=500, flush_interval=0.5, max_pending=50_000, track_gap=60.0):
+        """Background thread that stores detections with bulk_create
+
+        submit() only appends to an in-memory queue; the writer flushes when
+        flush_size records are waiting or flush_interval seconds have passed,
+        one transaction per flush. submit() refuses records beyond max_pending
+        so callers can push back instead of growing memory without bound.
+        """
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.track_gap = timedelta(seconds=track_gap)  # same track ID after this gap = new track
+        self.pending = deque()
+        self.cond = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.listeners = []  # callables receiving each flushed batch of DetectionEvents
+
+        self.written = 0
+        self.rejected = 0
+        self.flushes = 0
+        self.errors = 0
+        self.flush_ms = 0.0
+
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name='detection-writer', daemon=True)
+            self.thread.start()
+        return self
+
+    def submit(self, records):
+        """Queue record dicts (DetectionEvent field names); False if the queue is full"""
+        with self.cond:
+            if len(self.pending) + len(records) > self.max_pending:
+                self.rejected += len(records)
+                return False
+            self.pending.extend(records)
+            if len(self.pending) >= self.flush_size:
+                self.cond.notify()
+        return True
+
+    def backlog(self):
+        """Records waiting to be written"""
+        return len(self.pending)
+
+    def _take(self):
+        with self.cond:
+            n = min(len(self.pending), self.flush_size)
+            return [self.pending.popleft() for _ in range(n)]
+
+    def _run(self):
+        try:
+            while self.running or self.pending:
+                with self.cond:
+                    if self.running and len(self.pending) < self.flush_size:
+                        self.cond.wait(self.flush_interval)
+                batch = self._take()
+                if batch:
+                    self.flush(batch)
+        finally:
+            connection.close()
+
+    def flush(self, batch):
+        """Write one batch of records, their track updates and rollups in a single transaction"""
+        started = time.perf_counter()
+        close_old_connections()
+        events = [
+            DetectionEvent(**{field: record[field] for field in EVENT_FIELDS if field in record})
+            for record in batch
+        ]
+        for event in events:
+            event.timestamp = to_datetime(event.timestamp)
+        try:
+            with transaction.atomic():
+                DetectionEvent.objects.bulk_create(events, batch_size=self.flush_size)
+                self._update_tracks(events)
+                update_rollups(events)
+        except Exception:
+            self.errors += 1
+            logger.exception("Dropped %d detections", len(events))
+            return
+        self.written += len(events)
+        self.flushes += 1
+        self.flush_ms = (time.perf_counter() - started) * 1000.0
+        for listener in self.listeners:
+            try:
+                listener(events)
+            except Exception:  # a listener must never stop the writer thread
+                logger.exception("Detection writer listener %r failed", listener)
+
+    def _update_tracks(self, events):
+        """Extend open tracks or start new ones from the batch's tracked detections"""
+        seen = {}
+        for event in events:
+            if event.track_id is None:
+                continue
+            key = (event.camera_id, event.track_id)
+            summary = seen.get(key)
+            if summary is None:
+                seen[key] = summary = {
+                    'class_name': event.class_name, 'threat_level': event.threat_level,
+                    'first_seen': event.timestamp, 'last_seen': event.timestamp,
+                    'detections': 0, 'max_confidence': event.confidence
+                }
+            summary['first_seen'] = min(summary['first_seen'], event.timestamp)
+            summary['last_seen'] = max(summary['last_seen'], event.timestamp)
+            summary['threat_level'] = max(summary['threat_level'], event.threat_level)
+            summary['max_confidence'] = max(summary['max_confidence'], event.confidence)
+            summary['detections'] += 1
+        if not seen:
+            return
+
+        oldest = min(s['first_seen'] for s in seen.values()) - self.track_gap
+        open_tracks = {}
+        for track in ThreatTrack.objects.filter(
+                camera_id__in={camera for camera, _ in seen},
+                track_id__in={track_id for _, track_id in seen},
+                last_seen__gte=oldest).order_by('last_seen'):
+            open_tracks[(track.camera_id, track.track_id)] = track  # newest wins
+
+        created, updated = [], []
+        for (camera_id, track_id), summary in seen.items():
+            track = open_tracks.get((camera_id, track_id))
+            if track is not None and summary['first_seen'] - track.last_seen <= self.track_gap:
+                track.last_seen = max(track.last_seen, summary['last_seen'])
+                track.threat_level = max(track.threat_level, summary['threat_level'])
+                track.max_confidence = max(track.max_confidence, summary['max_confidence'])
+                track.detections += summary['detections']
+                updated.append(track)
+            else:
+                created.append(ThreatTrack(camera_id=camera_id, track_id=track_id, **summary))
+        if created:
+            ThreatTrack.objects.bulk_create(created)
+        if updated:
+            # One prepared UPDATE run per row; bulk_update's CASE chains cost more to build
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"UPDATE {ThreatTrack._meta.db_table} SET last_seen = %s, threat_level = %s, "
+                    f"max_confidence = %s, detections = %s WHERE id = %s",
+                    [(connection.ops.adapt_datetimefield_value(t.last_seen), t.threat_level,
+                      t.max_confidence, t.detections, t.pk) for t in updated])
+
+    def stop(self, timeout=5.0):
+        """Flush what is queued and stop the thread"""
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def stats(self):
+        return {
+            'written': self.written,
+            'backlog': self.backlog(),
+            'rejected': self.rejected,
+            'flushes': self.flushes,
+            'errors': self.errors,
+            'flush_ms': self.flush_ms
+        }
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """Process-wide writer configured from settings.DETECTION_WRITER, started on first use"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            config = getattr(settings, 'DETECTION_WRITER', {})
+            _writer = DetectionWriter(
+                flush_size=config.get('FLUSH_SIZE', 500),
+                flush_interval=config.get('FLUSH_INTERVAL', 0.5),
+                max_pending=config.get('MAX_PENDING', 50_000),
+                track_gap=config.get('TRACK_GAP', 60.0)
+            ).start()
+        return _writer
@@ -2,6 +2,9 @@
 ASGI config for smart_guard project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn smart_guard.asgi:application``)
+for the live detection stream at api/detections/stream/: ingest, the
+detection writer and the stream subscribers share this process.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
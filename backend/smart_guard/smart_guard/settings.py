@@ -37,6 +37,8 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'camera_detection',
+    'users',
 ]
 
 MIDDLEWARE = [
@@ -76,9 +78,42 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # WAL lets readers run while the detection writer commits
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
+# Batched detection ingest (camera_detection.writer)
+DETECTION_WRITER = {
+    'FLUSH_SIZE': 500,       # rows per bulk_create
+    'FLUSH_INTERVAL': 0.5,   # seconds before a partial batch is written
+    'MAX_PENDING': 50_000,   # queued rows before submissions are refused
+    'TRACK_GAP': 60.0,       # seconds after which a reused track ID starts a new track
+}
+
+# Live push at api/detections/stream/ (server-sent events, ASGI only: run the
+# backend with `uvicorn smart_guard.asgi:application`; runserver/WSGI get a 501)
+DETECTION_STREAM = {
+    'BUFFER_SIZE': 32,       # messages held per subscriber before the oldest are dropped
+    'HEARTBEAT': 15.0,       # seconds between keepalives on an idle stream
+}
+
+# Token/session auth for users.User (users/auth.py)
+USERS_AUTH = {
+    'TOKEN_CACHE_SIZE': 10_000,  # validated tokens/sessions kept in memory (LRU)
+    'TOKEN_CACHE_TTL': 300.0,    # seconds before a cached token is checked against the DB again
+    'NEGATIVE_CACHE_TTL': 30.0,  # seconds an unknown token is remembered as invalid
+    'RANK_PERMISSIONS': {        # permission -> lowest rank holding it
+        'view_detections': 'PVT',
+        'ingest_detections': 'PVT',
+        'manage_tokens': 'CPT',
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
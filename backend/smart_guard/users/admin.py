@@ -1,3 +1,18 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import AuthToken, User
+
+
+@admin.register(User)
+class UserAdmin(admin.ModelAdmin):
+    list_display = ('username', 'rank', 'unit', 'first_name', 'last_name', 'date_joined')
+    list_filter = ('rank', 'unit')
+    search_fields = ('username', 'first_name', 'last_name')
+    exclude = ('password',)
+
+
+@admin.register(AuthToken)
+class AuthTokenAdmin(admin.ModelAdmin):
+    list_display = ('prefix', 'name', 'user', 'created_at', 'expires_at')
+    search_fields = ('name', 'user__username')
+    readonly_fields = ('key_hash', 'prefix')
@@ -0,0 +1,276 @@
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import JsonResponse
+from django.utils import timezone
+
+from .models import AuthToken, User
+
+# RANK_CHOICES runs from lowest to highest rank
+RANK_LEVELS = {code: level for level, (code, _) in enumerate(User.RANK_CHOICES)}
+
+# permission -> lowest rank holding it
+DEFAULT_RANK_PERMISSIONS = {
+    'view_detections': 'PVT',
+    'ingest_detections': 'PVT',
+    'manage_tokens': 'CPT',
+}
+
+SESSION_USER_KEY = '_users_user_id'
+SESSION_HASH_KEY = '_users_user_hash'
+
+_config = getattr(settings, 'USERS_AUTH', {})
+_MISSING = object()
+
+
+def rank_permissions(rank):
+    """Every permission whose minimum rank is at or below rank"""
+    level = RANK_LEVELS.get(rank, -1)
+    table = _config.get('RANK_PERMISSIONS', DEFAULT_RANK_PERMISSIONS)
+    return frozenset(permission for permission, minimum in table.items() if level >= RANK_LEVELS[minimum])
+
+
+class Principal:
+    __slots__ = ('user_id', 'username', 'rank', 'unit', 'permissions', 'token_id')
+
+    def __init__(self, user, token_id=None):
+        """Who is calling, with their rank's permissions resolved once"""
+        self.user_id = user.pk
+        self.username = user.username
+        self.rank = user.rank
+        self.unit = user.unit
+        self.permissions = rank_permissions(user.rank)
+        self.token_id = token_id
+
+    def has_perm(self, permission):
+        return permission in self.permissions
+
+    def at_least(self, rank):
+        return RANK_LEVELS.get(self.rank, -1) >= RANK_LEVELS[rank]
+
+    def to_dict(self):
+        return {'username': self.username, 'rank': self.rank, 'unit': self.unit,
+                'permissions': sorted(self.permissions)}
+
+
+class TTLCache:
+    def __init__(self, maxsize=10_000, ttl=300.0):
+        """Thread-safe LRU whose entries also expire after ttl seconds"""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (deadline, value)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        deadline = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            self.entries[key] = (deadline, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def discard(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def invalidate(self, predicate):
+        """Drop every entry whose value matches (rare: user or token changes)"""
+        with self.lock:
+            for key in [key for key, (_, value) in self.entries.items() if predicate(value)]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+# Validated tokens and sessions are trusted for TOKEN_CACHE_TTL seconds; changes made
+# in this process invalidate at once, other worker processes catch up within the TTL
+token_cache = TTLCache(maxsize=_config.get('TOKEN_CACHE_SIZE', 10_000),
+                       ttl=_config.get('TOKEN_CACHE_TTL', 300.0))
+NEGATIVE_CACHE_TTL = _config.get('NEGATIVE_CACHE_TTL', 30.0)
+
+
+def hash_key(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def issue_token(user, name='', days=None):
+    """Create a token for user and return its key (shown once; only the hash is stored)"""
+    key = secrets.token_urlsafe(32)
+    expires_at = timezone.now() + timedelta(days=days) if days else None
+    AuthToken.objects.create(user=user, name=name, key_hash=hash_key(key), prefix=key[:8],
+                             expires_at=expires_at)
+    token_cache.discard(key)
+    return key
+
+
+def _load_token(key):
+    token = AuthToken.objects.select_related('user').filter(key_hash=hash_key(key)).first()
+    now = timezone.now()
+    if token is None or (token.expires_at is not None and token.expires_at <= now):
+        token_cache.set(key, None, NEGATIVE_CACHE_TTL)  # floods of bad keys stay off the DB too
+        return None
+    ttl = token_cache.ttl
+    if token.expires_at is not None:
+        ttl = min(ttl, (token.expires_at - now).total_seconds())
+    principal = Principal(token.user, token.pk)
+    token_cache.set(key, principal, ttl)
+    return principal
+
+
+def authenticate_token(key):
+    """Principal for a token key, or None; a DB query only on a cache miss"""
+    principal = token_cache.get(key, _MISSING)
+    return _load_token(key) if principal is _MISSING else principal
+
+
+async def aauthenticate_token(key):
+    principal = token_cache.get(key, _MISSING)
+    return await sync_to_async(_load_token)(key) if principal is _MISSING else principal
+
+
+# ---------------- sessions (consoles) ----------------
+
+def session_hash(user):
+    """Changes with the password, so a password change ends existing sessions"""
+    return hmac.new(settings.SECRET_KEY.encode(), user.password.encode(), hashlib.sha256).hexdigest()
+
+
+def login(request, user):
+    request.session.cycle_key()
+    request.session[SESSION_USER_KEY] = user.pk
+    request.session[SESSION_HASH_KEY] = session_hash(user)
+    return Principal(user)
+
+
+def logout(request):
+    request.session.flush()
+
+
+def _load_session(user_id, user_hash):
+    key = ('session', user_id, user_hash)
+    user = User.objects.filter(pk=user_id).first()
+    if user is None or not hmac.compare_digest(session_hash(user), user_hash):
+        token_cache.set(key, None, NEGATIVE_CACHE_TTL)
+        return None
+    principal = Principal(user)
+    token_cache.set(key, principal)
+    return principal
+
+
+def session_principal(request):
+    user_id, user_hash = request.session.get(SESSION_USER_KEY), request.session.get(SESSION_HASH_KEY)
+    if user_id is None or user_hash is None:
+        return None
+    principal = token_cache.get(('session', user_id, user_hash), _MISSING)
+    return _load_session(user_id, user_hash) if principal is _MISSING else principal
+
+
+async def asession_principal(request):
+    user_id = await request.session.aget(SESSION_USER_KEY)
+    user_hash = await request.session.aget(SESSION_HASH_KEY)
+    if user_id is None or user_hash is None:
+        return None
+    principal = token_cache.get(('session', user_id, user_hash), _MISSING)
+    if principal is _MISSING:
+        principal = await sync_to_async(_load_session)(user_id, user_hash)
+    return principal
+
+
+# ---------------- views ----------------
+
+def _bearer(request):
+    scheme, _, key = request.headers.get('Authorization', '').partition(' ')
+    return key.strip() if scheme.lower() == 'bearer' and key.strip() else None
+
+
+def _denied(principal, permission):
+    if principal is None:
+        response = JsonResponse({'error': 'authentication required'}, status=401)
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+    if not principal.has_perm(permission):
+        return JsonResponse({'error': f"rank {principal.rank} lacks '{permission}'"}, status=403)
+    return None
+
+
+def require_permission(permission, sessions=True):
+    """View decorator: Bearer token (or session cookie) whose rank grants permission
+
+    Sets request.principal. sessions=False accepts tokens only, for csrf_exempt
+    endpoints that detector nodes post to.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                key = _bearer(request)
+                if key is not None:
+                    principal = await aauthenticate_token(key)
+                elif sessions and hasattr(request, 'session'):
+                    principal = await asession_principal(request)
+                else:
+                    principal = None
+                denied = _denied(principal, permission)
+                if denied is not None:
+                    return denied
+                request.principal = principal
+                return await view(request, *args, **kwargs)
+        else:
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                key = _bearer(request)
+                if key is not None:
+                    principal = authenticate_token(key)
+                elif sessions and hasattr(request, 'session'):
+                    principal = session_principal(request)
+                else:
+                    principal = None
+                denied = _denied(principal, permission)
+                if denied is not None:
+                    return denied
+                request.principal = principal
+                return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ---------------- invalidation ----------------
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _user_changed(sender, instance, **kwargs):
+    # rank (and so permissions) or password may have changed
+    token_cache.invalidate(lambda principal: principal is not None and principal.user_id == instance.pk)
+
+
+@receiver(post_save, sender=AuthToken)
+@receiver(post_delete, sender=AuthToken)
+def _token_changed(sender, instance, **kwargs):
+    token_cache.invalidate(lambda principal: principal is not None and principal.token_id == instance.pk)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users.auth import issue_token
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Create an API token for a user (e.g. the account a detector node runs as)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('--name', default='', help="What the token is for, e.g. 'detector cam-3'")
+        parser.add_argument('--days', type=float, default=None, help="Expire after this many days")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['username']).first()
+        if user is None:
+            raise CommandError(f"no user '{options['username']}'")
+        key = issue_token(user, options['name'], options['days'])
+        self.stderr.write("Store this token now; it cannot be shown again.")
+        self.stdout.write(key)
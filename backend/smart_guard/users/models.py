@@ -32,3 +32,16 @@ class User(models.Model):
 
     def __str__(self):
         return f"{self.rank} {self.first_name} {self.last_name} ({self.username})"
+
+
+# API token for a detector node or console; only a SHA-256 of the key is stored
+class AuthToken(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tokens')
+    name = models.CharField(max_length=64, blank=True)
+    key_hash = models.CharField(max_length=64, unique=True)
+    prefix = models.CharField(max_length=8)  # first characters of the key, to tell tokens apart
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.prefix}… {self.name} ({self.user.username})"
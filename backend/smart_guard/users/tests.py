@@ -1,3 +1,93 @@
+import json
+import time
+
 from django.test import TestCase
 
-# Create your tests here.
+from .auth import TTLCache, authenticate_token, issue_token, rank_permissions, token_cache
+from .models import AuthToken, User
+
+
+def make_user(username, rank):
+    user = User(username=username, rank=rank, unit='1st Recon', first_name='Test', last_name=rank)
+    user.set_password('correct horse')
+    user.save()
+    return user
+
+
+class TTLCacheTests(TestCase):
+    def test_evicts_least_recently_used_and_expired(self):
+        cache = TTLCache(maxsize=2, ttl=60.0)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('d', 4, ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('d'))
+
+
+class TokenAuthTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.private = make_user('pvt', 'PVT')
+        self.captain = make_user('cpt', 'CPT')
+
+    def test_rank_permissions(self):
+        self.assertIn('ingest_detections', rank_permissions('PVT'))
+        self.assertNotIn('manage_tokens', rank_permissions('SGT'))
+        self.assertIn('manage_tokens', rank_permissions('GEN'))
+        self.assertEqual(rank_permissions('???'), frozenset())
+
+    def test_cached_token_needs_no_queries(self):
+        key = issue_token(self.private, 'detector cam-1')
+        principal = authenticate_token(key)
+        self.assertEqual(principal.username, 'pvt')
+        self.assertTrue(principal.has_perm('ingest_detections'))
+        with self.assertNumQueries(0):
+            for _ in range(1000):
+                self.assertIs(authenticate_token(key), principal)
+        self.assertIsNone(authenticate_token('not-a-token'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(authenticate_token('not-a-token'))  # negative result is cached too
+
+    def test_rank_change_and_revocation_invalidate(self):
+        key = issue_token(self.private)
+        self.assertFalse(authenticate_token(key).has_perm('manage_tokens'))
+        self.private.rank = 'MAJ'
+        self.private.save()
+        self.assertTrue(authenticate_token(key).has_perm('manage_tokens'))
+        AuthToken.objects.filter(user=self.private).get().delete()
+        self.assertIsNone(authenticate_token(key))
+
+    def test_expired_token_rejected(self):
+        key = issue_token(self.private, days=-1)
+        self.assertIsNone(authenticate_token(key))
+
+    def test_views(self):
+        key = issue_token(self.private)
+        response = self.client.get('/api/users/me/', headers={'Authorization': f'Bearer {key}'})
+        self.assertEqual(response.json()['rank'], 'PVT')
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 401)
+
+        response = self.client.post('/api/users/login/', json.dumps({'username': 'cpt', 'password': 'wrong'}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post('/api/users/login/',
+                                    json.dumps({'username': 'cpt', 'password': 'correct horse'}),
+                                    content_type='application/json')
+        self.assertIn('manage_tokens', response.json()['permissions'])
+        self.assertEqual(self.client.get('/api/users/me/').json()['username'], 'cpt')
+
+        # a password change ends existing sessions
+        self.captain.set_password('new password')
+        self.captain.save()
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 401)
+
+    def test_ingest_requires_token(self):
+        body = json.dumps({'camera': 'cam', 'name': 'person', 'confidence': 0.9, 'bbox': [0, 0, 1, 1]})
+        response = self.client.post('/api/detections/ingest/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post('/api/detections/events/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 405)
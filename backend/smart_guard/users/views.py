@@ -1,3 +1,39 @@
-from django.shortcuts import render
+import json
 
-# Create your views here.
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from . import auth
+from .models import User
+
+
+@csrf_exempt
+@require_POST
+def login(request):
+    """Console login with a JSON {"username", "password"} body; starts a session"""
+    try:
+        credentials = json.loads(request.body)
+        username, password = str(credentials['username']), str(credentials['password'])
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'expected JSON with username and password'}, status=400)
+    user = User.objects.filter(username=username).first()
+    if user is None:
+        User().set_password(password)  # same hashing cost whether or not the user exists
+        return JsonResponse({'error': 'invalid credentials'}, status=401)
+    if not user.check_password(password):
+        return JsonResponse({'error': 'invalid credentials'}, status=401)
+    return JsonResponse(auth.login(request, user).to_dict())
+
+
+@csrf_exempt
+@require_POST
+def logout(request):
+    auth.logout(request)
+    return JsonResponse({'logged_out': True})
+
+
+@require_GET
+@auth.require_permission('view_detections')
+def me(request):
+    return JsonResponse(request.principal.to_dict())